@@ -0,0 +1,71 @@
+"""
+Test reading MODPATH pathline files with PathlineFile and pathline_chunks
+"""
+import os
+import numpy as np
+from flopy.utils import PathlineFile
+from flopy.utils.modpathfile import pathline_chunks
+
+cpth = os.path.join('temp', 't001')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _write_pathline_file(fname, blank_lines=False):
+    # particle 2 is written before particle 1, so the points have to be
+    # sorted by particle id
+    f = open(fname, 'w')
+    f.write('MODPATH_PATHLINE_FILE 6 0\n')
+    f.write(' 1 1 1.0 0.0 0.0\n')
+    f.write('END HEADER\n')
+    for pid in (2, 1):
+        for t in range(3):
+            f.write('{} 1 {} 1 {} 1.0 2.0 3.0 1 2 3 1 0.5 0.5 0.5 1\n'.format(
+                pid, t + 1, 10. * t + pid))
+        if blank_lines:
+            f.write('\n')
+    if blank_lines:
+        f.write('   \n\n')
+    f.close()
+
+
+def test_pathline_blank_lines():
+    fname = os.path.join(cpth, 'blank.mppth')
+    _write_pathline_file(fname, blank_lines=True)
+    p = PathlineFile(fname)
+    assert p.get_maxid() == 1
+    d = p.get_data(partid=0)
+    assert np.allclose(d['time'], [1., 11., 21.])
+    assert (d['k'] == 0).all()
+    chunks = list(pathline_chunks(fname, chunksize=2))
+    assert sum([c.shape[0] for c in chunks]) == 6
+    return
+
+
+def test_pathline_chunks_cache():
+    fname = os.path.join(cpth, 'cache.mppth')
+    _write_pathline_file(fname)
+    cachefile = fname + '.npy'
+    if os.path.isfile(cachefile):
+        os.remove(cachefile)
+    a = np.concatenate(list(pathline_chunks(fname, chunksize=4,
+                                            cache=True)))
+    assert os.path.isfile(cachefile)
+    b = np.concatenate(list(pathline_chunks(fname, chunksize=4,
+                                            cache=True)))
+    assert a.shape[0] == 6
+    assert (a == b).all()
+    # filters
+    c = np.concatenate(list(pathline_chunks(fname, time_window=(5., None))))
+    assert (c['time'] >= 5.).all()
+    assert c.shape[0] == 4
+    p0 = PathlineFile(fname)
+    p1 = PathlineFile(fname, cache=True)
+    for partid in range(2):
+        assert (p0.get_data(partid) == p1.get_data(partid)).all()
+    return
+
+
+if __name__ == '__main__':
+    test_pathline_blank_lines()
+    test_pathline_chunks_cache()
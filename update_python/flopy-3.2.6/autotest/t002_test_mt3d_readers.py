@@ -0,0 +1,108 @@
+"""
+Test the fixed format parser and the MT3DMS obs and mas readers
+"""
+import os
+import numpy as np
+import flopy
+from flopy.utils import read_fixed_array, get_fixed_ipos
+from flopy.mt3d.mtbtn import read1d_fixed
+
+cpth = os.path.join('temp', 't002')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def test_read_fixed_array():
+    lines = ['   1.0E+00-2.000E+01       3.5\n',
+             '  -4.0D+00         9      -1.0\n',
+             '                       7.0\n']
+    a = read_fixed_array(lines, [10, 10, 10])
+    assert np.allclose(a, [[1., -20., 3.5], [-4., 9., -1.], [0., 0., 7.]])
+    a = read_fixed_array([' 1 2\n', ' 3 4\n'], [2, 2], dtype=int)
+    assert a.dtype == int
+    assert (a == [[1, 2], [3, 4]]).all()
+    assert get_fixed_ipos('     1   10.5  -2.0\n') == [6, 7, 6]
+    try:
+        read_fixed_array(['   abc'], [6])
+        raise AssertionError('read_fixed_array should raise a ValueError')
+    except ValueError:
+        pass
+    a = np.zeros(10, dtype=np.float32)
+    f = open(os.path.join(cpth, 'timprs.txt'), 'w')
+    f.write(''.join(['{:10.3f}'.format(v) for v in range(8)]) + '\n')
+    f.write(''.join(['{:10.3f}'.format(v) for v in range(8, 10)]) + '\n')
+    f.close()
+    f = open(os.path.join(cpth, 'timprs.txt'), 'r')
+    read1d_fixed(f, a)
+    f.close()
+    assert np.allclose(a, np.arange(10))
+    return
+
+
+def _write_obs(fname, ntimes, nobs=12):
+    rng = np.random.RandomState(0)
+    values = rng.randn(ntimes, nobs) * 10. ** rng.randint(-5, 5,
+                                                          (ntimes, nobs))
+    f = open(fname, 'w')
+    f.write('STEP   TOTAL TIME             LOCATION OF OBSERVATION ' +
+            'POINTS (K,I,J)\n')
+    for i0 in (0, 6):
+        f.write('          ' +
+                ''.join(['{:4d}{:4d}{:4d} '.format(1, i + 1, 2)
+                         for i in range(i0, i0 + 6)]) + '\n')
+    for n in range(ntimes):
+        f.write(' {:5d} {:15.7G}  '.format(n + 1, 0.5 * n) +
+                ''.join(['{:13.5G}'.format(v) for v in values[n, :5]]) +
+                '\n')
+        f.write(' ' + ''.join(['{:13.5G}'.format(v)
+                               for v in values[n, 5:]]) + '\n')
+    f.close()
+    # values as written to the file
+    return np.array([[float('{:13.5G}'.format(v)) for v in row]
+                     for row in values])
+
+
+def test_load_obs():
+    fname = os.path.join(cpth, 'test.obs')
+    values = _write_obs(fname, 50)
+    r = flopy.mt3d.Mt3dms.load_obs(fname)
+    assert r.shape == (50,)
+    assert r.dtype.names[2] == '(1, 1, 2)'
+    assert (r['step'] == np.arange(1, 51)).all()
+    assert np.allclose(r['time'], 0.5 * np.arange(50))
+    for i, name in enumerate(r.dtype.names[2:]):
+        assert np.allclose(r[name], values[:, i])
+    # cache
+    cachefile = fname + '.npy'
+    if os.path.isfile(cachefile):
+        os.remove(cachefile)
+    r1 = flopy.mt3d.Mt3dms.load_obs(fname, cache=True)
+    assert os.path.isfile(cachefile)
+    r2 = flopy.mt3d.Mt3dms.load_obs(fname, cache=True)
+    assert (r1 == r).all()
+    assert (r2 == r).all()
+    assert isinstance(r2, np.recarray)
+    return
+
+
+def test_load_mas():
+    fname = os.path.join(cpth, 'test.mas')
+    rng = np.random.RandomState(1)
+    values = rng.randn(20, 9)
+    f = open(fname, 'w')
+    f.write(' header 1\n header 2\n')
+    for row in values:
+        f.write(''.join(['{:14.6E}'.format(v) for v in row]) + '\n')
+    f.write('\n')
+    f.close()
+    r = flopy.mt3d.Mt3dms.load_mas(fname)
+    assert r.shape == (20,)
+    assert np.allclose(r.total_in, values[:, 1], rtol=1e-6)
+    assert np.allclose(r['error_alt'], values[:, 8], rtol=1e-6)
+    return
+
+
+if __name__ == '__main__':
+    test_read_fixed_array()
+    test_load_obs()
+    test_load_mas()
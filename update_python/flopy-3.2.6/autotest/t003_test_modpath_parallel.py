@@ -0,0 +1,131 @@
+"""
+Test splitting a MODPATH particle release between runs and merging the
+endpoint files of the runs
+"""
+import os
+import numpy as np
+import flopy
+from flopy.modpath.mp import _split_groups, _merge_particle_files, \
+    _write_run_namefile
+
+cpth = os.path.join('temp', 't003')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _get_sim(model_ws, group_region):
+    ngroup = len(group_region)
+    m = flopy.modflow.Modflow('m', model_ws=model_ws)
+    flopy.modflow.ModflowDis(m, 2, 3, 4)
+    flopy.modflow.ModflowBas(m)
+    flopy.modflow.ModflowLpf(m)
+    flopy.modflow.ModflowOc(m)
+    flopy.modflow.ModflowPcg(m)
+    mp = flopy.modpath.Modpath('mp', modflowmodel=m, model_ws=model_ws)
+    flopy.modpath.ModpathBas(mp, hnoflo=-999., hdry=-888., ibound=1,
+                             prsity=0.2)
+    sim = flopy.modpath.ModpathSim(mp, option_flags=[1] * 12,
+                                   group_name=['g{}'.format(i) for i in
+                                               range(ngroup)],
+                                   group_placement=[[1, 1, 1, 0, 1, 1]] *
+                                                   ngroup,
+                                   group_region=group_region,
+                                   face_ct=[1] * ngroup,
+                                   ifaces=[[[6, 1, 1]]] * ngroup)
+    return mp, sim
+
+
+def test_split_groups():
+    mp, sim = _get_sim(cpth, [[0, 0, 0, 1, 2, 3], [0, 0, 0, 0, 0, 1]])
+    shape = (2, 3, 4)
+    # blocks of whole groups
+    runs = _split_groups(sim, 2, shape)
+    assert runs == [[(0, None)], [(1, None)]]
+    runs = _split_groups(sim, 1, shape)
+    assert runs == [[(0, None), (1, None)]]
+    # the 24 cells of group 0 are split between 4 runs
+    runs = _split_groups(sim, 5, shape)
+    assert len(runs) == 5
+    assert [run[0][0] for run in runs] == [0, 0, 0, 0, 1]
+    cells = np.zeros(shape, dtype=int)
+    for run in runs[:4]:
+        assert run[0][1].sum() == 6
+        cells += run[0][1]
+    assert (cells == 1).all()
+    assert runs[4][0][1] is None
+    # a single group is split between all of the runs
+    mp, sim = _get_sim(cpth, [[0, 0, 0, 1, 2, 3]])
+    runs = _split_groups(sim, 8, shape)
+    assert len(runs) == 8
+    assert sum([run[0][1].sum() for run in runs]) == 24
+    return
+
+
+def _write_endpoint(fname, groups):
+    f = open(fname, 'w')
+    n = len(groups)
+    f.write('MODPATH_ENDPOINT_FILE 6 0\n')
+    f.write('1 {0} {0} {0} 0.0 0.0 0.0 0.0\n'.format(n))
+    f.write('0 0 {} 0 0 0\n'.format(n))
+    f.write('{}\n'.format(max(groups)))
+    for g in range(max(groups)):
+        f.write('group{}\n'.format(g + 1))
+    f.write('END HEADER\n')
+    for pid, g in enumerate(groups):
+        f.write('{} {} 2 0.0 1.0 1 1 1 1 1 1 0.5 0.5 0.5 0.0 0.0 0.0 '
+                '1 1 1 1 1 1 0.5 0.5 0.5 0.0 0.0 0.0 rch\n'.format(pid + 1,
+                                                                   g))
+    f.close()
+
+
+def test_merge_endpoint_files():
+    fnames = [os.path.join(cpth, 'run{}.mpend'.format(i)) for i in range(3)]
+    _write_endpoint(fnames[0], [1, 1, 1])
+    _write_endpoint(fnames[1], [1, 1])
+    _write_endpoint(fnames[2], [1, 2, 2, 2])
+    fout = os.path.join(cpth, 'merged.mpend')
+    # run 0 and 1 have parts of group 1; run 2 has groups 2 and 3
+    _merge_particle_files(fnames, fout, [0, 3, 5], [[1], [1], [2, 3]],
+                          ['a', 'b', 'c'])
+    e = flopy.utils.EndpointFile(fout)
+    d = e.get_alldata()
+    assert (d['particleid'] == np.arange(9)).all()
+    assert (d['particlegroup'] == [0, 0, 0, 0, 0, 1, 2, 2, 2]).all()
+    header = open(fout).readlines()[:8]
+    assert header[1].split()[1:4] == ['9', '9', '9']
+    assert header[2].split()[2] == '9'
+    assert header[3].strip() == '3'
+    assert [line.strip() for line in header[4:7]] == ['a', 'b', 'c']
+    assert header[7].strip().upper() == 'END HEADER'
+    return
+
+
+def test_run_namefile():
+    model_ws = os.path.join(cpth, 'model')
+    ws = os.path.join(model_ws, 'run000')
+    for d in (model_ws, ws):
+        if not os.path.isdir(d):
+            os.makedirs(d)
+    f = open(os.path.join(cpth, 'outside.hds'), 'w')
+    f.write('outside\n')
+    f.close()
+    f = open(os.path.join(model_ws, 'm.dis'), 'w')
+    f.write('dis\n')
+    f.close()
+    f = open(os.path.join(model_ws, 'mp.mpnam'), 'w')
+    f.write('# name file\nDIS 11 m.dis\nHEAD 88 ../outside.hds\n')
+    f.close()
+    _write_run_namefile('mp.mpnam', model_ws, ws)
+    lines = open(os.path.join(ws, 'mp.mpnam')).readlines()
+    assert lines[2].split()[2] == 'outside.hds'
+    assert open(os.path.join(ws, 'outside.hds')).read() == 'outside\n'
+    assert open(os.path.join(ws, 'm.dis')).read() == 'dis\n'
+    # the file outside of the run workspace is not changed
+    assert open(os.path.join(cpth, 'outside.hds')).read() == 'outside\n'
+    return
+
+
+if __name__ == '__main__':
+    test_split_groups()
+    test_merge_endpoint_files()
+    test_run_namefile()
@@ -0,0 +1,339 @@
+"""
+Test run_model with a python script that stands in for the model executable
+"""
+import os
+import sys
+import stat
+import time
+import warnings
+import flopy
+from flopy.mbase import run_model, run_models
+
+cpth = os.path.join('temp', 't004')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _write_exe(ws, name='fakemf.py', sleep=0.):
+    # prints the start and end times of a run that takes sleep seconds
+    fname = os.path.join(ws, name)
+    f = open(fname, 'w')
+    f.write('#!{}\n'.format(sys.executable))
+    f.write('import sys\n')
+    f.write('import time\n')
+    f.write('print("running " + sys.argv[1])\n')
+    f.write('print("start " + repr(time.time()))\n')
+    f.write('sys.stdout.flush()\n')
+    f.write('time.sleep({!r})\n'.format(sleep))
+    f.write('print("end " + repr(time.time()))\n')
+    f.write('print(" Normal termination of simulation")\n')
+    f.close()
+    os.chmod(fname, os.stat(fname).st_mode | stat.S_IXUSR)
+    return os.path.abspath(fname)
+
+
+def test_run_model_async():
+    exe = _write_exe(cpth)
+    open(os.path.join(cpth, 'm.nam'), 'w').close()
+    success, buff = run_model(exe, 'm.nam', model_ws=cpth, silent=True,
+                              report=True, use_async=True)
+    assert success
+    assert buff[-1].endswith('normal termination of simulation')
+    # async is a deprecated alias of use_async
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        success, buff = run_model(exe, 'm.nam', model_ws=cpth, silent=True,
+                                  report=True, **{'async': True})
+    assert success
+    assert buff[-1].startswith('(elapsed:')
+    assert any([issubclass(wi.category, DeprecationWarning) for wi in w])
+    try:
+        run_model(exe, 'm.nam', model_ws=cpth, silent=True, asynch=True)
+        raise AssertionError('run_model should raise a TypeError')
+    except TypeError:
+        pass
+    return
+
+
+def _get_jobs(exe, njobs, **kwargs):
+    jobs = []
+    for ijob in range(njobs):
+        model_ws = os.path.join(cpth, 'job{}'.format(ijob))
+        if not os.path.isdir(model_ws):
+            os.makedirs(model_ws)
+        open(os.path.join(model_ws, 'm.nam'), 'w').close()
+        job = {'exe_name': exe, 'namefile': 'm.nam', 'model_ws': model_ws,
+               'name': 'job{}'.format(ijob)}
+        job.update(kwargs)
+        jobs.append(job)
+    return jobs
+
+
+def _get_times(log_file):
+    times = {}
+    for line in open(log_file):
+        t = line.split()
+        if len(t) == 2 and t[0] in ('start', 'end'):
+            times[t[0]] = float(t[1])
+    return times['start'], times['end']
+
+
+def _max_concurrent(results):
+    times = [_get_times(r.log_file) for r in results]
+    return max([sum([s <= t < e for s, e in times]) for t, _ in times])
+
+
+def test_run_models():
+    exe = _write_exe(cpth, 'fakemf_sleep.py', sleep=0.5)
+    results = run_models(_get_jobs(exe, 4), nworkers=2)
+    assert [r.name for r in results] == ['job0', 'job1', 'job2', 'job3']
+    for r in results:
+        assert r.success
+        assert r.returncode == 0
+        assert r.message == 'Normal termination of simulation'
+        # stdout is written to <name>.stdout in the model workspace
+        assert r.log_file == os.path.join(cpth, r.name, r.name + '.stdout')
+        assert open(r.log_file).read().startswith('running m.nam')
+        assert r.wall_time >= 0.5
+    assert _max_concurrent(results) == 2
+
+    # jobs that use two processors run one at a time with a budget of 3
+    results = run_models(_get_jobs(exe, 3, ncpu=2), nworkers=3,
+                         cpu_budget=3)
+    assert all([r.success for r in results])
+    assert _max_concurrent(results) == 1
+
+    # stdout is written to log_dir
+    log_dir = os.path.join(cpth, 'logs')
+    jobs = [(exe, 'm.nam', job['model_ws']) for job in _get_jobs(exe, 2)]
+    results = run_models(jobs, nworkers=2, log_dir=log_dir)
+    for ijob, r in enumerate(results):
+        assert r.success
+        assert r.name == '{:04d}_m'.format(ijob)
+        assert r.log_file == os.path.join(log_dir, r.name + '.stdout')
+        assert open(r.log_file).read().startswith('running m.nam')
+    return
+
+
+def test_run_models_failures():
+    exe = _write_exe(cpth, 'fakemf_slow.py', sleep=10.)
+    jobs = _get_jobs(exe, 2)
+    jobs[1]['timeout'] = 0.5
+    jobs[0]['exe_name'] = os.path.join(cpth, 'notanexe.py')
+    jobs.append(_get_jobs(exe, 1, namefile='missing.nam', name='job2')[0])
+    jobs.append(_get_jobs(exe, 1, name='job3')[0])
+    results = run_models(jobs, nworkers=2, timeout=1.)
+    r = results[0]
+    assert not r.success
+    assert r.returncode is None
+    assert 'does not exist' in r.message
+    r = results[1]
+    assert not r.success
+    assert r.message == 'timed out after 0.5 seconds'
+    assert r.wall_time < 5.
+    assert open(r.log_file).read().startswith('running m.nam')
+    r = results[2]
+    assert not r.success
+    assert 'namefile' in r.message
+    # the timeout of run_models applies to jobs without a timeout
+    r = results[3]
+    assert not r.success
+    assert r.message == 'timed out after 1.0 seconds'
+    return
+
+
+def _write_progress_exe(ws, sleep=0.):
+    # prints MODFLOW progress lines and writes its process id
+    fname = os.path.join(ws, 'fakemf_progress.py')
+    f = open(fname, 'w')
+    f.write('#!{}\n'.format(sys.executable))
+    f.write("""import os
+import sys
+import time
+open('pid.txt', 'w').write(str(os.getpid()))
+print('running ' + sys.argv[1])
+print(' Solving:  Stress period:     1    Time step:     1')
+sys.stdout.flush()
+time.sleep({!r})
+print(' PERCENT DISCREPANCY =           0.01')
+print(' Normal termination of simulation')
+""".format(sleep))
+    f.close()
+    os.chmod(fname, os.stat(fname).st_mode | stat.S_IXUSR)
+    return os.path.abspath(fname)
+
+
+def _next_event(loop, events):
+    # the events of an async generator without the python 3.6 syntax
+    try:
+        return loop.run_until_complete(events.__anext__())
+    except StopAsyncIteration:
+        return None
+
+
+def test_run_model_async_events():
+    if sys.version_info < (3, 6):
+        return
+    import asyncio
+    from flopy.runasync import run_model_async
+    model_ws = os.path.join(cpth, 'async_model')
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    open(os.path.join(model_ws, 'm.nam'), 'w').close()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        exe = _write_progress_exe(cpth)
+        events = run_model_async(exe, 'm.nam', model_ws)
+        kinds = []
+        while True:
+            e = _next_event(loop, events)
+            if e is None:
+                break
+            kinds.append(e.kind)
+            if e.kind == 'timestep':
+                assert (e.kper, e.kstp) == (0, 0)
+            elif e.kind == 'discrepancy':
+                assert e.discrepancy == 0.01
+            elif e.kind == 'end':
+                assert e.success
+                assert e.returncode == 0
+        assert kinds == ['start', 'timestep', 'discrepancy', 'end']
+
+        # the model is killed when the caller stops before the end
+        exe = _write_progress_exe(cpth, sleep=30.)
+        events = run_model_async(exe, 'm.nam', model_ws)
+        while _next_event(loop, events).kind != 'timestep':
+            pass
+        t0 = time.time()
+        loop.run_until_complete(events.aclose())
+        assert time.time() - t0 < 10.
+        pid = int(open(os.path.join(model_ws, 'pid.txt')).read())
+        try:
+            os.kill(pid, 0)
+            raise AssertionError('the model process was not killed')
+        except OSError:
+            pass
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return
+
+
+def _write_fake_modflow(ws):
+    # writes the list file and the OC head file, a file that is not a
+    # declared output, and counts the runs
+    fname = os.path.join(ws, 'fakemf2005.py')
+    f = open(fname, 'w')
+    f.write('#!{}\n'.format(sys.executable))
+    f.write("""import sys
+for line in open(sys.argv[1]):
+    t = line.split()
+    if len(t) > 2 and t[0] in ('LIST', 'DATA(BINARY)'):
+        if t[0] == 'LIST' or t[2].endswith('.hds'):
+            open(t[2], 'w').write('output of ' + t[2] + chr(10))
+open('scratch.txt', 'w').write('scratch' + chr(10))
+open('runs.txt', 'a').write('run' + chr(10))
+print(' Normal termination of simulation')
+""")
+    f.close()
+    os.chmod(fname, os.stat(fname).st_mode | stat.S_IXUSR)
+    return os.path.abspath(fname)
+
+
+def test_run_model_cache():
+    model_ws = os.path.join(cpth, 'cache_model')
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    for fname in os.listdir(model_ws):
+        pth = os.path.join(model_ws, fname)
+        if os.path.isfile(pth):
+            os.remove(pth)
+    cache_dir = os.path.join(model_ws, 'cache')
+    exe = _write_fake_modflow(cpth)
+    m = flopy.modflow.Modflow('cache', exe_name=exe, model_ws=model_ws)
+    flopy.modflow.ModflowDis(m, 1, 2, 3)
+    flopy.modflow.ModflowBas(m)
+    flopy.modflow.ModflowLpf(m)
+    flopy.modflow.ModflowOc(m)
+    flopy.modflow.ModflowPcg(m)
+    m.write_input()
+    outputs = m.get_output_files()
+    assert 'cache.list' in outputs
+    assert 'cache.hds' in outputs
+    assert 'cache.cbc' in outputs
+
+    key = m.get_input_hash()
+    success, buff = m.run_model(silent=True, cache_dir=cache_dir)
+    assert success
+    # only the declared output files that were written are cached
+    files = sorted(os.listdir(os.path.join(cache_dir, key, 'files')))
+    assert files == ['cache.hds', 'cache.list']
+
+    # the results are restored without running the model
+    os.remove(os.path.join(model_ws, 'cache.hds'))
+    success, buff = m.run_model(silent=True, report=True,
+                                cache_dir=cache_dir)
+    assert success
+    assert buff[-1].lower().endswith('normal termination of simulation')
+    assert open(os.path.join(model_ws, 'cache.hds')).read() == \
+           'output of cache.hds\n'
+    assert len(open(os.path.join(model_ws, 'runs.txt')).readlines()) == 1
+
+    # the hash depends on the executable file, not only on its name
+    t = os.path.getmtime(exe)
+    os.utime(exe, (t + 10., t + 10.))
+    assert m.get_input_hash() != key
+    return
+
+
+def test_input_hash_name_file_inputs():
+    model_ws = os.path.join(cpth, 'hash_model')
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    mf = flopy.modflow.Modflow('flow', model_ws=model_ws)
+    flopy.modflow.ModflowDis(mf, 1, 2, 3)
+    flopy.modflow.ModflowBas(mf)
+    flopy.modflow.ModflowOc(mf)
+    mf.write_input()
+    hds = os.path.join(model_ws, 'flow.hds')
+    open(hds, 'w').write('heads 1\n')
+    # changing an output file does not change the hash
+    key = mf.get_input_hash()
+    open(hds, 'w').write('heads 2\n')
+    assert mf.get_input_hash() == key
+
+    # the flow-transport link file of MT3DMS
+    ftl = os.path.join(model_ws, 'mt3d_link.ftl')
+    open(ftl, 'w').write('link 1\n')
+    mt = flopy.mt3d.Mt3dms('transport', modflowmodel=mf, model_ws=model_ws,
+                           ftlfilename='mt3d_link.ftl')
+    mt.write_name_file()
+    assert 'mt3d_link.ftl' in mt.get_input_files()
+    key = mt.get_input_hash()
+    open(ftl, 'w').write('link 2\n')
+    assert mt.get_input_hash() != key
+
+    # the name file, and the head and budget files read by MODPATH
+    mp = flopy.modpath.Modpath('particles', modflowmodel=mf,
+                               model_ws=model_ws)
+    mp.write_name_file()
+    fnames = mp.get_input_files()
+    for fname in ('particles.mpnam', 'flow.dis', 'flow.hds'):
+        assert fname in fnames
+    key = mp.get_input_hash()
+    open(hds, 'w').write('heads 3\n')
+    assert mp.get_input_hash() != key
+    key = mp.get_input_hash()
+    open(os.path.join(model_ws, 'particles.mpnam'), 'a').write('\n')
+    assert mp.get_input_hash() != key
+    return
+
+
+if __name__ == '__main__':
+    test_run_model_async()
+    test_run_model_async_events()
+    test_run_models()
+    test_run_models_failures()
+    test_run_model_cache()
+    test_input_hash_name_file_inputs()
@@ -0,0 +1,101 @@
+"""
+Test the model and package checks
+"""
+import os
+import numpy as np
+import flopy
+
+cpth = os.path.join('temp', 't005')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def test_check_no_solver():
+    m = flopy.modflow.Modflow('nosolver', model_ws=cpth)
+    flopy.modflow.ModflowDis(m, 1, 2, 3)
+    flopy.modflow.ModflowBas(m)
+    flopy.modflow.ModflowLpf(m)
+    flopy.modflow.ModflowOc(m)
+    chk = m.check(verbose=False)
+    sa = chk.summary_array
+    assert len(sa) == 1
+    assert sa.type[0] == 'Error'
+    assert sa.package[0] == 'model'
+    assert 'No solver package' in sa.desc[0]
+    assert (sa.k[0], sa.i[0], sa.j[0]) == (0, 0, 0)
+    assert sa.value[0] == 0.
+    return
+
+
+def test_check_rch_warnings():
+    m = flopy.modflow.Modflow('rch', model_ws=cpth)
+    flopy.modflow.ModflowDis(m, 1, 2, 3, top=10., botm=0.)
+    flopy.modflow.ModflowBas(m)
+    flopy.modflow.ModflowLpf(m, hk=1e-6)
+    flopy.modflow.ModflowPcg(m)
+    flopy.modflow.ModflowOc(m)
+    flopy.modflow.ModflowRch(m, rech=1.)
+    chk = m.rch.check(verbose=False)
+    sa = chk.summary_array
+    assert len(sa) > 0
+    assert (sa.type == 'Warning').all()
+    assert (sa.package == 'RCH').all()
+    # the rows of package checks are added to the model summary
+    chk = m.check(verbose=False)
+    assert len(chk.summary_array) == len(sa)
+    assert np.allclose(chk.summary_array.value, sa.value)
+    return
+
+
+def test_check_stress_periods():
+    m = flopy.modflow.Modflow('periods', model_ws=cpth)
+    nlay, nrow, ncol = 2, 5, 6
+    botm = [-5., -10.]
+    flopy.modflow.ModflowDis(m, nlay, nrow, ncol, nper=3, top=0., botm=botm)
+    ibound = np.ones((nlay, nrow, ncol), dtype=int)
+    ibound[0, 0, 0] = 0
+    ibound[1, 4, 5] = 0
+    flopy.modflow.ModflowBas(m, ibound=ibound)
+    riv = {0: [[0, 0, 0, -20., 1., -30.], [0, 1, 1, -1., 1., -2.]],
+           1: [[0, 1, 1, -1., 1., -2.], [1, 4, 5, -11., np.nan, -12.]],
+           2: [[0, 2, 2, -1., 1., -2.]]}
+    flopy.modflow.ModflowRiv(m, stress_period_data=riv)
+    ghb = {0: [[0, 3, 3, -20., 1.]], 1: [[0, 3, 3, 1., 1.]],
+           2: [[0, 3, 3, -20., 1.], [1, 0, 0, -20., 1.]]}
+    flopy.modflow.ModflowGhb(m, stress_period_data=ghb)
+    flopy.modflow.ModflowPcg(m)
+    chk = m.check(verbose=False, level=1)
+    # rows by period, then by check
+    rows = [('RIV', 1, 4, 5, 0., 'RIV package: Not a number'),
+            ('RIV', 0, 0, 0, -20., 'RIV package: stage below cell bottom'),
+            ('RIV', 0, 0, 0, -30., 'RIV package: rbot below cell bottom'),
+            ('RIV', 1, 4, 5, -11., 'RIV package: stage below cell bottom'),
+            ('RIV', 1, 4, 5, -12., 'RIV package: rbot below cell bottom'),
+            ('GHB', 0, 3, 3, -20.,
+             'GHB package: BC elevation below cell bottom'),
+            ('GHB', 0, 3, 3, -20.,
+             'GHB package: BC elevation below cell bottom'),
+            ('GHB', 1, 0, 0, -20.,
+             'GHB package: BC elevation below cell bottom')]
+    sa = chk.summary_array
+    sa = sa[sa.type == 'Error']
+    assert [(r.package, r.k, r.i, r.j, r.value, r.desc.strip())
+            for r in sa] == rows
+    # BCs in inactive cells are reported once per period as warnings
+    sa = chk.summary_array
+    sa = sa[sa.type == 'Warning']
+    assert [(r.package, r.k, r.i, r.j) for r in sa] == \
+           [('RIV', 0, 0, 0), ('RIV', 1, 4, 5)]
+    # checks that fail in any stress period are not listed as passed
+    assert 'RIV package: RIV stage below rbots' in chk.passed
+    assert 'RIV package: stage below cell bottom' not in chk.passed
+    assert 'RIV package: rbot below cell bottom' not in chk.passed
+    chk = m.riv.check(verbose=False)
+    assert chk.passed == ['RIV stage below rbots']
+    return
+
+
+if __name__ == '__main__':
+    test_check_no_solver()
+    test_check_rch_warnings()
+    test_check_stress_periods()
@@ -0,0 +1,319 @@
+"""
+Test the SFR2 reach and segment computations against loop implementations
+"""
+import os
+import numpy as np
+import flopy
+
+cpth = os.path.join('temp', 't006')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _get_sfr(outseg, nreaches, seed=0):
+    """SFR2 package with segments 1 to len(outseg), nreaches[i] reaches in
+    segment i + 1, and random reach lengths and elevations."""
+    rng = np.random.RandomState(seed)
+    nss = len(outseg)
+    nstrm = int(np.sum(nreaches))
+    ncol = int(np.ceil(nstrm / 10.))
+    m = flopy.modflow.Modflow('sfr', model_ws=cpth)
+    flopy.modflow.ModflowDis(m, 1, 10, ncol)
+    rd = flopy.modflow.ModflowSfr2.get_empty_reach_data(nstrm)
+    rd['k'] = 0
+    rd['i'] = np.arange(nstrm) % 10
+    rd['j'] = np.arange(nstrm) // 10
+    rd['iseg'] = np.repeat(np.arange(1, nss + 1), nreaches)
+    rd['ireach'] = np.concatenate([np.arange(1, n + 1) for n in nreaches])
+    rd['rchlen'] = rng.rand(nstrm) * 100. + 1.
+    rd['strtop'] = rng.rand(nstrm) * 100. + 1.
+    sd = flopy.modflow.ModflowSfr2.get_empty_segment_data(nss)
+    sd['nseg'] = np.arange(1, nss + 1)
+    sd['outseg'] = outseg
+    sd['icalc'] = 1
+    sd['elevup'] = rng.rand(nss) * 100.
+    sd['elevdn'] = rng.rand(nss) * 100.
+    # reaches in random order
+    rd = rd[rng.permutation(nstrm)]
+    return flopy.modflow.ModflowSfr2(m, nstrm=nstrm, nss=nss,
+                                     reach_data=rd, segment_data={0: sd})
+
+
+def _get_random_outseg(nss, seed=0):
+    # segments route to a segment with a larger number, or are outlets
+    rng = np.random.RandomState(seed)
+    outseg = np.zeros(nss, dtype=int)
+    for i in range(nss - 1):
+        if rng.rand() > 0.1:
+            outseg[i] = rng.randint(i + 2, nss + 1)
+    return outseg
+
+
+def _loop_outreaches(rd, sd):
+    outreach = []
+    for n in range(len(rd)):
+        if n + 1 < len(rd) and rd.iseg[n + 1] == rd.iseg[n]:
+            outreach.append(rd.reachID[n + 1])
+            continue
+        outseg = sd.outseg[sd.nseg == rd.iseg[n]][0]
+        first = (rd.iseg == outseg) & (rd.ireach == 1)
+        outreach.append(rd.reachID[first][0] if outseg > 0 and
+                        first.any() else 0)
+    return np.array(outreach)
+
+
+def _loop_slopes(rd):
+    raw = [(rd.strtop[n] - rd.strtop[n + 1]) / rd.rchlen[n]
+           for n in range(len(rd) - 1)] + [0.]
+    slopes = []
+    for n in range(len(rd)):
+        if n + 1 < len(rd) and rd.iseg[n + 1] == rd.iseg[n]:
+            slopes.append(raw[n])
+        elif rd.outreach[n] != 0:
+            slopes.append((rd.strtop[n] - rd.strtop[rd.outreach[n] - 1]) /
+                          rd.rchlen[n])
+        else:
+            slopes.append(raw[max(n - 1, 0)])
+    return np.array(slopes)
+
+
+def _loop_interpolate(rd, sd, segvar1, segvar2):
+    values = []
+    for seg in sd.nseg:
+        reaches = rd[rd.iseg == seg]
+        dist = np.cumsum(reaches.rchlen) - 0.5 * reaches.rchlen
+        fp = [sd[segvar1][sd.nseg == seg][0], sd[segvar2][sd.nseg == seg][0]]
+        values += np.interp(dist, [dist[0], dist[-1]], fp).tolist()
+    return np.array(values)
+
+
+def _get_random_network(nss, seed=0):
+    # a random tree with segments numbered in random order; segments route
+    # to a segment closer to the outlet, an outlet (0) or out of the model
+    # (999999)
+    rng = np.random.RandomState(seed)
+    perm = rng.permutation(nss) + 1
+    outseg = np.zeros(nss, dtype=int)
+    for pos in range(1, nss):
+        r = rng.rand()
+        if r > 0.15:
+            outseg[perm[pos] - 1] = perm[rng.randint(0, pos)]
+        elif r < 0.05:
+            outseg[perm[pos] - 1] = 999999
+    return outseg
+
+
+def _loop_path(outseg, s):
+    """segments downstream of segment s, starting with s"""
+    path = [s]
+    while 0 < outseg[path[-1] - 1] < 999999:
+        path.append(outseg[path[-1] - 1])
+    return path
+
+
+def _loop_renumber(nseg, outseg):
+    """renumbering in breadth-first order from the outlets"""
+    numbers = {0: 0}
+    n = len(nseg)
+    level = nseg[outseg == 0].tolist()
+    while len(level) > 0:
+        upsegs = []
+        for s in level:
+            numbers[s] = n
+            n -= 1
+            upsegs += nseg[outseg == s].tolist()
+        level = upsegs
+    return numbers
+
+
+def test_routing():
+    for seed in range(4):
+        outseg = _get_random_network(60, seed)
+        nss = len(outseg)
+        sfr = _get_sfr(outseg, [2] * nss, seed)
+        # the constructor replaces 999999 with 0
+        sfr.segment_data[0]['outseg'] = outseg
+        sfr.get_outlets(verbose=False)
+        # outlets and the array of outsegs
+        paths = [_loop_path(outseg, s) for s in range(1, nss + 1)]
+        assert sfr.outlets[0] == {s: p[-1] for s, p in
+                                  zip(range(1, nss + 1), paths)}
+        outsegs = [list(range(1, nss + 1)), outseg.tolist()]
+        while max(outsegs[-1]) > 0:
+            outsegs.append([outseg[s - 1] if 0 < s < 999999 else 0
+                            for s in outsegs[-1]])
+        assert sfr.outsegs[0].tolist() == outsegs
+        # upstream segments and headwaters; 999999 is not a segment, so
+        #  it is not listed with the segments that route to it
+        upsegs = {}
+        for p in paths:
+            for s in p[1:]:
+                upsegs.setdefault(s, set()).add(p[0])
+        all_upsegs = sfr.get_upsegs()[0]
+        assert sorted(all_upsegs.keys()) == sorted(upsegs.keys())
+        for s, u in all_upsegs.items():
+            assert sorted(u) == sorted(upsegs[s])
+        headwaters = [s for s in range(1, nss + 1) if s not in upsegs]
+        assert sorted(sfr._get_headwaters().tolist()) == headwaters
+    return
+
+
+def test_renumber_segments():
+    outseg = _get_random_network(60, 1)
+    outseg[outseg == 999999] = 0
+    nss = len(outseg)
+    sfr = _get_sfr(outseg, [2] * nss)
+    sd = sfr.segment_data[0].copy()
+    iseg = sfr.reach_data.iseg.copy()
+    numbers = _loop_renumber(sd.nseg, sd.outseg)
+    sfr.renumber_segments()
+    sd1 = sfr.segment_data[0]
+    assert sd1.nseg.tolist() == list(range(1, nss + 1))
+    routed = sd1.outseg > 0
+    assert (sd1.outseg[routed] > sd1.nseg[routed]).all()
+    order = np.argsort([numbers[s] for s in sd.nseg])
+    assert sd1.outseg.tolist() == [numbers[s] for s in sd.outseg[order]]
+    assert sfr.reach_data.iseg.tolist() == [numbers[s] for s in iseg]
+    return
+
+
+def test_outreaches_slopes():
+    nss = 200
+    nreaches = np.random.RandomState(1).randint(1, 6, nss)
+    sfr = _get_sfr(_get_random_outseg(nss), nreaches)
+    sfr.get_outreaches()
+    rd = sfr.reach_data
+    sd = sfr.segment_data[0]
+    assert (rd.reachID == np.arange(1, len(rd) + 1)).all()
+    assert (rd.outreach == _loop_outreaches(rd, sd)).all()
+    sfr.get_slopes()
+    assert np.allclose(sfr.reach_data.slope, _loop_slopes(sfr.reach_data))
+    values = sfr._interpolate_to_reaches('elevup', 'elevdn')
+    assert np.allclose(values, _loop_interpolate(rd, sd, 'elevup', 'elevdn'))
+    return
+
+
+def test_outreaches_outseg_1():
+    # segment 2 routes to segment 1; the last reach of segment 2 routes to
+    # the first reach of segment 1 (it is not an outlet)
+    sfr = _get_sfr([0, 1, 2], [2, 3, 1])
+    sfr.get_outreaches()
+    rd = sfr.reach_data
+    assert rd.outreach.tolist() == [2, 0, 4, 5, 1, 3]
+    sfr.get_slopes()
+    assert np.isclose(rd.slope[4], (rd.strtop[4] - rd.strtop[0]) / rd.rchlen[4])
+    return
+
+
+def _get_check_sfr():
+    """SFR2 package with reach numbering, routing, conductance, elevation
+    and slope problems."""
+    rng = np.random.RandomState(2)
+    m = flopy.modflow.Modflow('chk', model_ws=cpth)
+    flopy.modflow.ModflowDis(m, 2, 6, 6, top=100., botm=[50., 0.])
+    nss = 12
+    nr = rng.randint(1, 5, nss)
+    nstrm = nr.sum()
+    rd = flopy.modflow.ModflowSfr2.get_empty_reach_data(nstrm)
+    rd['k'] = 0
+    rd['i'] = rng.randint(0, 6, nstrm)
+    rd['j'] = rng.randint(0, 6, nstrm)
+    rd['iseg'] = np.repeat(np.arange(1, nss + 1), nr)
+    rd['ireach'] = np.concatenate([np.arange(1, n + 1) for n in nr])
+    # reach numbers 2, 4, ... in segment 4
+    rd['ireach'][rd.iseg == 4] = np.arange(1, (rd.iseg == 4).sum() + 1) * 2
+    rd['rchlen'] = np.round(rng.rand(nstrm) * 100. + 1., 2)
+    rd['strtop'] = np.round(rng.rand(nstrm) * 70. + 40., 2)
+    rd['strthick'] = 1.
+    rd['strhc1'] = np.round(rng.rand(nstrm) + 0.1, 2)
+    rd['slope'] = np.round(rng.rand(nstrm) * 2., 3)
+    sd = flopy.modflow.ModflowSfr2.get_empty_segment_data(nss)
+    sd['nseg'] = np.arange(1, nss + 1)
+    sd['outseg'] = np.r_[np.arange(2, nss + 1), 0]
+    # circular routing 2 -> 3 -> 4 -> 2, and an outlet at segment 8
+    sd['outseg'][[3, 7]] = [2, 0]
+    sd['icalc'] = 1
+    sd['width1'] = np.round(rng.rand(nss) * 10. + 1., 2)
+    sd['width2'] = sd['width1']
+    return flopy.modflow.ModflowSfr2(m, nstrm=-nstrm, nss=nss, isfropt=1,
+                                     reach_data=rd, segment_data={0: sd})
+
+
+def _get_table(txt, title):
+    """rows of the table that follows the line title in txt"""
+    lines = txt.split('\n')
+    i = lines.index(title) + 1
+    ncol = len(lines[i].split())
+    rows = []
+    i += 1
+    while i < len(lines) and len(lines[i].split()) == ncol:
+        rows.append(lines[i].split())
+        i += 1
+    return rows
+
+
+def test_check():
+    sfr = _get_check_sfr()
+    chk = sfr.check(verbose=False, level=1)
+    rd = sfr.reach_data
+    assert chk.passed == ['segment elevations',
+                          'segment elevations vs. model grid',
+                          'minimum slope']
+    assert chk.warnings == ['segment numbering order',
+                            'overlapping conductance', 'reach elevations',
+                            'maximum slope']
+    assert chk.errors == ['continuity in segment and reach numbering',
+                          'circular routing',
+                          'reach elevations vs. grid elevations']
+    assert 'Segment 4 has Invalid reach numbering' in chk.txt
+    assert 'at segments: 2\n' in chk.txt
+    assert '\n2 3 4\n' in chk.txt
+
+    # cells with more than one reach with a non-zero conductance
+    w = sfr._interpolate_to_reaches('width1', 'width2')
+    cond = rd.strhc1 * w * rd.rchlen / rd.strthick
+    cells = {}
+    for n in range(len(rd)):
+        if cond[n] > 0:
+            cells.setdefault(rd.node[n], []).append(n)
+    reaches = sorted([(rd.iseg[n], rd.ireach[n]) for c in cells.values()
+                      if len(c) > 1 for n in c])
+    rows = _get_table(chk.txt, 'Nodes with overlapping conductances:')
+    assert sorted([(int(r[4]), int(r[5])) for r in rows]) == reaches
+
+    # reaches with a downstream rise in streambed elevation, with the
+    # elevation of their outreach
+    rises = sorted([(rd.reachID[n], rd.strtop[rd.outreach[n] - 1])
+                    for n in range(len(rd)) if rd.outreach[n] > 0 and
+                    rd.strtop[rd.outreach[n] - 1] > rd.strtop[n]])
+    rows = _get_table(chk.txt, 'Elevation rises:')
+    assert [int(r[7]) for r in sorted(rows, key=lambda r: int(r[7]))] == \
+           [r[0] for r in rises]
+    assert np.allclose([float(r[5]) for r in
+                        sorted(rows, key=lambda r: int(r[7]))],
+                       [r[1] for r in rises])
+
+    # streambed bottoms below the layer bottom and tops above the model top
+    rows = _get_table(chk.txt, 'Layer bottom violations:')
+    below = rd.reachID[rd.strtop - rd.strthick < 50.]
+    assert sorted([int(r[8]) for r in rows]) == sorted(below.tolist())
+    rows = _get_table(chk.txt, 'Model top violations:')
+    above = rd.reachID[rd.strtop > 100.]
+    assert sorted([int(r[6]) for r in rows]) == sorted(above.tolist())
+
+    rows = _get_table(chk.txt, 'Reaches with high slopes:')
+    assert len(rows) == (rd.slope > 1.).sum()
+
+    # decreasing segment numbers are also reported at level 0
+    chk = flopy.modflow.mfsfr2.check(sfr, verbose=False, level=0)
+    chk.numbering()
+    assert 'segment numbering order' in chk.warnings
+    return
+
+
+if __name__ == '__main__':
+    test_routing()
+    test_renumber_segments()
+    test_outreaches_slopes()
+    test_outreaches_outseg_1()
+    test_check()
@@ -0,0 +1,113 @@
+"""
+Test the DIS geometry helpers against loop implementations
+"""
+import os
+import numpy as np
+import flopy
+
+cpth = os.path.join('temp', 't007')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _get_dis(laycbd=0, seed=1):
+    rng = np.random.RandomState(seed)
+    nlay, nrow, ncol = 3, 4, 5
+    nbotm = nlay + np.sum(laycbd)
+    top = 100. + rng.rand(nrow, ncol)
+    botm = np.array([np.full((nrow, ncol), 80. - 20. * k)
+                     for k in range(nbotm)]) + rng.rand(nbotm, nrow, ncol)
+    m = flopy.modflow.Modflow('dis', model_ws=cpth)
+    return flopy.modflow.ModflowDis(m, nlay, nrow, ncol,
+                                    delr=rng.rand(ncol) * 10. + 1.,
+                                    delc=rng.rand(nrow) * 10. + 1.,
+                                    top=top, botm=botm, laycbd=laycbd)
+
+
+def _loop_lrc(dis, node):
+    nrc = dis.nrow * dis.ncol
+    k = int(node / nrc)
+    if (k * nrc) < node:
+        k += 1
+    ij = int(node - (k - 1) * nrc)
+    i = int(ij / dis.ncol)
+    if (i * dis.ncol) < ij:
+        i += 1
+    j = ij - (i - 1) * dis.ncol
+    return k, i, j
+
+
+def _loop_geometry(dis):
+    """y, x, z centroids, thickness and volumes of the model layers"""
+    delr, delc = dis.delr.array, dis.delc.array
+    top, botm = dis.top.array, dis.botm.array
+    y = np.empty(dis.nrow)
+    for r in range(dis.nrow):
+        if r == 0:
+            y[r] = delc[r] / 2.
+        else:
+            y[r] = y[r - 1] + (delc[r] + delc[r - 1]) / 2.
+    x = np.empty(dis.ncol)
+    for c in range(dis.ncol):
+        if c == 0:
+            x[c] = delr[c] / 2.
+        else:
+            x[c] = x[c - 1] + (delr[c] + delr[c - 1]) / 2.
+    z = np.empty((dis.nlay, dis.nrow, dis.ncol))
+    thk = np.empty((dis.nlay, dis.nrow, dis.ncol))
+    vol = np.empty((dis.nlay, dis.nrow, dis.ncol))
+    laycbd = dis.laycbd.array
+    ib = 0
+    for k in range(dis.nlay):
+        # the top of a layer is the bottom of the confining bed above it
+        ltop = top if k == 0 else botm[ib - 1]
+        z[k] = (ltop + botm[ib]) / 2.
+        thk[k] = ltop - botm[ib]
+        for r in range(dis.nrow):
+            for c in range(dis.ncol):
+                vol[k, r, c] = thk[k, r, c] * delc[r] * delr[c]
+        ib += 1 + int(laycbd[k] > 0)
+    return y[::-1], x, z, thk, vol
+
+
+def test_geometry():
+    for laycbd in (0, [0, 1, 0]):
+        dis = _get_dis(laycbd)
+        y, x, z, thk, vol = _loop_geometry(dis)
+        y1, x1, z1 = dis.get_node_coordinates()
+        assert np.allclose(y1, y)
+        assert np.allclose(x1, x)
+        assert np.allclose(z1, z)
+        assert np.allclose(dis.zcentroids, z)
+        assert np.allclose(dis.get_cell_volumes(), vol, rtol=1e-6)
+        if laycbd == 0:
+            assert np.allclose(dis.thickness.array, thk)
+        # the cached results are updated when the arrays are replaced
+        dis.botm = dis.botm.array - 5.
+        dis.top = dis.top.array + 3.
+        y, x, z, thk, vol = _loop_geometry(dis)
+        assert np.allclose(dis.zcentroids, z)
+        assert np.allclose(dis.get_cell_volumes(), vol, rtol=1e-6)
+        if laycbd == 0:
+            assert np.allclose(dis.thickness.array, thk)
+    return
+
+
+def test_lrc_node():
+    dis = _get_dis()
+    nodes = list(range(1, dis.nlay * dis.nrow * dis.ncol + 1))
+    lrc = [_loop_lrc(dis, n) for n in nodes]
+    assert dis.get_lrc(nodes) == lrc
+    assert dis.get_lrc(7) == [lrc[6]]
+    assert dis.get_node(lrc) == nodes
+    assert dis.get_node(lrc[6]) == [7]
+    # arrays give arrays
+    k, i, j = dis.get_lrc(np.array(nodes))
+    assert (np.array([k, i, j]).T == np.array(lrc)).all()
+    assert (dis.get_node(np.array(lrc)) == np.array(nodes)).all()
+    return
+
+
+if __name__ == '__main__':
+    test_geometry()
+    test_lrc_node()
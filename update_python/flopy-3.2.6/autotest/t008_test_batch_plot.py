@@ -0,0 +1,67 @@
+"""
+Test rendering of frames with the BatchPlotter
+"""
+import os
+import numpy as np
+import flopy
+
+cpth = os.path.join('temp', 't008')
+if not os.path.isdir(cpth):
+    os.makedirs(cpth)
+
+
+def _get_model(nper=3):
+    m = flopy.modflow.Modflow('batch', model_ws=cpth)
+    flopy.modflow.ModflowDis(m, 2, 4, 5, nper=nper, delr=10., delc=10.)
+    ibound = np.ones((2, 4, 5), dtype=int)
+    ibound[:, 0, 0] = 0
+    flopy.modflow.ModflowBas(m, ibound=ibound)
+    rech = dict((kper, 1e-3 * (kper + 1)) for kper in range(nper))
+    flopy.modflow.ModflowRch(m, rech=rech)
+    return m
+
+
+def test_write_frames():
+    m = _get_model()
+    heads = np.arange(3 * 2 * 4 * 5, dtype=np.float32).reshape(3, 2, 4, 5)
+    heads[:, :, 1, 1] = -999.
+    for lod in (True, False):
+        bp = flopy.plot.BatchPlotter(m.sr, layer=1, lod=lod,
+                                     ibound=m.bas6.ibound.array,
+                                     masked_values=[-999.], contour=True)
+        fnames = bp.write_frames(heads, os.path.join(cpth, 'head'))
+        assert len(fnames) == 3
+        for fname in fnames:
+            assert os.path.isfile(fname)
+        # the layer and the masked values are plotted
+        # QuadMesh only maps rank 1 arrays in matplotlib < 3.5
+        a = bp._quadmesh.get_array()
+        assert a.ndim == 1
+        if not lod:
+            assert np.allclose(a.compressed()[:3], heads[2, 1, 0, :3])
+            assert a.mask.reshape(4, 5)[1, 1]
+        rgba = bp.get_rgba()
+        assert rgba.ndim == 3 and rgba.shape[2] == 4
+    return
+
+
+def test_transient2d_frames():
+    m = _get_model()
+    # Transient2d arrays have a single layer for any plotted layer
+    bp = flopy.plot.BatchPlotter(m.sr, layer=1, lod=False,
+                                 title='kper {kper}')
+    frames = list(bp._frames(m.rch.rech))
+    assert len(frames) == 3
+    for a, info in frames:
+        assert np.allclose(a, 1e-3 * info['kper'])
+    fnames = bp.write_frames(m.rch.rech, os.path.join(cpth, 'rech'),
+                             kstpkper=[2])
+    assert len(fnames) == 1
+    assert bp._title.get_text() == 'kper 3'
+    assert np.allclose(bp._quadmesh.get_array(), 3e-3)
+    return
+
+
+if __name__ == '__main__':
+    test_write_frames()
+    test_transient2d_frames()
@@ -20,6 +20,8 @@ contribute.
 
 """
 
+import sys
+
 __name__ = 'flopy'
 __author__ = 'Mark Bakker, Vincent Post, Chris Langevin, Joe Hughes, Jeremy White, Jeff Starn, Mike Fienen, and Alain Frances'
 from .version import __version__, __build__
@@ -32,4 +34,6 @@ from . import modpath
 from . import utils
 from . import plot
 from . import export
-from .mbase import run_model, which
+from .mbase import run_model, run_models, which
+if sys.version_info >= (3, 6):
+    from .runasync import run_model_async
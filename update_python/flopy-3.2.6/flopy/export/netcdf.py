@@ -13,6 +13,9 @@ ITMUNI = {0: "undefined", 1: "seconds", 2: "minutes", 3: "hours", 4: "days",
           5: "years"}
 LENUNI = {0: "undefined", 1: "feet", 2: "meters", 3: "centimeters"}
 PRECISION_STRS = ["f4", "f8", "i4"]
+CHUNK_STRATEGIES = ["balanced", "timeseries", "map"]
+# approximate size of one uncompressed chunk
+CHUNK_TARGET_BYTES = 1024 * 1024
 
 STANDARD_VARS = ["longitude","latitude","layer","elevation","delr","delc","time"]
 
@@ -115,6 +118,17 @@ class NetCdf(object):
     forgive: what to do if a duplicate variable name is being created.  If
         True, then the newly requested var is skipped.  If False, then
         an exception is raised.
+    chunk_strategy : str
+        how variables are chunked on disk.  "timeseries" favors reading the
+        full time series of a few cells, "map" favors reading one layer at
+        one time, and "balanced" is a compromise between the two.
+        (default is "balanced")
+    complevel : int
+        zlib compression level (0-9).  If 0, variables are not compressed.
+        (default is 4)
+    shuffle : bool
+        flag to apply the HDF5 shuffle filter before compression
+        (default is True)
 
     Notes
     -----
@@ -125,9 +139,15 @@ class NetCdf(object):
     """
 
     def __init__(self, output_filename, model, time_values=None, verbose=None,
-                 logger=None, forgive=False):
+                 logger=None, forgive=False, chunk_strategy="balanced",
+                 complevel=4, shuffle=True):
 
         assert output_filename.lower().endswith(".nc")
+        assert chunk_strategy in CHUNK_STRATEGIES, \
+            "unrecognized chunk_strategy {0}, should be one of {1}". \
+                format(chunk_strategy, CHUNK_STRATEGIES)
+        assert 0 <= int(complevel) <= 9, \
+            "complevel must be between 0 and 9: {0}".format(complevel)
         if verbose is None:
             verbose = model.verbose
         if logger is not None:
@@ -142,6 +162,9 @@ class NetCdf(object):
         self.output_filename = output_filename
 
         self.forgive = bool(forgive)
+        self.chunk_strategy = chunk_strategy
+        self.complevel = int(complevel)
+        self.shuffle = bool(shuffle)
 
         assert model.dis is not None
         self.model = model
@@ -339,7 +362,8 @@ class NetCdf(object):
             output_filename = str(time.mktime(datetime.now().timetuple()))+".nc"
         new_net = cls(output_filename,other.model,
                       time_values=other.time_values_arg,verbose=verbose,
-                      logger=logger)
+                      logger=logger,chunk_strategy=other.chunk_strategy,
+                      complevel=other.complevel,shuffle=other.shuffle)
         return new_net
 
     def difference(self, other, minuend="self", mask_zero_diff=True,onlydiff=True):
@@ -414,7 +438,9 @@ class NetCdf(object):
         # should be good to go
         time_values = self.nc.variables.get("time")[:]
         new_net = NetCdf(self.output_filename.replace(".nc",".diff.nc"),
-                         self.model,time_values=time_values)
+                         self.model,time_values=time_values,
+                         chunk_strategy=self.chunk_strategy,
+                         complevel=self.complevel,shuffle=self.shuffle)
         # add the vars to the instance
         for vname in self_vars:
             if vname not in self.var_attr_dict or \
@@ -556,11 +582,8 @@ class NetCdf(object):
         self.ys = None
         self.xs = None
 
+        # the time chunk size is set once the number of times is known
         self.chunks = {"time": None}
-        self.chunks["x"] = int(self.shape[2] / 4) + 1
-        self.chunks["y"] = int(self.shape[1] / 4) + 1
-        self.chunks["z"] = self.shape[0]
-        self.chunks["layer"] = self.shape[0]
 
         self.nc = None
 
@@ -695,7 +718,7 @@ class NetCdf(object):
         # time
         if time_values is None:
             time_values = np.cumsum(self.model.dis.perlen)
-        self.chunks["time"] = min(len(time_values), 100)
+        self.chunks = self.get_chunks(len(time_values))
         self.nc.createDimension("time", len(time_values))
         self.nc.createDimension('layer', self.shape[0])
         self.nc.createDimension('y', self.shape[1])
@@ -796,6 +819,46 @@ class NetCdf(object):
         exp._CoordinateAxes = "layer"
         return
 
+    def get_chunks(self, ntimes):
+        """
+        Get the chunk size of each dimension for self.chunk_strategy
+
+        Parameters
+        ----------
+        ntimes : int
+            number of entries in the time dimension
+
+        Returns
+        -------
+        chunks : dict
+            chunk size keyed by dimension name
+
+        Notes
+        -----
+        chunks are sized to hold about CHUNK_TARGET_BYTES of f4 values.
+        "timeseries" chunks hold all (or many) times of a small block of
+        cells in one layer, "map" chunks hold all (or many) rows of one
+        layer at one time, and "balanced" chunks are roughly cubic in
+        time, row and column.
+
+        """
+        nlay, nrow, ncol = self.shape
+        ntimes = max(1, int(ntimes))
+        nvals = max(1, CHUNK_TARGET_BYTES // 4)
+        if self.chunk_strategy == "timeseries":
+            ct = min(ntimes, nvals)
+            tile = max(1, int(np.sqrt(nvals // ct)))
+            cy, cx = min(nrow, tile), min(ncol, tile)
+        elif self.chunk_strategy == "map":
+            ct = 1
+            cx = ncol
+            cy = max(1, min(nrow, nvals // ncol))
+        else:
+            ct = min(ntimes, max(1, int(round(nvals ** (1.0 / 3.0)))))
+            tile = max(1, int(np.sqrt(nvals // ct)))
+            cy, cx = min(nrow, tile), min(ncol, tile)
+        return {"time": ct, "layer": 1, "y": cy, "x": cx}
+
     @staticmethod
     def normalize_name(name):
         return name.replace('.', '_').replace(' ', '_').replace('-', '_')
@@ -869,12 +932,18 @@ class NetCdf(object):
                 "netcdf.create_variable() chunk size of {0} is None in self.chunks". \
                     format(dimension)
             chunks.append(chunk)
+        # 1D (coordinate) variables are small - store them in one chunk
+        if len(dimensions) == 1:
+            chunks = [len(self.nc.dimensions[dimensions[0]])]
 
         self.var_attr_dict[name] = attributes
 
         var = self.nc.createVariable(name, precision_str, dimensions,
-                                     fill_value=self.fillvalue, zlib=True)#,
-                                     #chunksizes=tuple(chunks))
+                                     fill_value=self.fillvalue,
+                                     zlib=self.complevel > 0,
+                                     complevel=max(1, self.complevel),
+                                     shuffle=self.shuffle,
+                                     chunksizes=tuple(chunks))
         for k, v in attributes.items():
             try:
                 var.setncattr(k, v)
@@ -923,4 +992,69 @@ class NetCdf(object):
         elif model.sip is not None:
             return model.sip.hclose,-999
         elif model.gmg is not None:
-            return model.gmg.hclose,model.gmg.rclose
\ No newline at end of file
+            return model.gmg.hclose,model.gmg.rclose
+
+def time_access_patterns(filename, var_name, layer=0, row=None, col=None,
+                         nreps=3):
+    """
+    Time the two common ways of reading a (time, layer, y, x) variable
+    from a netcdf file: the full time series of a single cell and a
+    single layer at a single time.  Useful for comparing the
+    chunk_strategy options of NetCdf.
+
+    Parameters
+    ----------
+    filename : str
+        netcdf file to read
+    var_name : str
+        name of a variable with ("time", "layer", "y", "x") dimensions
+    layer : int
+        zero-based layer to read (default is 0)
+    row : int
+        zero-based row of the time series cell.  If None, the middle row
+        is used. (default is None)
+    col : int
+        zero-based column of the time series cell.  If None, the middle
+        column is used. (default is None)
+    nreps : int
+        number of times each read is repeated.  The fastest read is
+        reported. (default is 3)
+
+    Returns
+    -------
+    times : dict
+        fastest read time in seconds keyed by "timeseries" and "map"
+
+    Examples
+    --------
+    >>> import flopy
+    >>> t = flopy.export.netcdf.time_access_patterns('model.nc', 'head')
+
+    """
+    try:
+        import netCDF4
+    except Exception as e:
+        raise Exception("error importing netCDF4: {0}".format(str(e)))
+
+    nc = netCDF4.Dataset(filename, 'r')
+    var = nc.variables[var_name]
+    assert var.ndim == 4, "time_access_patterns() requires a 4D variable"
+    ntimes, nlay, nrow, ncol = var.shape
+    if row is None:
+        row = nrow // 2
+    if col is None:
+        col = ncol // 2
+
+    times = {"timeseries": None, "map": None}
+    for i in range(nreps):
+        t0 = time.time()
+        a = var[:, layer, row, col]
+        t1 = time.time()
+        a = var[ntimes // 2, layer, :, :]
+        t2 = time.time()
+        if times["timeseries"] is None or t1 - t0 < times["timeseries"]:
+            times["timeseries"] = t1 - t0
+        if times["map"] is None or t2 - t1 < times["map"]:
+            times["map"] = t2 - t1
+    nc.close()
+    return times
@@ -58,144 +58,262 @@ def get_var_array_dict(m):
     return vdict
 
 
-def ensemble_helper(inputs_filename,outputs_filename,models,add_reals=True,**kwargs):
+class _EnsembleStats(object):
+    """accumulate the per-cell mean and standard deviation of an ensemble
+    one realization at a time (Welford's algorithm).  NaN and FILLVALUE
+    entries are treated as missing.  If quantiles are requested, a
+    reservoir sample of at most nsample realizations is kept and the
+    quantiles are estimated from the sample.
+    """
+
+    def __init__(self, quantiles=None, nsample=50, seed=None):
+        self.quantiles = [] if quantiles is None else list(quantiles)
+        self.nsample = int(nsample)
+        self.rng = np.random.RandomState(seed)
+        self.nreal = 0
+        self.count = {}
+        self.mean = {}
+        self.m2 = {}
+        self.sample = {}
+
+    def update(self, vdict):
+        self.nreal += 1
+        # pick the reservoir slot for this realization (algorithm R) -
+        # the same slot is used for every variable
+        slot = None
+        if len(self.quantiles) > 0:
+            if self.nreal <= self.nsample:
+                slot = self.nreal - 1
+            else:
+                j = self.rng.randint(0, self.nreal)
+                if j < self.nsample:
+                    slot = j
+        with np.errstate(invalid="ignore"):
+            for vname, array in vdict.items():
+                a = np.asarray(array, dtype=np.float64)
+                valid = ~np.isnan(a) & (a != netcdf.FILLVALUE)
+                if vname not in self.count:
+                    self.count[vname] = np.zeros(a.shape, dtype=np.int32)
+                    self.mean[vname] = np.zeros(a.shape, dtype=np.float64)
+                    self.m2[vname] = np.zeros(a.shape, dtype=np.float64)
+                n = self.count[vname]
+                mean = self.mean[vname]
+                n += valid
+                delta = np.where(valid, a - mean, 0.0)
+                mean += delta / np.maximum(n, 1)
+                self.m2[vname] += np.where(valid, delta * (a - mean), 0.0)
+                if slot is not None:
+                    if vname not in self.sample:
+                        self.sample[vname] = np.zeros(
+                            (self.nsample,) + a.shape, dtype=np.float32)
+                    s = self.sample[vname]
+                    s[slot] = a
+                    s[slot][~valid] = np.NaN
+
+    def get_mean(self):
+        mean = {}
+        for vname, n in self.count.items():
+            m = self.mean[vname].astype(np.float32)
+            m[n == 0] = netcdf.FILLVALUE
+            mean[vname] = m
+        return mean
+
+    def get_stdev(self):
+        stdev = {}
+        for vname, n in self.count.items():
+            s = np.sqrt(self.m2[vname] / np.maximum(n, 1)).astype(np.float32)
+            s[n == 0] = netcdf.FILLVALUE
+            stdev[vname] = s
+        return stdev
+
+    def get_quantiles(self):
+        """returns {quantile: {vname: array}} - quantiles are in [0, 1]"""
+        import warnings
+        qdict = {}
+        nfilled = min(self.nreal, self.nsample)
+        for q in self.quantiles:
+            qdict[q] = {}
+            for vname, s in self.sample.items():
+                with warnings.catch_warnings():
+                    # all-NaN cells are expected for inactive cells
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    a = np.nanpercentile(s[:nfilled], 100.0 * q, axis=0)
+                a = a.astype(np.float32)
+                a[np.isnan(a)] = netcdf.FILLVALUE
+                qdict[q][vname] = a
+        return qdict
+
+
+def _ensemble_worker(args):
+    """build the variable dict of one realization - module-level so it can
+    be used by a multiprocessing pool
+    """
+    i, m, outputs, kwargs = args
+    vdict = {}
+    if outputs:
+        output_helper(vdict, m, m.load_results(as_dict=True), **kwargs)
+    else:
+        m.export(vdict, **kwargs)
+    return i, vdict
+
+
+def _ensemble_export(f, models, outputs, add_reals, num_workers, quantiles,
+                     nsample, seed, kwargs):
+    """stream realizations 1..n through the statistics accumulator,
+    appending each realization to f as it completes
+    """
+    stats = _EnsembleStats(quantiles=quantiles, nsample=nsample, seed=seed)
+    # realization 0 is used for the base variables of f
+    i, vdict = _ensemble_worker((0, models[0], outputs, kwargs))
+    stats.update(vdict)
+    del vdict
+
+    worker_kwargs = dict(kwargs)
+    # loggers hold open file handles and can not be sent to other processes
+    worker_kwargs.pop("logger", None)
+    args = [(i, m, outputs, worker_kwargs)
+            for i, m in enumerate(models) if i > 0]
+    pool = None
+    if num_workers > 1 and len(args) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(num_workers, len(args)))
+        results = pool.imap_unordered(_ensemble_worker, args)
+    else:
+        results = (_ensemble_worker(arg) for arg in args)
+    try:
+        for i, vdict in results:
+            stats.update(vdict)
+            if add_reals:
+                suffix = models[i].name.split('.')[0].split('_')[-1]
+                f.append(vdict, suffix=suffix)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if stats.nreal >= 2:
+        f.append(stats.get_mean(), suffix="**mean**")
+        f.append(stats.get_stdev(), suffix="**stdev**")
+        for q, qdict in stats.get_quantiles().items():
+            f.append(qdict, suffix="**q{0:g}**".format(100.0 * q))
+    f.add_global_attributes({"namefile": ''})
+    return f
+
+
+def ensemble_helper(inputs_filename,outputs_filename,models,add_reals=True,
+                    num_workers=1,quantiles=None,nsample=50,seed=None,
+                    **kwargs):
     """ helper to export an ensemble of model instances.  Assumes
     all models have same dis and sr, only difference is properties and
     boundary conditions.  Assumes model.nam.split('_')[-1] is the
     realization suffix to use in the netcdf variable names
+
+    Parameters
+    ----------
+        inputs_filename : .nc filename for model inputs (or None)
+        outputs_filename : .nc filename for model outputs (or None)
+        models : list of BaseModel derived instances
+        add_reals : flag to write each realization as a separate variable.
+            The mean and standard deviation (and quantiles) are added to
+            f_in and f_out whether or not add_reals is True.
+        num_workers : number of processes used to build the realization
+            arrays.  If 1, realizations are processed in this process.
+        quantiles : optional list of quantiles (0 to 1) to export.  These
+            are approximations estimated from a random (reservoir) sample
+            of at most nsample realizations; they are exact only if there
+            are no more than nsample realizations.
+        nsample : maximum number of realizations kept to estimate quantiles
+        seed : random seed for the quantile sample
+
+    Returns
+    -------
+        f_in,f_out : NetCdf instances (or None)
+
+    Note:
+    ----
+        realizations are streamed - the mean and standard deviation are
+        accumulated one realization at a time, so memory use does not grow
+        with the number of realizations (except for the quantile sample)
+
     """
     f_in,f_out = None,None
     for m in models[1:]:
         assert m.get_nrow_ncol_nlay_nper() == models[0].get_nrow_ncol_nlay_nper()
     if inputs_filename is not None:
         f_in = models[0].export(inputs_filename,**kwargs)
-        vdict = {}
-        vdicts = [models[0].export(vdict,**kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            vdict = {}
-            m.export(vdict,**kwargs)
-            vdicts.append(vdict)
-            if add_reals:
-                f_in.append(vdict,suffix=suffix)
-            i += 1
-        mean, stdev = {},{}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][vdict[vname]==netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname]==netcdf.FILLVALUE] = netcdf.FILLVALUE
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-
-        if i >= 2:
-            if not add_reals:
-                f_in.write()
-                f_in = NetCdf.empty_like(mean,output_filename=inputs_filename)
-                f_in.append(mean,suffix="**mean**")
-                f_in.append(stdev,suffix="**stdev**")
-            else:
-                f_in.append(mean,suffix="**mean**")
-                f_in.append(stdev,suffix="**stdev**")
-        f_in.add_global_attributes({"namefile":''})
+        f_in = _ensemble_export(f_in,models,False,add_reals,num_workers,
+                                quantiles,nsample,seed,kwargs)
 
     if outputs_filename is not None:
         f_out = output_helper(outputs_filename,models[0],models[0].\
                           load_results(as_dict=True),**kwargs)
-        vdict = {}
-        vdicts = [output_helper(vdict,models[0],models[0].\
-                                load_results(as_dict=True),**kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            oudic = m.load_results(as_dict=True)
-            vdict = {}
-            output_helper(vdict,m,oudic,**kwargs)
-            vdicts.append(vdict)
-            if add_reals:
-                f_out.append(vdict,suffix=suffix)
-            i += 1
-
-        mean, stdev = {},{}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            mean[vname][vdict[vname]==netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname]==netcdf.FILLVALUE] = netcdf.FILLVALUE
-        if i >= 2:
-            if not add_reals:
-                f_out.write()
-                f_out = NetCdf.empty_like(mean,output_filename=outputs_filename)
-                f_out.append(mean,suffix="**mean**")
-                f_out.append(stdev,suffix="**stdev**")
-
-            else:
-                f_out.append(mean,suffix="**mean**")
-                f_out.append(stdev,suffix="**stdev**")
-        f_out.add_global_attributes({"namefile":''})
+        f_out = _ensemble_export(f_out,models,True,add_reals,num_workers,
+                                 quantiles,nsample,seed,kwargs)
     return f_in,f_out
 
 
-def _add_output_nc_variable(f,times,shape3d,out_obj,var_name,logger=None,text='',
-                            mask_vals=[],mask_array3d=None):
-    if logger:
-        logger.log("creating array for {0}".format(
-                var_name))
-
-    array = np.zeros((len(times),shape3d[0],shape3d[1],shape3d[2]),
-                     dtype=np.float32)
-    array[:] = np.NaN
+def _output_array_itr(times,shape3d,out_obj,var_name,logger=None,text='',
+                      mask_vals=[],mask_array3d=None):
+    """generator that reads one 3D output array at a time and yields
+    (time index, array) with masked values set to NaN.  The yielded
+    array is reused between times, so it must be consumed (copied or
+    written) before the next one is requested
+    """
+    array = np.zeros(shape3d,dtype=np.float32)
     for i,t in enumerate(times):
-        if t in out_obj.recordarray["totim"]:
-            try:
-                if text:
-                    a = out_obj.get_data(totim=t,full3D=True,text=text)
-                    if isinstance(a,list):
-                        a = a[0]
-                else:
-                    a = out_obj.get_data(totim=t)
-            except Exception as e:
-                estr = "error getting data for {0} at time {1}:{2}".format(
-                        var_name+text.decode().strip().lower(),t,str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
-            if mask_array3d is not None and a.shape == mask_array3d.shape:
-                a[mask_array3d] = np.NaN
-            try:
-                array[i,:,:,:] = a.astype(np.float32)
-            except Exception as e:
-                estr = "error assigning {0} data to array for time {1}:{2}".format(
+        if t not in out_obj.recordarray["totim"]:
+            continue
+        try:
+            if text:
+                a = out_obj.get_data(totim=t,full3D=True,text=text)
+                if isinstance(a,list):
+                    a = a[0]
+            else:
+                a = out_obj.get_data(totim=t)
+        except Exception as e:
+            estr = "error getting data for {0} at time {1}:{2}".format(
                     var_name+text.decode().strip().lower(),t,str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
+            if logger:
+                logger.warn(estr)
+            else:
+                print(estr)
+            continue
+        try:
+            array[:] = a
+        except Exception as e:
+            estr = "error assigning {0} data to array for time {1}:{2}".format(
+                var_name+text.decode().strip().lower(),t,str(e))
+            if logger:
+                logger.warn(estr)
+            else:
+                print(estr)
+            continue
+        if mask_array3d is not None and array.shape == mask_array3d.shape:
+            array[mask_array3d] = np.NaN
+        for mask_val in mask_vals:
+            array[np.where(array==mask_val)] = np.NaN
+        yield i,array
 
+
+def _add_output_nc_variable(f,times,shape3d,out_obj,var_name,logger=None,text='',
+                            mask_vals=[],mask_array3d=None):
+    log_str = "creating array for {0}".format(var_name)
     if logger:
-        logger.log("creating array for {0}".format(
-                var_name))
+        logger.log(log_str)
 
-    for mask_val in mask_vals:
-        array[np.where(array==mask_val)] = np.NaN
-    mx,mn = np.nanmax(array),np.nanmin(array)
-    array[np.isnan(array)] = netcdf.FILLVALUE
+    itr = _output_array_itr(times,shape3d,out_obj,var_name,logger=logger,
+                            text=text,mask_vals=mask_vals,
+                            mask_array3d=mask_array3d)
 
     if isinstance(f,dict):
+        array = np.zeros((len(times),shape3d[0],shape3d[1],shape3d[2]),
+                         dtype=np.float32)
+        array[:] = np.NaN
+        for i,a in itr:
+            array[i,:,:,:] = a
+        array[np.isnan(array)] = netcdf.FILLVALUE
+        if logger:
+            logger.log(log_str)
         if text:
             var_name = text.decode().strip().lower()
         f[var_name] = array
@@ -211,8 +329,8 @@ def _add_output_nc_variable(f,times,shape3d,out_obj,var_name,logger=None,text=''
         var_name = text.decode().strip().lower()
     attribs = {"long_name": var_name}
     attribs["coordinates"] = "time layer latitude longitude"
-    attribs["min"] = mn
-    attribs["max"] = mx
+    attribs["min"] = np.NaN
+    attribs["max"] = np.NaN
     if units is not None:
         attribs["units"] = units
     try:
@@ -227,15 +345,34 @@ def _add_output_nc_variable(f,times,shape3d,out_obj,var_name,logger=None,text=''
         else:
             raise Exception(estr)
 
-    try:
-        var[:] = array
-    except Exception as e:
-        estr = "error setting array to variable {0}:\n{1}".format(
-                var_name, str(e))
-        if logger:
-            logger.lraise(estr)
-        else:
-            raise Exception(estr)
+    # write one time at a time - times that could not be read are
+    # left as the variable fill value
+    mx,mn = None,None
+    for i,a in itr:
+        isvalid = ~np.isnan(a)
+        if isvalid.any():
+            amx,amn = a[isvalid].max(),a[isvalid].min()
+            mx = amx if mx is None else max(mx,amx)
+            mn = amn if mn is None else min(mn,amn)
+        a[~isvalid] = netcdf.FILLVALUE
+        try:
+            var[i] = a
+        except Exception as e:
+            estr = "error setting array to variable {0}:\n{1}".format(
+                    var_name, str(e))
+            if logger:
+                logger.lraise(estr)
+            else:
+                raise Exception(estr)
+
+    if mx is not None:
+        attribs["min"] = mn
+        attribs["max"] = mx
+        var.setncattr("min",mn)
+        var.setncattr("max",mx)
+
+    if logger:
+        logger.log(log_str)
 
 
 def output_helper(f,ml,oudic,**kwargs):
@@ -246,12 +383,18 @@ def output_helper(f,ml,oudic,**kwargs):
         f : filename for output - must have .shp or .nc extension
         ml : BaseModel derived type
         oudic : dict {output_filename,flopy datafile/cellbudgetfile instance}
+        chunk_strategy : NetCdf chunk strategy ("balanced", "timeseries"
+            or "map") used if f is a .nc filename
+        complevel : NetCdf compression level used if f is a .nc filename
+        shuffle : NetCdf shuffle filter flag used if f is a .nc filename
     Returns
     -------
         None
     Note:
     ----
         casts down double precision to single precision for netCDF files
+        output arrays are read and written to netCDF files one time at a
+        time, so memory use does not grow with the number of output times
 
     """
     assert isinstance(ml,BaseModel)
@@ -260,6 +403,9 @@ def output_helper(f,ml,oudic,**kwargs):
     stride = kwargs.pop("stride",1)
     suffix = kwargs.pop("suffix",None)
     forgive = kwargs.pop("forgive",False)
+    chunk_strategy = kwargs.pop("chunk_strategy","balanced")
+    complevel = kwargs.pop("complevel",4)
+    shuffle = kwargs.pop("shuffle",True)
     if len(kwargs) > 0 and logger is not None:
         str_args = ','.join(kwargs)
         logger.warn("unused kwargs: "+str_args)
@@ -301,7 +447,8 @@ def output_helper(f,ml,oudic,**kwargs):
     times = [t for t in common_times[::stride]]
     if isinstance(f, str) and f.lower().endswith(".nc"):
         f = NetCdf(f, ml, time_values=times,logger=logger,
-                   forgive=forgive)
+                   forgive=forgive,chunk_strategy=chunk_strategy,
+                   complevel=complevel,shuffle=shuffle)
     elif isinstance(f,NetCdf):
         otimes = list(f.nc.variables["time"][:])
         assert otimes == times
@@ -11,6 +11,9 @@ import os
 import subprocess as sp
 import shutil
 import threading
+import time
+import hashlib
+from collections import namedtuple
 if sys.version_info > (3,0):
     import queue as Queue
 else:
@@ -544,7 +547,7 @@ class BaseModel(object):
             super(BaseModel, self).__setattr__(key, value)
 
     def run_model(self, silent=False, pause=False, report=False,
-                  normal_msg='normal termination'):
+                  normal_msg='normal termination', cache_dir=None):
         """
         This method will run the model using subprocess.Popen.
 
@@ -560,6 +563,16 @@ class BaseModel(object):
         normal_msg : str
             Normal termination message used to determine if the
             run terminated normally. (default is 'normal termination')
+        cache_dir : str
+            Directory of a cache of model results.  If the hash of the
+            model input files (see get_input_hash) is in the cache, the
+            output files of the cached run are copied to the model
+            workspace instead of running the model.  Otherwise the output
+            files of a successful run (see get_output_files) that were
+            written during the run are added to the cache.  Output files
+            outside of the model workspace are not cached.  The input
+            files must be written (write_input) before the model is run.
+            (default is None)
 
         Returns
         -------
@@ -568,10 +581,223 @@ class BaseModel(object):
         buff : list of lines of stdout
 
         """
+        if cache_dir is None:
+            return run_model(self.exe_name, self.namefile,
+                             model_ws=self.model_ws, silent=silent,
+                             pause=pause, report=report,
+                             normal_msg=normal_msg)
+
+        key = self.get_input_hash()
+        entry = os.path.join(cache_dir, key)
+        if os.path.isfile(os.path.join(entry, 'stdout.txt')):
+            # restore the output files of the cached run
+            for root, dirs, files in os.walk(os.path.join(entry, 'files')):
+                rel = os.path.relpath(root, os.path.join(entry, 'files'))
+                dst = os.path.normpath(os.path.join(self.model_ws, rel))
+                if not os.path.exists(dst):
+                    os.makedirs(dst)
+                for fname in files:
+                    shutil.copy2(os.path.join(root, fname),
+                                 os.path.join(dst, fname))
+            f = open(os.path.join(entry, 'stdout.txt'), 'r')
+            buff = [line.rstrip('\n') for line in f]
+            f.close()
+            if not silent:
+                print('restored the results of run {} from {}'.format(
+                    key, cache_dir))
+            if not report:
+                buff = []
+            return True, buff
+
+        # declared output files that are not modified during the run are
+        #  left over from an earlier run; the file time resolution of some
+        #  file systems is 2 seconds
+        t0 = time.time() - 2.
+        success, buff = run_model(self.exe_name, self.namefile,
+                                  model_ws=self.model_ws, silent=silent,
+                                  pause=pause, report=True,
+                                  normal_msg=normal_msg)
+        if success:
+            tmp = entry + '.tmp{}'.format(os.getpid())
+            for fname in sorted(set(os.path.normpath(fname)
+                                    for fname in self.get_output_files())):
+                if os.path.isabs(fname) or fname.split(os.sep)[0] == '..':
+                    continue
+                pth = os.path.join(self.model_ws, fname)
+                if not os.path.isfile(pth) or os.path.getmtime(pth) < t0:
+                    continue
+                dst = os.path.join(tmp, 'files', os.path.dirname(fname))
+                if not os.path.exists(dst):
+                    os.makedirs(dst)
+                shutil.copy2(pth, os.path.join(dst, os.path.basename(fname)))
+            if not os.path.exists(tmp):
+                os.makedirs(tmp)
+            f = open(os.path.join(tmp, 'stdout.txt'), 'w')
+            for line in buff:
+                f.write('{}\n'.format(line))
+            f.close()
+            # another process may have added the same run to the cache
+            if os.path.exists(entry):
+                shutil.rmtree(tmp)
+            else:
+                os.rename(tmp, entry)
+        if not report:
+            buff = []
+        return success, buff
+
+    def get_input_files(self):
+        """
+        Get the names of the model input files: the name file, the package
+        files, the external files that are not output files, the files in
+        the name file that are not output files (for example the flow-
+        transport link file of MT3DMS and the head and budget files read by
+        MODPATH), and the files read with OPEN/CLOSE in the package files.
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
 
-        return run_model(self.exe_name, self.namefile, model_ws=self.model_ws,
-                         silent=silent, pause=pause, report=report,
-                         normal_msg=normal_msg)
+        """
+        fnames = [self.namefile]
+        for p in self.packagelist:
+            fnames.append(p.file_name[0])
+        for fname, output in zip(self.external_fnames, self.external_output):
+            if not output:
+                fnames.append(fname)
+        fnames += self._get_name_file_inputs(self.namefile)
+        for p in self.packagelist:
+            pth = os.path.join(self.model_ws, p.file_name[0])
+            if not os.path.isfile(pth):
+                continue
+            f = open(pth, 'rb')
+            for line in f:
+                t = line.split()
+                if len(t) > 1 and t[0].upper() == b'OPEN/CLOSE':
+                    fnames.append(t[1].decode().strip('\'"'))
+            f.close()
+        return fnames
+
+    def _get_name_file_inputs(self, namefile):
+        """
+        Get the names of the files in the entries (ftype unit fname) of a
+        name file that are not output files (see get_output_files).
+
+        """
+        fnames = []
+        pth = os.path.join(self.model_ws, namefile)
+        if not os.path.isfile(pth):
+            return fnames
+        outputs = set(os.path.normpath(fname)
+                      for fname in self.get_output_files())
+        f = open(pth, 'r')
+        for line in f:
+            t = line.split()
+            if len(t) < 3 or not t[0][0].isalpha():
+                continue
+            try:
+                int(t[1])
+            except ValueError:
+                continue
+            fname = t[2].strip('\'"')
+            if os.path.normpath(fname) not in outputs:
+                fnames.append(fname)
+        f.close()
+        return fnames
+
+    def get_output_files(self):
+        """
+        Get the names of the model output files that are declared in the
+        name file: the list file, the entries of the packages after the
+        first one (for example the head, drawdown and budget files of the
+        OC package), and the external files that are output files.
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
+
+        """
+        fnames = []
+        for name in ('glo', 'lst'):
+            p = getattr(self, name, None)
+            if p is not None:
+                fnames.append(p.file_name[0])
+        for p in self.packagelist:
+            for fname, unit in zip(p.file_name[1:], p.unit_number[1:]):
+                if unit != 0:
+                    fnames.append(fname)
+        for fname, output in zip(self.external_fnames, self.external_output):
+            if output:
+                fnames.append(fname)
+        return fnames
+
+    def get_input_hash(self):
+        """
+        Get a hash of the executable (full path, size and modification
+        time) and of the names and contents of the model input files (see
+        get_input_files).
+
+        Returns
+        -------
+        key : str
+            sha1 hex digest.
+
+        """
+        h = hashlib.sha1()
+        exe = which(self.exe_name)
+        if exe is None and not self.exe_name.lower().endswith('.exe'):
+            exe = which(self.exe_name + '.exe')
+        if exe is None:
+            h.update(self.exe_name.encode())
+        else:
+            st = os.stat(exe)
+            h.update('{} {} {}'.format(os.path.abspath(exe), st.st_size,
+                                       st.st_mtime).encode())
+        for fname in sorted(set(os.path.normpath(fname)
+                                for fname in self.get_input_files())):
+            h.update(fname.encode())
+            pth = os.path.join(self.model_ws, fname)
+            if not os.path.isfile(pth):
+                continue
+            f = open(pth, 'rb')
+            while True:
+                b = f.read(1 << 20)
+                if not b:
+                    break
+                h.update(b)
+            f.close()
+        return h.hexdigest()
+
+    def run_model_async(self, normal_msg='normal termination',
+                        all_lines=False, log_file=None):
+        """
+        Run the model with asyncio and report progress events.  Requires
+        python 3.6 or later.
+
+        Parameters
+        ----------
+        normal_msg : str
+            Normal termination message used to determine if the
+            run terminated normally. (default is 'normal termination')
+        all_lines : boolean
+            Yield an event for every line of stdout. (default is False)
+        log_file : str
+            Name of a file that stdout is written to. (default is None)
+
+        Returns
+        -------
+        events : async generator of flopy.runasync.RunEvent
+
+        See Also
+        --------
+        flopy.runasync.run_model_async
+
+        """
+        from .runasync import run_model_async
+        return run_model_async(self.exe_name, self.namefile,
+                               model_ws=self.model_ws, normal_msg=normal_msg,
+                               all_lines=all_lines, log_file=log_file)
 
     def load_results(self):
 
@@ -669,7 +895,7 @@ class BaseModel(object):
         if key not in self.pop_key_list:
             self.pop_key_list.append(key)
 
-    def check(self, f=None, verbose=True, level=1):
+    def check(self, f=None, verbose=True, level=1, nworkers=None):
         """
         Check model data for common errors.
 
@@ -686,6 +912,10 @@ class BaseModel(object):
         level : int
             Check method analysis level. If level=0, summary checks are
             performed. If level=1, full checks are performed.
+        nworkers : int
+            Number of threads used to run the package checks, which are
+            independent of each other. If nworkers is 1 the packages are
+            checked one at a time. (default is the number of processors)
 
         Returns
         -------
@@ -699,10 +929,31 @@ class BaseModel(object):
         >>> m.check()
         """
 
-        results = {}
-        for p in self.packagelist:
-            results[p.name[0]] = p.check(f=None, verbose=False,
-                                         level=level - 1)
+        if nworkers is None:
+            import multiprocessing
+            nworkers = multiprocessing.cpu_count()
+        nworkers = max(1, min(nworkers, len(self.packagelist)))
+
+        def check_package(p):
+            return p.check(f=None, verbose=False, level=level - 1)
+
+        # the package checks share the model arrays that they use (ibound,
+        #  bottoms, thickness and active cells), so the arrays are only
+        #  built once
+        self._check_context = utils.CheckContext(self)
+        try:
+            if nworkers > 1:
+                from multiprocessing.pool import ThreadPool
+                pool = ThreadPool(nworkers)
+                try:
+                    results = pool.map(check_package, self.packagelist)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                results = [check_package(p) for p in self.packagelist]
+        finally:
+            self._check_context = None
 
         # check instance for model-level check
         chk = utils.check(self, f=f, verbose=verbose, level=level)
@@ -741,12 +992,11 @@ class BaseModel(object):
         else:
             chk.passed.append('Unit number conflicts')
 
-        # add package check results to model level check summary
-        for k, r in results.items():
+        # add package check results to model level check summary; the
+        #  package summaries are concatenated once when the summary is used
+        for r in results:
             if r is not None and r.summary_array is not None:  # currently SFR doesn't have one
-                chk.summary_array = np.append(chk.summary_array,
-                                              r.summary_array).view(
-                    np.recarray)
+                chk._append_summary(r.summary_array)
                 chk.passed += ['{} package: {}'.format(r.package.name[0], psd)
                                for psd in r.passed]
         chk.summarize()
@@ -898,7 +1148,7 @@ class BaseModel(object):
 def run_model(exe_name, namefile, model_ws='./',
               silent=False, pause=False, report=False,
               normal_msg='normal termination',
-              async=False):
+              use_async=False, **kwargs):
     """
     This function will run the model using subprocess.Popen.  It
     communicates with the model's stdout asynchronously and reports
@@ -924,10 +1174,16 @@ def run_model(exe_name, namefile, model_ws='./',
     normal_msg : str
         Normal termination message used to determine if the
         run terminated normally. (default is 'normal termination')
-    async : boolean
+    use_async : boolean
         asynchonously read model stdout and report with timestamps.  good for
         models that take long time to run.  not good for models that run
         really fast
+    **kwargs : dict
+        async : boolean
+            Deprecated alias of use_async.  async is a reserved word in
+            Python 3.7 and later, so it can only be passed with
+            **{'async': True}.
+
     Returns
     -------
     (success, buff)
@@ -935,6 +1191,16 @@ def run_model(exe_name, namefile, model_ws='./',
     buff : list of lines of stdout
 
     """
+    if 'async' in kwargs:
+        import warnings
+        warnings.warn('the async argument of run_model() is deprecated. ' +
+                      'use use_async', DeprecationWarning)
+        use_async = kwargs.pop('async')
+    if kwargs:
+        s = 'run_model() got unexpected keyword arguments: {}'.format(
+            ', '.join(sorted(kwargs)))
+        raise TypeError(s)
+
     success = False
     buff = []
 
@@ -959,17 +1225,17 @@ def run_model(exe_name, namefile, model_ws='./',
         s = 'The namefile for this model does not exists: {}'.format(namefile)
         raise Exception(s)
 
-    # simple little function for the thread to target
+    # simple little function for the thread to target; None marks the end
+    #  of stdout
     def q_output(output,q):
             for line in iter(output.readline,b''):
                 q.put(line)
-            #time.sleep(1)
-            #output.close()
+            q.put(None)
 
     proc = sp.Popen([exe_name, namefile],
                     stdout=sp.PIPE, cwd=model_ws)
 
-    if not async:
+    if not use_async:
         while True:
             line = proc.stdout.readline()
             c = line.decode('utf-8')
@@ -996,32 +1262,26 @@ def run_model(exe_name, namefile, model_ws='./',
     last = datetime.now()
     lastsec = 0.
     while True:
-        try:
-            line = q.get_nowait()
-        except Queue.Empty:
-            pass
-        else:
-            if line == '':
-                break
-            line = line.decode().lower().strip()
-            if line != '':
-                now = datetime.now()
-                dt = now - last
-                tsecs = dt.total_seconds() - lastsec
-                line = "(elapsed:{0})-->{1}".format(tsecs,line)
-                lastsec = tsecs + lastsec
-                buff.append(line)
-                if not silent:
-                    print(line)
-                for fword in failed_words:
-                    if fword in line:
-                        success = False
-                        break
-        if proc.poll() is not None:
+        # block until the next line is available instead of polling
+        line = q.get()
+        if line is None:
             break
+        line = line.decode().lower().strip()
+        if line != '':
+            now = datetime.now()
+            dt = now - last
+            tsecs = dt.total_seconds() - lastsec
+            line = "(elapsed:{0})-->{1}".format(tsecs,line)
+            lastsec = tsecs + lastsec
+            buff.append(line)
+            if not silent:
+                print(line)
+            for fword in failed_words:
+                if fword in line:
+                    success = False
+                    break
     proc.wait()
     thread.join(timeout=1)
-    buff.extend(proc.stdout.readlines())
     proc.stdout.close()
 
     for line in buff:
@@ -1033,3 +1293,181 @@ def run_model(exe_name, namefile, model_ws='./',
     if pause:
         input('Press Enter to continue...')
     return success, buff
+
+
+RunResult = namedtuple('RunResult', ['name', 'success', 'returncode',
+                                     'wall_time', 'message', 'log_file'])
+
+
+def _run_job(name, exe_name, namefile, model_ws, log_file, timeout,
+             normal_msg):
+    """
+    Run one model with stdout written to log_file and return a RunResult.
+
+    """
+    t0 = time.time()
+    exe = which(exe_name)
+    if exe is None:
+        import platform
+        if platform.system() in 'Windows':
+            if not exe_name.lower().endswith('.exe'):
+                exe = which(exe_name + '.exe')
+    if exe is None:
+        s = 'The program {} does not exist or is not executable.'.format(
+            exe_name)
+        return RunResult(name, False, None, 0., s, None)
+    if not os.path.isfile(os.path.join(model_ws, namefile)):
+        s = 'The namefile for this model does not exists: {}'.format(namefile)
+        return RunResult(name, False, None, 0., s, None)
+
+    f = open(log_file, 'wb')
+    try:
+        proc = sp.Popen([exe, namefile], stdout=f, stderr=sp.STDOUT,
+                        cwd=model_ws)
+    except OSError as e:
+        f.close()
+        return RunResult(name, False, None, time.time() - t0, str(e),
+                         log_file)
+    # stdout goes straight to the log file, so waiting for the process
+    #  does not use any cpu; a timer kills the process at the timeout
+    timed_out = []
+    timer = None
+    if timeout is not None:
+        def kill():
+            timed_out.append(True)
+            proc.kill()
+        timer = threading.Timer(timeout, kill)
+        timer.daemon = True
+        timer.start()
+    returncode = proc.wait()
+    if timer is not None:
+        timer.cancel()
+    f.close()
+    wall_time = time.time() - t0
+
+    # find the termination message in the log file
+    success = False
+    message = ''
+    f = open(log_file, 'rb')
+    for line in f:
+        line = line.decode('utf-8', 'replace').strip()
+        if line == '':
+            continue
+        message = line
+        if normal_msg in line.lower():
+            success = True
+    f.close()
+    if timed_out:
+        success = False
+        message = 'timed out after {} seconds'.format(timeout)
+    return RunResult(name, success, returncode, wall_time, message, log_file)
+
+
+def run_models(jobs, nworkers=None, cpu_budget=None, timeout=None,
+               log_dir=None, normal_msg='normal termination', silent=True):
+    """
+    Run a list of models with a bounded number of concurrent runs.
+
+    Parameters
+    ----------
+    jobs : list
+        Models to run.  Each job is a tuple of (exe_name, namefile,
+        model_ws), or a dict with exe_name, namefile, and model_ws keys and
+        optional name, ncpu, and timeout keys.  ncpu is the number of
+        processors used by the job (default is 1).
+    nworkers : int
+        Maximum number of models that are run at the same time.  (default
+        is the number of processors)
+    cpu_budget : int
+        Maximum sum of ncpu of the models that are run at the same time.
+        (default is nworkers)
+    timeout : float
+        Time in seconds after which a run is killed.  (default is None)
+    log_dir : str
+        Directory for the stdout log files.  If None, the stdout of each
+        job is written to <name>.stdout in the model workspace.  (default
+        is None)
+    normal_msg : str
+        Normal termination message used to determine if a run
+        terminated normally. (default is 'normal termination')
+    silent : boolean
+        Do not report completed runs to the screen. (default is True)
+
+    Returns
+    -------
+    results : list of RunResult
+        A RunResult (name, success, returncode, wall_time, message,
+        log_file) for each job, in the order of jobs.  message is the
+        last line of stdout, or the reason that the run failed.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> jobs = [('mf2005', 'model.nam', ws) for ws in ['s1', 's2', 's3']]
+    >>> results = flopy.mbase.run_models(jobs, nworkers=2, timeout=3600)
+    >>> failed = [r.name for r in results if not r.success]
+
+    """
+    if nworkers is None:
+        import multiprocessing
+        nworkers = multiprocessing.cpu_count()
+    if cpu_budget is None:
+        cpu_budget = nworkers
+    if log_dir is not None and not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    results = [None] * len(jobs)
+    state = {'running': 0, 'ncpu': 0}
+    cond = threading.Condition()
+
+    def worker(ijob, args, ncpu):
+        try:
+            results[ijob] = _run_job(*args)
+        except Exception as e:
+            results[ijob] = RunResult(args[0], False, None, 0., str(e),
+                                      args[4])
+        if not silent:
+            r = results[ijob]
+            print('{} {} in {:.1f} seconds: {}'.format(
+                r.name, 'completed' if r.success else 'failed',
+                r.wall_time, r.message))
+        with cond:
+            state['running'] -= 1
+            state['ncpu'] -= ncpu
+            cond.notify_all()
+
+    threads = []
+    for ijob, job in enumerate(jobs):
+        if isinstance(job, dict):
+            exe_name, namefile = job['exe_name'], job['namefile']
+            model_ws = job.get('model_ws', './')
+        else:
+            exe_name, namefile, model_ws = job
+            job = {}
+        name = job.get('name', None)
+        if name is None:
+            name = os.path.splitext(namefile)[0]
+            if log_dir is not None:
+                name = '{:04d}_{}'.format(ijob, name)
+        if log_dir is not None:
+            log_file = os.path.join(log_dir, '{}.stdout'.format(name))
+        else:
+            log_file = os.path.join(model_ws, '{}.stdout'.format(name))
+        args = (name, exe_name, namefile, model_ws, log_file,
+                job.get('timeout', timeout), normal_msg)
+        # a job that needs more than the budget runs by itself
+        ncpu = min(job.get('ncpu', 1), cpu_budget)
+        with cond:
+            while state['running'] >= nworkers or \
+                    state['ncpu'] + ncpu > cpu_budget:
+                cond.wait()
+            state['running'] += 1
+            state['ncpu'] += ncpu
+        thread = threading.Thread(target=worker, args=(ijob, args, ncpu))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
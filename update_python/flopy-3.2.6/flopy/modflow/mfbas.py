@@ -140,12 +140,13 @@ class ModflowBas(Package):
         """
         chk = check(self, f=f, verbose=verbose, level=level)
 
-        neighbors = get_neighbors(self.ibound.array)
+        ibound = chk.context.ibound
+        neighbors = get_neighbors(ibound)
         neighbors[np.isnan(neighbors)] = 0 # set neighbors at edges to 0 (inactive)
-        chk.values(self.ibound.array,
-                  (self.ibound.array > 0) & np.all(neighbors < 1, axis=0),
+        chk.values(ibound,
+                  (ibound > 0) & np.all(neighbors < 1, axis=0),
                    'isolated cells in ibound array', 'Warning')
-        chk.values(self.ibound.array, np.isnan(self.ibound.array),
+        chk.values(ibound, np.isnan(ibound),
                    error_name='Not a number', error_type='Error')
         chk.summarize()
         return chk
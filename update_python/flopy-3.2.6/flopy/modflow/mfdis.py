@@ -172,8 +172,6 @@ class ModflowDis(Package):
                                              rotation=rotation,
                                              proj4_str=proj4_str)
         self.start_datetime = start_datetime
-        # calculate layer thicknesses
-        self.__calculate_thickness()
 
     def checklayerthickness(self):
         """
@@ -182,6 +180,38 @@ class ModflowDis(Package):
         """
         return (self.thickness > 0).all()
 
+    def _get_geometry(self, name, func):
+        """
+        Get a geometry result from the cache of the DIS object, or compute it
+        with func if it is not cached. The cache is cleared when delr, delc,
+        top, botm, laycbd or the grid dimensions are replaced. Changes made
+        in place with the [] operator of a Util2d are not detected; assign
+        the new array to the attribute instead.
+
+        """
+        key = [self.delr, self.delc, self.top, self.laycbd] + \
+              list(self.botm.util_2ds)
+        shape = (self.nlay, self.nrow, self.ncol)
+        cache = self.__dict__.get('_geometry_cache')
+        if cache is None or cache['shape'] != shape or \
+                len(cache['key']) != len(key) or \
+                any(a is not b for a, b in zip(cache['key'], key)):
+            cache = {'key': key, 'shape': shape}
+            self._geometry_cache = cache
+        if name not in cache:
+            cache[name] = func()
+        return cache[name]
+
+    def _get_layer_index(self):
+        """
+        Get the index of each model layer in the botm and thickness arrays,
+        which include quasi-3D confining beds.
+
+        """
+        laycbd = self.laycbd.array[:self.nlay] > 0
+        return np.arange(self.nlay) + \
+               np.append(0, np.cumsum(laycbd[:-1])).astype(int)
+
     def get_cell_volumes(self):
         """
         Get an array of cell volumes.
@@ -191,24 +221,28 @@ class ModflowDis(Package):
         vol : array of floats (nlay, nrow, ncol)
 
         """
-        vol = np.empty((self.nlay, self.nrow, self.ncol))
-        for l in range(self.nlay):
-            vol[l, :, :] *= self.thickness.array[l]
-        for r in range(self.nrow):
-            vol[:, r, :] *= self.delc[r]
-        for c in range(self.ncol):
-            vol[:, :, c] *= self.delr[c]
-        return vol
+        def get():
+            thickness = self.thickness.array[self._get_layer_index()]
+            return thickness.astype(np.float64) * \
+                   self.delc.array[np.newaxis, :, np.newaxis] * \
+                   self.delr.array[np.newaxis, np.newaxis, :]
+        return self._get_geometry('volumes', get).copy()
+
+    def _get_zcentroids(self):
+        def get():
+            lay = self._get_layer_index()
+            botm = self.botm.array
+            tops = np.empty((self.nlay, self.nrow, self.ncol), dtype=botm.dtype)
+            tops[0] = self.top.array
+            tops[1:] = botm[lay[1:] - 1]
+            z = np.empty((self.nlay, self.nrow, self.ncol))
+            z[:, :, :] = (tops + botm[lay]) / 2.
+            return z
+        return self._get_geometry('zcentroids', get)
 
     @property
     def zcentroids(self):
-        z = np.empty((self.nlay, self.nrow, self.ncol))
-        z[0,:,:] = (self.top[:, :] + self.botm[0, :, :]) / 2.
-
-        for l in range(1,self.nlay):
-            z[l, :, :] = (self.botm[l - 1, :, :] + self.botm[l, :, :]) / 2.
-        return z
-
+        return self._get_zcentroids().copy()
 
     def get_node_coordinates(self):
         """
@@ -222,73 +256,74 @@ class ModflowDis(Package):
 
         z : array of floats (nlay, nrow, ncol)
         """
-        # In row direction
-        y = np.empty((self.nrow))
-        for r in range(self.nrow):
-            if (r == 0):
-                y[r] = self.delc[r] / 2.
-            else:
-                y[r] = y[r - 1] + (self.delc[r] + self.delc[r - 1]) / 2.
-        # Invert y to convert to a cartesian coordiante system
-        y = y[::-1]
-        # In column direction
-        x = np.empty((self.ncol))
-        for c in range(self.ncol):
-            if (c == 0):
-                x[c] = self.delr[c] / 2.
-            else:
-                x[c] = x[c - 1] + (self.delr[c] + self.delr[c - 1]) / 2.
+        def get():
+            # In row direction
+            delc = self.delc.array.astype(np.float64)
+            y = np.cumsum(delc) - delc / 2.
+            # Invert y to convert to a cartesian coordiante system
+            y = y[::-1]
+            # In column direction
+            delr = self.delr.array.astype(np.float64)
+            x = np.cumsum(delr) - delr / 2.
+            return y, x
+        y, x = self._get_geometry('xy', get)
         # In layer direction
-        z = np.empty((self.nlay, self.nrow, self.ncol))
-        for l in range(self.nlay):
-            if (l == 0):
-                z[l, :, :] = (self.top[:, :] + self.botm[l, :, :]) / 2.
-            else:
-                z[l, :, :] = (self.botm[l - 1, :, :] + self.botm[l, :, :]) / 2.
-        return y, x, z
+        z = self._get_zcentroids()
+        return y.copy(), x.copy(), z.copy()
 
     def get_lrc(self, nodes):
         """
         Get layer, row, column from a list of MODFLOW node numbers.
 
+        Parameters
+        ----------
+        nodes : int, list of ints or array of ints
+            MODFLOW node numbers (one-based)
+
         Returns
         -------
         v : list of tuples containing the layer (k), row (i), 
-            and column (j) for each node in the input list
+            and column (j) for each node in the input list, or a tuple of
+            k, i and j arrays if nodes is an array
         """
-        if not isinstance(nodes, list):
+        isarray = isinstance(nodes, np.ndarray)
+        if not isinstance(nodes, list) and not isarray:
             nodes = [nodes]
+        nodes = np.asarray(nodes, dtype=int)
         nrc = self.nrow * self.ncol
-        v = []
-        for node in nodes:
-            k = int(node / nrc)
-            if ( k * nrc ) < node:
-                k += 1
-            ij = int(node - ( k - 1 ) * nrc)
-            i = int(ij / self.ncol)
-            if ( i * self.ncol ) < ij:
-                i += 1
-            j = ij - ( i - 1 ) * self.ncol
-            v.append((k, i, j))
-        return v
+        k, ij = np.divmod(nodes - 1, nrc)
+        i, j = np.divmod(ij, self.ncol)
+        k, i, j = k + 1, i + 1, j + 1
+        if isarray:
+            return k, i, j
+        return list(zip(k.tolist(), i.tolist(), j.tolist()))
 
     def get_node(self, lrc_list):
         """
         Get node number from a list of MODFLOW layer, row, column tuples.
 
+        Parameters
+        ----------
+        lrc_list : tuple, list of tuples or array
+            Layer, row and column (one-based) of each cell; an array has a
+            row for each cell
+
         Returns
         -------
         v : list of MODFLOW nodes for each layer (k), row (i), 
-            and column (j) tuple in the input list
+            and column (j) tuple in the input list, or an array of nodes
+            if lrc_list is an array
         """
-        if not isinstance(lrc_list, list):
+        isarray = isinstance(lrc_list, np.ndarray)
+        if not isinstance(lrc_list, list) and not isarray:
             lrc_list = [lrc_list]
+        lrc = np.asarray(lrc_list, dtype=int).reshape(-1, 3)
         nrc = self.nrow * self.ncol
-        v = []
-        for [k, i, j] in lrc_list:
-            node = int(( ( k - 1 ) * nrc ) + ( ( i - 1 ) * self.ncol ) + j)
-            v.append(node)
-        return v
+        nodes = (lrc[:, 0] - 1) * nrc + (lrc[:, 1] - 1) * self.ncol + \
+                lrc[:, 2]
+        if isarray:
+            return nodes
+        return nodes.tolist()
 
     def read_from_cnf(self, cnf_file_name, n_per_line=0):
         """
@@ -402,13 +437,13 @@ class ModflowDis(Package):
             return self.botm.array[k, :, :]
 
     def __calculate_thickness(self):
-        thk = []
-        thk.append(self.top - self.botm[0])
-        for k in range(1, self.nlay + sum(self.laycbd)):
-            thk.append(self.botm[k - 1] - self.botm[k])
-        self.__thickness = Util3d(self.parent, (self.nlay + sum(self.laycbd),
-                                                 self.nrow, self.ncol),
-                                   np.float32, thk, name='thickness')
+        botm = self.botm.array
+        thk = np.empty(botm.shape, dtype=np.float32)
+        thk[0] = self.top.array - botm[0]
+        thk[1:] = botm[:-1] - botm[1:]
+        return Util3d(self.parent, (self.nlay + sum(self.laycbd),
+                                    self.nrow, self.ncol),
+                      np.float32, thk, name='thickness')
 
     @property
     def thickness(self):
@@ -420,7 +455,7 @@ class ModflowDis(Package):
         thickness : util3d array of floats (nlay, nrow, ncol)
 
         """
-        return self.__thickness
+        return self._get_geometry('thickness', self.__calculate_thickness)
 
     def write_file(self, check=True):
         """
@@ -506,18 +541,21 @@ class ModflowDis(Package):
 
         # make ibound of same shape as thicknesses/botm for quasi-3D models
         active = chk.get_active(include_cbd=True)
+        thickness = chk.context.thickness
+        botm = chk.context.botm
+        top = self.top.array
 
-        chk.values(self.thickness.array,
-                   active & (self.thickness.array <= 0),
+        chk.values(thickness,
+                   active & (thickness <= 0),
                    'zero or negative thickness', 'Error')
-        thin_cells = (self.thickness.array < 1) & (self.thickness.array > 0)
-        chk.values(self.thickness.array, active & thin_cells,
+        thin_cells = (thickness < 1) & (thickness > 0)
+        chk.values(thickness, active & thin_cells,
                    'thin cells (less than checker threshold of {:.1f})'
                    .format(chk.thin_cell_threshold), 'Error')
-        chk.values(self.top.array,
-                   active[0, :, :] & np.isnan(self.top.array), 'nan values in top array', 'Error')
-        chk.values(self.botm.array,
-                   active & np.isnan(self.botm.array), 'nan values in bottom array', 'Error')
+        chk.values(top,
+                   active[0, :, :] & np.isnan(top), 'nan values in top array', 'Error')
+        chk.values(botm,
+                   active & np.isnan(botm), 'nan values in bottom array', 'Error')
         chk.summarize()
         return chk
 
@@ -160,26 +160,27 @@ class ModflowRiv(Package):
         chk = check(self, f=f, verbose=verbose, level=level)
         chk.summary_array = basechk.summary_array
 
-        for per in self.stress_period_data.data.keys():
-            if isinstance(self.stress_period_data.data[per], np.recarray):
-                spd = self.stress_period_data.data[per]
-                inds = (spd.k, spd.i, spd.j) if self.parent.structured else (spd.node)
-
-                # check that river stage and bottom are above model cell bottoms
-                # also checks for nan values
-                botms = self.parent.dis.botm.array[inds]
-
-                for elev in ['stage', 'rbot']:
-                    chk.stress_period_data_values(spd, spd[elev] < botms,
-                                                  col=elev,
-                                                  error_name='{} below cell bottom'.format(elev),
-                                                  error_type='Error')
-
-                # check that river stage is above the rbot
-                chk.stress_period_data_values(spd, spd['rbot'] > spd['stage'],
-                                              col='stage',
-                                              error_name='RIV stage below rbots',
-                                              error_type='Error')
+        # check all of the stress periods at once
+        spd, iper = chk.get_stress_period_data(self.stress_period_data)
+        if spd is not None:
+            inds = (spd.k, spd.i, spd.j) if self.parent.structured else (spd.node)
+
+            # check that river stage and bottom are above model cell bottoms
+            # also checks for nan values
+            botms = chk.context.botm[inds]
+
+            violations = []
+            for elev in ['stage', 'rbot']:
+                violations.append(chk._period_violations(
+                    spd, iper, spd[elev] < botms, col=elev,
+                    error_name='{} below cell bottom'.format(elev),
+                    error_type='Error'))
+
+            # check that river stage is above the rbot
+            violations.append(chk._period_violations(
+                spd, iper, spd['rbot'] > spd['stage'], col='stage',
+                error_name='RIV stage below rbots', error_type='Error'))
+            chk._append_period_violations(violations)
         chk.summarize()
         return chk
 
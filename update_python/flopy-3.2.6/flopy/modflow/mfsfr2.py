@@ -159,10 +159,10 @@ class ModflowSfr2(Package):
         Contains the outlet for each SFR segment; format is {per: {segment: outlet}}
         This attribute is created by the get_outlets() method.
     outsegs : dictionary of arrays
-        Each array is of shape nss rows x maximum of nss columns. The first column contains the SFR segments,
-        the second column contains the outsegs of those segments; the third column the outsegs of the outsegs,
-        and so on, until all outlets have been encountered, or nss is reached. The latter case indicates
-        circular routing. This attribute is created by the get_outlets() method.
+        Each array has a column for each SFR segment. The first row contains the SFR segments,
+        the second row contains the outsegs of those segments; the third row the outsegs of the outsegs,
+        and so on, until all outlets have been encountered. Paths into circular routing end at the
+        first segment of the circle that is reached. This attribute is created by the get_outlets() method.
 
     Methods
     -------
@@ -312,6 +312,7 @@ class ModflowSfr2(Package):
         # Attributes not included in SFR package input
         self.outsegs = {}  # dictionary of arrays; see Attributes section of documentation
         self.outlets = {}  # nested dictionary of format {per: {segment: outlet}}
+        self._routing = {}  # routing network of the segments by stress period
         # -input format checks:
         assert isfropt in [0, 1, 2, 3, 4, 5]
 
@@ -614,6 +615,28 @@ class ModflowSfr2(Package):
             # f.close()
         return chk
 
+    def get_routing(self, per=0):
+        """Return the routing network of the segments for a stress period.
+        The network is built from segment_data once, and rebuilt only if
+        the segment numbers or outsegs have changed.
+
+        Parameters
+        ----------
+        per : int
+            Stress period (default 0)
+
+        Returns
+        -------
+        routing : SegmentRouting
+        """
+        segment_data = self.segment_data[per]
+        routing = self._routing.get(per)
+        if routing is None or not routing.is_current(segment_data.nseg,
+                                                     segment_data.outseg):
+            routing = SegmentRouting(segment_data.nseg, segment_data.outseg)
+            self._routing[per] = routing
+        return routing
+
     def get_outlets(self, level=0, verbose=True):
         """Traces all routing connections from each headwater to the outlet.
         """
@@ -621,71 +644,29 @@ class ModflowSfr2(Package):
         for per in range(self.nper):
             if per > 0 > self.dataset_5[per][0]:  # skip stress periods where seg data not defined
                 continue
-            segments = self.segment_data[per].nseg
-            outsegs = self.segment_data[per].outseg
-            all_outsegs = np.vstack([segments, outsegs])
-            max_outseg = all_outsegs[-1].max()
-            knt = 1
-            while max_outseg > 0:
-
-                nextlevel = np.array([outsegs[s - 1] if s > 0 and s < 999999 else 0
-                                      for s in all_outsegs[-1]])
-
-                all_outsegs = np.vstack([all_outsegs, nextlevel])
-                max_outseg = nextlevel.max()
-                if max_outseg == 0:
-                    break
-                knt += 1
-                if knt > self.nss:
-                    # subset outsegs map to only include rows with outseg number > 0 in last column
-                    circular_segs = all_outsegs.T[all_outsegs[-1] > 0]
-
-                    # only retain one instance of each outseg number at iteration=nss
-                    vals = []  # append outseg values to vals after they've appeared once
-                    mask = [(True, vals.append(v))[0]
-                            if v not in vals
-                            else False for v in circular_segs[-1]]
-                    circular_segs = circular_segs[:, np.array(mask)]
-
-                    # cull the circular segments array to remove duplicate instances of routing circles
-                    circles = []
-                    duplicates = []
-                    for i in range(np.shape(circular_segs)[0]):
-                        # find where values in the row equal the last value;
-                        # record the index of the second to last instance of last value
-                        repeat_start_ind = np.where(circular_segs[i] == circular_segs[i, -1])[0][-2:][0]
-                        # use that index to slice out the repeated segment sequence
-                        circular_seq = circular_segs[i, repeat_start_ind:].tolist()
-                        # keep track of unique sequences of repeated segments
-                        if set(circular_seq) not in circles:
-                            circles.append(set(circular_seq))
-                            duplicates.append(False)
-                        else:
-                            duplicates.append(True)
-                    circular_segs = circular_segs[~np.array(duplicates), :]
-
-                    txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
-                        .format(len(circular_segs), self.nss)
-                    if level == 1:
-                        txt += '\n'.join([' '.join(map(str, row)) for row in circular_segs]) + '\n'
-                    else:
-                        f = 'circular_routing.csv'
-                        np.savetxt(f, circular_segs, fmt='%d', delimiter=',', header=txt)
-                        txt += 'See {} for details.'.format(f)
-                    if verbose:
-                        print(txt)
-                    break
+            routing = self.get_routing(per)
+            if len(routing.cycles) > 0:
+                txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
+                    .format(len(routing.cycles), self.nss)
+                if level == 1:
+                    txt += '\n'.join([' '.join(map(str, c)) for c in routing.cycles]) + '\n'
+                else:
+                    f = 'circular_routing.csv'
+                    with open(f, 'w') as output:
+                        output.write('# {}'.format(txt))
+                        output.write('\n'.join([','.join(map(str, c))
+                                                for c in routing.cycles]) + '\n')
+                    txt += 'See {} for details.'.format(f)
+                if verbose:
+                    print(txt)
 
             # the array of segment sequence is useful for other other operations,
             # such as plotting elevation profiles
-            self.outsegs[per] = all_outsegs
+            self.outsegs[per] = routing.get_outseg_array()
 
             # create a dictionary listing outlets associated with each segment
-            # outlet is the last value in each row of outseg array that is != 0 or 999999
-            self.outlets[per] = {i + 1: r[(r != 0) & (r != 999999)][-1]
-            if len(r[(r != 0) & (r != 999999)]) > 0
-            else i + 1
-                                 for i, r in enumerate(all_outsegs.T)}
+            self.outlets[per] = dict(zip(routing.nseg.tolist(),
+                                         routing.get_outlets().tolist()))
         return txt
 
     def get_outreaches(self):
@@ -695,33 +676,35 @@ class ModflowSfr2(Package):
         self.reach_data.sort(order=['iseg', 'ireach'])
         reach_data = self.reach_data
         segment_data = self.segment_data[0]
-        # this vectorized approach is more than an order of magnitude faster than a list comprehension
         first_reaches = reach_data[reach_data.ireach == 1]
-        last_reaches = np.append((np.diff(reach_data.iseg) == 1), True)
+        last_reaches = np.append((np.diff(reach_data.iseg) != 0), True)
         reach_data.outreach = np.append(reach_data.reachID[1:], 0)
+        # outseg of the segment of each last reach, and the first reach of that outseg
+        rows = _get_index(segment_data.nseg, reach_data.iseg[last_reaches])
+        outseg = np.where(rows >= 0, segment_data.outseg[rows], 0)
+        first = _get_index(first_reaches.iseg, outseg)
         # for now, treat lakes (negative outseg number) the same as outlets
-        reach_data.outreach[last_reaches] = [first_reaches.reachID[s] if s > 0
-                                             else 0
-                                             for s in segment_data.outseg - 1]
+        reach_data.outreach[last_reaches] = np.where((outseg > 0) & (first >= 0),
+                                                     first_reaches.reachID[first], 0)
         self.reach_data['outreach'] = reach_data.outreach
 
     def get_slopes(self):
         """Compute slopes by reach using values in strtop (streambed top) and rchlen (reach length)
         columns of reach_data. The slope for a reach n is computed as strtop(n+1) - strtop(n) / rchlen(n).
         Slopes for outlet reaches are assumed to be equal to slope of previous reach. """
-        slopes = np.append(np.diff(self.reach_data.strtop), 0) / self.reach_data.rchlen
-        last_reaches = np.append((np.diff(self.reach_data.iseg) == 1), True)
+        strtop = self.reach_data.strtop
+        slopes = np.append(np.diff(strtop), 0) / self.reach_data.rchlen
+        last_reaches = np.append((np.diff(self.reach_data.iseg) != 0), True)
         last_reach_data = self.reach_data[last_reaches]
-        last_reaches_outreach_elevs = [self.reach_data.strtop[o - 1] if o != 0 else 0
-                                       for o in last_reach_data.outreach]
-        second_to_last_reaches = np.append(last_reaches[1:], False)
+        outreach = last_reach_data.outreach.astype(int)
+        last_reaches_outreach_elevs = np.where(outreach != 0, strtop[outreach - 1], 0)
+        # slope of the reach before each last reach
+        previous_slopes = slopes[np.maximum(np.nonzero(last_reaches)[0] - 1, 0)]
         # compute slopes for last reaches
-        slopes[last_reaches] = [slopes[second_to_last_reaches][i]
-                                if last_reaches_outreach_elevs[i] == 0
-                                else
-                                (last_reaches_outreach_elevs[i] - last_reach_data.strtop[i])
-                                / last_reach_data.rchlen[i]
-                                for i in range(len(last_reach_data))]
+        slopes[last_reaches] = np.where(last_reaches_outreach_elevs == 0,
+                                        previous_slopes,
+                                        (last_reaches_outreach_elevs - last_reach_data.strtop)
+                                        / last_reach_data.rchlen)
         self.reach_data['slope'] = slopes * -1  # convert from numpy to sfr package convention
 
     def get_upsegs(self):
@@ -735,41 +718,18 @@ class ModflowSfr2(Package):
 
         Notes
         -----
-        This method will not work if there are instances of circular routing.
+        For segments that are part of circular routing, the other segments of the
+        circle are included in the upsegs.
 
         """
         all_upsegs = {}
         for per in range(self.nper):
             if per > 0 > self.dataset_5[per][0]:  # skip stress periods where seg data not defined
                 continue
-            segment_data = self.segment_data[per]
-
-            # make a list of adjacent upsegments keyed to outseg list in Mat2
-            upsegs = {o: segment_data.nseg[segment_data.outseg == o].tolist()
-                      for o in np.unique(segment_data.outseg)}
-
-            outsegs = [k for k in list(upsegs.keys()) if k > 0]  # exclude 0, which is the outlet designator
-
-            # for each outseg key, for each upseg, check for more upsegs, append until headwaters has been reached
-            for outseg in outsegs:
-
-                up = True
-                upsegslist = upsegs[outseg]
-                while up:
-                    added_upsegs = []
-                    for us in upsegslist:
-                        if us in outsegs:
-                            added_upsegs += upsegs[us]
-                    if len(added_upsegs) == 0:
-                        up = False
-                        break
-                    else:
-                        upsegslist = added_upsegs
-                        upsegs[outseg] += added_upsegs
-
-            # the above algorithm is recursive, so lower order streams get duplicated many times
-            # use a set to get unique upsegs
-            all_upsegs[per] = {u: list(set(upsegs[u])) for u in outsegs}
+            routing = self.get_routing(per)
+            outsegs = np.unique(routing.nseg[np.diff(routing.indptr) > 0])
+            all_upsegs[per] = {s: routing.get_upstream(s).tolist()
+                               for s in outsegs.tolist()}
         return all_upsegs
 
     def renumber_segments(self):
@@ -779,38 +739,34 @@ class ModflowSfr2(Package):
         """
 
         # get renumbering info from per=0
-        nseg = self.segment_data[0].nseg
-        outseg = self.segment_data[0].outseg
-
-        def reassign_upsegs(r, nexts, upsegs):
-            nextupsegs = []
-            for u in upsegs:
-                r[u] = nexts if u > 0 else u # handle lakes
-                nexts -= 1
-                nextupsegs += list(nseg[outseg == u])
-            return r, nexts, nextupsegs
-
-        ns = len(nseg)
-
-        nexts = ns
-        r = {0: 0}
-        nextupsegs = nseg[outseg == 0]
-        for i in range(ns):
-            r, nexts, nextupsegs = reassign_upsegs(r, nexts, nextupsegs)
-            if len(nextupsegs) == 0:
-                break
+        routing = self.get_routing(0)
+        if len(routing.cycles) > 0:
+            raise ValueError('Segments cannot be renumbered with circular '
+                             'routing in segments: {}'.format(routing.cycles))
+
+        # number the segments in breadth-first order from the outlets,
+        # so that numbers decrease in the upstream direction
+        ns = len(routing.nseg)
+        numbers = np.zeros(ns, dtype=int)
+        numbers[routing.order] = ns - np.arange(len(routing.order))
+
+        def renumber(segments):
+            inds = routing.get_index(segments)
+            return np.where(inds >= 0, numbers[inds], segments)
 
         # renumber segments in all stress period data
         for per in self.segment_data.keys():
-            self.segment_data[per]['nseg'] = [r[s] for s in nseg]
-            self.segment_data[per]['outseg'] = [r[s] for s in outseg]
+            self.segment_data[per]['nseg'] = renumber(self.segment_data[per].nseg)
+            self.segment_data[per]['outseg'] = renumber(self.segment_data[per].outseg)
             self.segment_data[per].sort(order='nseg')
+            nseg = self.segment_data[per].nseg
+            outseg = self.segment_data[per].outseg
             inds = (outseg > 0) & (nseg > outseg)
             assert not np.any(inds)
             assert len(self.segment_data[per]['nseg']) == self.segment_data[per]['nseg'].max()
 
         # renumber segments in reach_data
-        self.reach_data['iseg'] = [r[s] for s in self.reach_data.iseg]
+        self.reach_data['iseg'] = renumber(self.reach_data.iseg)
 
     def _get_headwaters(self, per=0):
         """List all segments that are not outsegs (that do not have any segments upstream).
@@ -825,9 +781,7 @@ class ModflowSfr2(Package):
         headwaters : np.ndarray (1-D)
             One dimmensional array listing all headwater segments.
         """
-        upsegs = [self.segment_data[per].nseg[self.segment_data[per].outseg == s].tolist()
-                  for s in self.segment_data[0].nseg]
-        return self.segment_data[per].nseg[np.array([i for i, u in enumerate(upsegs) if len(u) == 0])]
+        return self.get_routing(per).headwaters
 
     def _interpolate_to_reaches(self, segvar1, segvar2, per=0):
         """Interpolate values in datasets 6b and 6c to each reach in stream segment
@@ -859,25 +813,51 @@ class ModflowSfr2(Package):
         segment_data = self.segment_data[per]
         segment_data.sort(order='nseg')
         reach_data.sort(order=['iseg', 'ireach'])
-        reach_values = []
-        for seg in segment_data.nseg:
-            reaches = reach_data[reach_data.iseg == seg]
-            dist = np.cumsum(reaches.rchlen) - 0.5 * reaches.rchlen
-            icalc = segment_data.icalc[segment_data.nseg == seg]
-            if 'width' in segvar1 and icalc == 2:  # get width from channel cross section length
+
+        # segment_data row of each reach; reaches in segments that are not
+        # in segment_data are skipped
+        rows = _get_index(segment_data.nseg, reach_data.iseg)
+        reaches = rows >= 0
+        rows = rows[reaches]
+        iseg = reach_data.iseg[reaches]
+        rchlen = reach_data.rchlen[reaches].astype(np.float64)
+        if len(rows) == 0:
+            return np.array([])
+
+        # distance from the start of the segment to the middle of each reach,
+        # from the cumulative reach lengths minus the length of the preceding segments
+        first = np.append(True, iseg[1:] != iseg[:-1])
+        last = np.append(first[1:], True)
+        group = np.cumsum(first) - 1
+        cumlen = np.cumsum(rchlen)
+        dist = cumlen - (cumlen - rchlen)[first][group] - 0.5 * rchlen
+
+        # linear interpolation between the values at the middle of the
+        # first and last reach of each segment
+        x0 = dist[first][group]
+        x1 = dist[last][group]
+        fp0 = segment_data[segvar1][rows].astype(np.float64)
+        fp1 = segment_data[segvar2][rows].astype(np.float64)
+        reach_values = fp0.copy()
+        interior = (dist > x0) & (dist < x1)
+        reach_values[interior] = ((fp1 - fp0)[interior] / (x1 - x0)[interior]) * \
+                                 (dist - x0)[interior] + fp0[interior]
+        end = dist >= x1
+        reach_values[end] = fp1[end]
+
+        if 'width' in segvar1:
+            icalc = segment_data.icalc[rows]
+            # get width from channel cross section length
+            for seg in np.unique(iseg[icalc == 2]):
                 channel_geometry_data = self.channel_geometry_data[per]
-                reach_values += list(np.ones(len(reaches)) * channel_geometry_data[seg][0][-1])
-            elif 'width' in segvar1 and icalc == 3:  # assign arbitrary width since width is based on flow
-                reach_values += list(np.ones(len(reaches)) * 5)
-            elif 'width' in segvar1 and icalc == 4:  # assume width to be mean from streamflow width/flow table
+                reach_values[iseg == seg] = channel_geometry_data[seg][0][-1]
+            # assign arbitrary width since width is based on flow
+            reach_values[icalc == 3] = 5
+            # assume width to be mean from streamflow width/flow table
+            for seg in np.unique(iseg[icalc == 4]):
                 channel_flow_data = self.channel_flow_data[per]
-                reach_values += list(np.ones(len(reaches)) * np.mean(channel_flow_data[seg][2]))
-            else:
-                fp = [segment_data[segment_data['nseg'] == seg][segvar1][0],
-                      segment_data[segment_data['nseg'] == seg][segvar2][0]]
-                xp = [dist[0], dist[-1]]
-                reach_values += np.interp(dist, xp, fp).tolist()
-        return np.array(reach_values)
+                reach_values[iseg == seg] = np.mean(channel_flow_data[seg][2])
+        return reach_values
 
     def _write_1c(self, f_sfr):
 
@@ -1111,6 +1091,214 @@ class ModflowSfr2(Package):
         f_sfr.close()
 
 
+class SegmentRouting(object):
+    """
+    Routing network of the SFR2 segments for a stress period. The network
+    is built once from the segment numbers and outsegs; the upstream
+    connections are stored in compressed sparse row (CSR) format, so that
+    routing queries take time proportional to the size of their result.
+
+    Parameters
+    ----------
+    nseg : 1-D array
+        Segment numbers.
+    outseg : 1-D array
+        Segment that each segment routes to. Values that are not segment
+        numbers (0 for outlets, negative values for lakes, and values such
+        as 999999 for segments outside of the model) end the routing.
+
+    Attributes
+    ----------
+    down : 1-D array
+        Index of the segment that each segment routes to (-1 if the routing
+        ends at the segment).
+    indptr, indices : 1-D arrays
+        Upstream connections in CSR format; the indices of the segments
+        that route to the segment at index i are
+        indices[indptr[i]:indptr[i + 1]].
+    order : 1-D array
+        Indices of the segments in breadth-first order from the outlets
+        (topological order), so that each segment comes after the segment
+        that it routes to. Segments in, or upstream of, circular routing
+        are not included.
+    cycles : list of lists
+        Segment numbers of each instance of circular routing, in routing
+        order.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> m = flopy.modflow.Modflow.load('model.nam')
+    >>> routing = m.sfr.get_routing(per=0)
+    >>> routing.get_upstream(10)
+
+    """
+
+    def __init__(self, nseg, outseg):
+        self.nseg = np.array(nseg, dtype=int)
+        self.outseg = np.array(outseg, dtype=int)
+        n = len(self.nseg)
+        self._sorter = np.argsort(self.nseg, kind='mergesort')
+
+        # downstream connection of each segment
+        self.down = self.get_index(self.outseg)
+
+        # upstream connections in CSR format; a stable sort keeps the
+        #  upstream segments of each segment in the order of the input
+        src = np.nonzero(self.down >= 0)[0]
+        dst = self.down[src]
+        self.indices = src[np.argsort(dst, kind='mergesort')]
+        self.indptr = np.zeros(n + 1, dtype=int)
+        self.indptr[1:] = np.cumsum(np.bincount(dst, minlength=n))
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        down = self.down.tolist()
+
+        # breadth-first search upstream from the segments where the
+        #  routing ends
+        order = np.nonzero(self.down < 0)[0].tolist()
+        i = 0
+        while i < len(order):
+            s = order[i]
+            order += indices[indptr[s]:indptr[s + 1]]
+            i += 1
+        self.order = np.array(order, dtype=int)
+
+        # the segments that were not reached are in, or upstream of,
+        #  circular routing; each segment has at most one downstream
+        #  segment, so following the routing from each of them finds the
+        #  cycles
+        state = np.zeros(n, dtype=int)
+        state[self.order] = 2
+        state = state.tolist()
+        cycles = []
+        for start in range(n):
+            path = []
+            s = start
+            while state[s] == 0:
+                state[s] = 1
+                path.append(s)
+                s = down[s]
+            if state[s] == 1:
+                cycles.append(path[path.index(s):])
+            for s in path:
+                state[s] = 2
+        self.cycles = [self.nseg[c].tolist() for c in cycles]
+        self._cycle = np.zeros(n, dtype=int) - 1
+        for i, c in enumerate(cycles):
+            self._cycle[c] = i
+        self._cycle_index = cycles
+
+        # depth-first preorder of the network with the circular routing
+        #  cut, so that all of the segments upstream of a segment are the
+        #  contiguous block of the preorder that follows it
+        incycle = (self._cycle >= 0).tolist()
+        stack = np.nonzero(self.down < 0)[0].tolist()[::-1]
+        stack += [s for c in cycles for s in c][::-1]
+        preorder = []
+        while len(stack) > 0:
+            s = stack.pop()
+            preorder.append(s)
+            stack += [u for u in indices[indptr[s]:indptr[s + 1]][::-1]
+                      if not incycle[u]]
+        size = [1] * n
+        for s in reversed(preorder):
+            d = down[s]
+            if d >= 0 and not incycle[s]:
+                size[d] += size[s]
+        self._preorder = np.array(preorder, dtype=int)
+        self._position = np.zeros(n, dtype=int)
+        self._position[self._preorder] = np.arange(n)
+        self._size = np.array(size, dtype=int)
+
+    def get_index(self, segments):
+        """Return the index of each segment number in segments (-1 for
+        values that are not segment numbers)."""
+        return _get_index(self.nseg, np.asarray(segments, dtype=int),
+                          sorter=self._sorter)
+
+    def _get_segment_index(self, segment):
+        i = self.get_index(segment)[0]
+        if i < 0:
+            raise ValueError('{} is not a segment number'.format(segment))
+        return i
+
+    @property
+    def headwaters(self):
+        """Segments that do not have any segments upstream."""
+        return self.nseg[np.diff(self.indptr) == 0]
+
+    def get_upsegs(self, segment):
+        """Return the segments that route directly to a segment."""
+        i = self._get_segment_index(segment)
+        return self.nseg[self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def get_upstream(self, segment):
+        """Return all of the segments upstream of a segment. For a segment
+        that is part of circular routing, the other segments of the circle
+        and the segments upstream of them are included."""
+        i = self._get_segment_index(segment)
+        c = self._cycle[i]
+        members = self._cycle_index[c] if c >= 0 else [i]
+        inds = [self._preorder[self._position[m]:
+                               self._position[m] + self._size[m]]
+                for m in members]
+        inds = np.concatenate(inds)
+        return self.nseg[inds[inds != i]]
+
+    def get_downstream(self, segment):
+        """Return the segments downstream of a segment, in routing order.
+        The sequence ends at the segment where the routing ends, or at the
+        segment where circular routing repeats."""
+        i = self._get_segment_index(segment)
+        down = self.down
+        path = []
+        visited = set([i])
+        i = down[i]
+        while i >= 0 and i not in visited:
+            path.append(i)
+            visited.add(i)
+            i = down[i]
+        return self.nseg[np.array(path, dtype=int)]
+
+    def get_outlets(self):
+        """Return the outlet of each segment. The outlet is the segment
+        where the routing ends, or the lake number (negative) if that
+        segment routes to a lake. For segments in or upstream of circular
+        routing, the outlet is the first segment of the circle that is
+        reached."""
+        root = np.zeros(len(self.nseg), dtype=int)
+        down = self.down.tolist()
+        incycle = (self._cycle >= 0).tolist()
+        r = root.tolist()
+        for s in self._preorder.tolist():
+            d = down[s]
+            r[s] = s if d < 0 or incycle[s] else r[d]
+        root = np.array(r, dtype=int)
+        return np.where(self.outseg[root] < 0, self.outseg[root],
+                        self.nseg[root])
+
+    def get_outseg_array(self):
+        """Return an array with a column for each segment. The first row
+        contains the segments, the second row the outsegs of those
+        segments, the third row the outsegs of the outsegs, and so on,
+        until the routing has ended for all segments. Paths into circular
+        routing end at the first segment of the circle that is reached."""
+        nextseg = np.where(self._cycle >= 0, 0, self.outseg)
+        rows = [self.nseg]
+        while len(rows[-1]) > 0 and rows[-1].max() > 0:
+            inds = self.get_index(rows[-1])
+            rows.append(np.where(inds >= 0, nextseg[inds], 0))
+        return np.vstack(rows)
+
+    def is_current(self, nseg, outseg):
+        """Check if the network was built from nseg and outseg."""
+        return np.array_equal(self.nseg, nseg) and \
+               np.array_equal(self.outseg, outseg)
+
+
 class check:
     """
     Check SFR2 package for common errors
@@ -1194,39 +1382,31 @@ class check:
         http://stackoverflow.com/questions/22865877/how-do-i-write-to-multiple-fields-of-a-structured-array
         """
         txt = ''
-        array = array.copy()
-        if isinstance(col1, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp1', data=col1,
-                                               asrecarray=True)
-            col1 = 'tmp1'
-        if isinstance(col2, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp2', data=col2,
-                                               asrecarray=True)
-            col2 = 'tmp2'
-        if isinstance(col1, tuple):
-            array = recfunctions.append_fields(array, names=col1[0], data=col1[1],
-                                               asrecarray=True)
-            col1 = col1[0]
-        if isinstance(col2, tuple):
-            array = recfunctions.append_fields(array, names=col2[0], data=col2[1],
-                                               asrecarray=True)
-            col2 = col2[0]
-
-        failed = array[col1] > array[col2]
+        # columns given as (name, values) tuples are added to the printed array
+        added = []
+        values = []
+        for col in [col1, col2]:
+            if isinstance(col, np.ndarray):
+                values.append(col)
+            elif isinstance(col, tuple):
+                added.append(col)
+                values.append(np.asarray(col[1]))
+            else:
+                values.append(array[col])
+        values1, values2 = values
+
+        failed = values1 > values2
         if np.any(failed):
-            failed_info = array[failed].copy()
-            txt += level0txt.format(len(failed_info)) + '\n'
+            txt += level0txt.format(np.count_nonzero(failed)) + '\n'
             if self.level == 1:
-                diff = failed_info[col2] - failed_info[col1]
-                cols = [c for c in failed_info.dtype.names if failed_info[c].sum() != 0
-                        and c != 'diff'
-                        and 'tmp' not in c]
-                # currently failed_info[cols] results in a warning. Not sure
-                # how to do this properly with a recarray.
-                failed_info = recfunctions.append_fields(failed_info[cols].copy(),
-                                                         names='diff',
-                                                         data=diff,
-                                                         asrecarray=True)
+                failed_info = array[failed]
+                diff = values2[failed] - values1[failed]
+                columns = [(c, failed_info[c]) for c in failed_info.dtype.names]
+                columns += [(c, np.asarray(v)[failed]) for c, v in added]
+                columns = [(c, v) for c, v in columns if v.sum() != 0
+                           and c != 'diff'
+                           and 'tmp' not in c]
+                failed_info = _get_rec_array(columns + [('diff', diff)])
                 failed_info.sort(order='diff', axis=0)
                 if not sort_ascending:
                     failed_info = failed_info[::-1]
@@ -1268,15 +1448,26 @@ class check:
                                   level=self.level,
                                   datatype='segment')
 
-        # check reach numbering
-        for segment in np.arange(1, self.sfr.nss + 1):
-            reaches = self.reach_data.ireach[self.reach_data.iseg == segment]
+        # check reach numbering; group the reaches by segment (keeping the
+        # order of reach_data within each segment) and compare the reach
+        # numbers to their position in the segment
+        reach_data = self.reach_data
+        in_range = (reach_data.iseg >= 1) & (reach_data.iseg <= self.sfr.nss)
+        order = np.argsort(reach_data.iseg[in_range], kind='mergesort')
+        iseg = reach_data.iseg[in_range][order]
+        ireach = reach_data.ireach[in_range][order]
+        first = np.ones(len(iseg), dtype=bool)
+        first[1:] = iseg[1:] != iseg[:-1]
+        starts = np.nonzero(first)[0]
+        position = np.arange(len(iseg)) - starts[np.cumsum(first) - 1] + 1
+        for segment in np.unique(iseg[ireach != position]):
+            start, end = np.searchsorted(iseg, [segment, segment + 1])
+            reaches = ireach[start:end]
             t = _check_numbers(len(reaches),
                                reaches,
                                level=self.level,
                                datatype='reach')
-            if len(t) > 0:
-                txt += 'Segment {} has {}'.format(segment, t)
+            txt += 'Segment {} has {}'.format(segment, t)
         if txt == '':
             passed = True
         self._txt_footer(headertxt, txt, 'continuity in segment and reach numbering', passed, warning=False)
@@ -1286,21 +1477,21 @@ class check:
         passed = False
         if self.verbose:
             print(headertxt.strip())
-        for per, segment_data in self.segment_data.items():
-
-            decreases = segment_data.outseg[segment_data.outseg < segment_data.nseg]
-            decreases = decreases[decreases > 0]
+        decreases = []
+        for per in sorted(self.segment_data.keys()):
+            segment_data = self.segment_data[per]
+            d = segment_data.outseg[segment_data.outseg < segment_data.nseg]
+            decreases.append(d[d > 0])
+        decreases = np.concatenate(decreases)
 
         if len(decreases) >= 1:
             txt += '{} instances of segment numbers decreasing in the downstream direction.\n'.format(len(decreases))
             txt += 'MODFLOW will run but convergence may be appreciably slowed.\n'
             if self.level == 1:
                 txt += 'at segments:'
-                t = ''
-                for s in decreases:
-                    t += ' {}'.format(s)
+                t = ' ' + ' '.join(map(str, decreases))
                 txt += '\n'.join(textwrap.wrap(t, width=10))
-        if len(t) == 0:
+        if len(txt) == 0:
                 passed = True
         self._txt_footer(headertxt, txt, 'segment numbering order', passed)
 
@@ -1328,11 +1519,11 @@ class check:
         # if no dis file was supplied, can't compute node numbers
         # make nodes based on unique row, col pairs
         if np.diff(reach_data.node).max() == 0:
-            uniquerc = {}
-            for i, (r, c) in enumerate(reach_data[['i', 'j']]):
-                if (r, c) not in uniquerc:
-                    uniquerc[(r, c)] = i + 1
-            reach_data['node'] = [uniquerc[(r, c)] for r, c in reach_data[['i', 'j']]]
+            # number each cell by the first reach in the cell
+            rc = reach_data.i * (reach_data.j.max() + 1) + reach_data.j
+            uniquerc, first_reach, inverse = np.unique(rc, return_index=True,
+                                                       return_inverse=True)
+            reach_data['node'] = first_reach[inverse] + 1
 
         K = reach_data.strhc1
         if K.max() == 0:
@@ -1346,18 +1537,22 @@ class check:
         # Calculate SFR conductance for each reach
         Cond = K * w * L / b
 
-        shared_cells = _get_duplicates(reach_data.node)
-
-        nodes_with_multiple_conductance = set()
-        for node in shared_cells:
-
-            # select the collocated reaches for this cell
-            conductances = Cond[reach_data.node == node].copy()
-            conductances.sort()
-
-            # list nodes with multiple non-zero SFR reach conductances
-            if conductances[0] / conductances[-1] > tol:
-                nodes_with_multiple_conductance.update({node})
+        # group the reaches by cell, and get the minimum and maximum
+        # conductance of the reaches in each cell
+        order = np.argsort(reach_data.node, kind='mergesort')
+        nodes = reach_data.node[order]
+        first = np.ones(len(nodes), dtype=bool)
+        first[1:] = nodes[1:] != nodes[:-1]
+        starts = np.nonzero(first)[0]
+        group = np.cumsum(first) - 1
+        nreaches = np.diff(np.append(starts, len(nodes)))
+        min_cond = np.minimum.reduceat(Cond[order], starts)
+        max_cond = np.maximum.reduceat(Cond[order], starts)
+
+        # list nodes with multiple non-zero SFR reach conductances
+        multiple = nreaches > 1
+        multiple[multiple] = min_cond[multiple] / max_cond[multiple] > tol
+        nodes_with_multiple_conductance = nodes[starts][multiple]
 
         if len(nodes_with_multiple_conductance) > 0:
             txt += '{} model cells with multiple non-zero SFR conductances found.\n' \
@@ -1372,13 +1567,8 @@ class check:
                 cols = [c for c in reach_data.dtype.names if c in \
                         ['node', 'k', 'i', 'j', 'iseg', 'ireach', 'rchlen', 'strthick', 'strhc1']]
 
-                reach_data = recfunctions.append_fields(reach_data,
-                                                        names=['width', 'conductance'],
-                                                        data=[w, Cond],
-                                                        usemask=False,
-                                                        asrecarray=True)
-                has_multiple = np.array([True if n in nodes_with_multiple_conductance
-                                         else False for n in reach_data.node])
+                has_multiple = np.zeros(len(reach_data), dtype=bool)
+                has_multiple[order] = multiple[group]
                 reach_data = reach_data[has_multiple].copy()
                 reach_data = reach_data[cols].copy()
                 txt += _print_rec_array(reach_data, delimiter='\t')
@@ -1409,10 +1599,9 @@ class check:
 
                 # first check for segments where elevdn > elevup
                 d_elev = segment_data.elevdn - segment_data.elevup
-                segment_data = recfunctions.append_fields(segment_data, names='d_elev', data=d_elev,
-                                                          asrecarray=True)
-                txt += self._boolean_compare(segment_data[['nseg', 'outseg', 'elevup', 'elevdn',
-                                                           'd_elev']].copy(),
+                txt += self._boolean_compare(_get_rec_array([(c, segment_data[c]) for c in
+                                                             ['nseg', 'outseg', 'elevup', 'elevdn']] +
+                                                            [('d_elev', d_elev)]),
                                              col1='d_elev', col2=np.zeros(len(segment_data)),
                                              level0txt='Stress Period {}: '.format(per + 1) + \
                                                        '{} segments encountered with elevdn > elevup.',
@@ -1422,15 +1611,14 @@ class check:
                 # next check for rises between segments
                 non_outlets = segment_data.outseg > 0
                 non_outlets_seg_data = segment_data[non_outlets]  # lake outsegs are < 0
-                outseg_elevup = np.array([segment_data.elevup[o - 1] for o in segment_data.outseg if o > 0])
-                d_elev2 = outseg_elevup - segment_data.elevdn[non_outlets]
-                non_outlets_seg_data = recfunctions.append_fields(non_outlets_seg_data,
-                                                                  names=['outseg_elevup', 'd_elev2'],
-                                                                  data=[outseg_elevup, d_elev2],
-                                                                  asrecarray=True)
-
-                txt += self._boolean_compare(non_outlets_seg_data[['nseg', 'outseg', 'elevdn',
-                                                                   'outseg_elevup', 'd_elev2']].copy(),
+                outseg_elevup = segment_data.elevup[non_outlets_seg_data.outseg - 1]
+                d_elev2 = outseg_elevup - non_outlets_seg_data.elevdn
+                non_outlets_seg_data = _get_rec_array([(c, non_outlets_seg_data[c]) for c in
+                                                       ['nseg', 'outseg', 'elevdn']] +
+                                                      [('outseg_elevup', outseg_elevup),
+                                                       ('d_elev2', d_elev2)])
+
+                txt += self._boolean_compare(non_outlets_seg_data,
                                              col1='d_elev2', col2=np.zeros(len(non_outlets_seg_data)),
                                              level0txt='Stress Period {}: '.format(per + 1) + \
                                                        '{} segments encountered with segments encountered ' \
@@ -1462,15 +1650,13 @@ class check:
 
             # use outreach values to get downstream elevations
             non_outlets = reach_data[reach_data.outreach != 0]
-            outreach_elevdn = np.array([reach_data.strtop[o - 1] for o in reach_data.outreach])
-            d_strtop = outreach_elevdn[reach_data.outreach != 0] - non_outlets.strtop
-            non_outlets = recfunctions.append_fields(non_outlets,
-                                                     names=['strtopdn', 'd_strtop'],
-                                                     data=[outreach_elevdn, d_strtop],
-                                                     asrecarray=True)
-
-            txt += self._boolean_compare(non_outlets[['k', 'i', 'j', 'iseg', 'ireach',
-                                                      'strtop', 'strtopdn', 'd_strtop', 'reachID']].copy(),
+            outreach_elevdn = reach_data.strtop[non_outlets.outreach - 1]
+            d_strtop = outreach_elevdn - non_outlets.strtop
+            non_outlets = _get_rec_array([(c, non_outlets[c]) for c in ['k', 'i', 'j', 'iseg', 'ireach', 'strtop']] +
+                                         [('strtopdn', outreach_elevdn), ('d_strtop', d_strtop),
+                                          ('reachID', non_outlets.reachID)])
+
+            txt += self._boolean_compare(non_outlets,
                                          col1='d_strtop', col2=np.zeros(len(non_outlets)),
                                          level0txt='{} reaches encountered with strtop < strtop of downstream reach.',
                                          level1txt='Elevation rises:',
@@ -1501,14 +1687,13 @@ class check:
             # check streambed bottoms in relation to respective cell bottoms
             bots = self.sfr.parent.dis.botm.array[k, i, j]
             streambed_bots = reach_data.strtop - reach_data.strthick
-            reach_data = recfunctions.append_fields(reach_data,
-                                                    names=['layerbot', 'strbot'],
-                                                    data=[bots, streambed_bots],
-                                                    asrecarray=True)
-
-            txt += self._boolean_compare(reach_data[['k', 'i', 'j', 'iseg', 'ireach',
-                                                     'strtop', 'strthick', 'strbot', 'layerbot',
-                                                     'reachID']].copy(),
+            columns = [(c, reach_data[c]) for c in ['k', 'i', 'j', 'iseg', 'ireach', 'strtop']]
+
+            txt += self._boolean_compare(_get_rec_array(columns +
+                                                        [('strthick', reach_data.strthick),
+                                                         ('strbot', streambed_bots),
+                                                         ('layerbot', bots),
+                                                         ('reachID', reach_data.reachID)]),
                                          col1='layerbot', col2='strbot',
                                          level0txt='{} reaches encountered with streambed bottom below layer bottom.',
                                          level1txt='Layer bottom violations:',
@@ -1517,10 +1702,10 @@ class check:
                 warning = False # this constitutes an error (MODFLOW won't run)
             # check streambed elevations in relation to model top
             tops = self.sfr.parent.dis.top.array[i, j]
-            reach_data = recfunctions.append_fields(reach_data, names='modeltop', data=tops, asrecarray=True)
 
-            txt += self._boolean_compare(reach_data[['k', 'i', 'j', 'iseg', 'ireach',
-                                                     'strtop', 'modeltop', 'reachID']].copy(),
+            txt += self._boolean_compare(_get_rec_array(columns +
+                                                        [('modeltop', tops),
+                                                         ('reachID', reach_data.reachID)]),
                                          col1='strtop', col2='modeltop',
                                          level0txt='{} reaches encountered with streambed above model top.',
                                          level1txt='Model top violations:',
@@ -1554,21 +1739,18 @@ class check:
                 if len(t) > 0:
                     raise Exception('Elevation check requires consecutive segment numbering.')
 
-            first_reaches = reach_data[reach_data.ireach == 1].copy()
-            last_reaches = reach_data[np.append((np.diff(reach_data.iseg) == 1), True)].copy()
-            segment_ends = recfunctions.stack_arrays([first_reaches, last_reaches],
-                                                     asrecarray=True, usemask=False)
-            segment_ends['strtop'] = np.append(segment_data.elevup, segment_data.elevdn)
+            first_reaches = reach_data[reach_data.ireach == 1]
+            last_reaches = reach_data[np.append((np.diff(reach_data.iseg) == 1), True)]
+            segment_ends = np.concatenate([first_reaches, last_reaches]).view(np.recarray)
+            strtop = np.append(segment_data.elevup, segment_data.elevdn)
             i, j = segment_ends.i, segment_ends.j
             tops = self.sfr.parent.dis.top.array[i, j]
-            diff = tops - segment_ends.strtop
-            segment_ends = recfunctions.append_fields(segment_ends,
-                                                      names=['modeltop', 'diff'],
-                                                      data=[tops, diff],
-                                                      asrecarray=True)
-
-            txt += self._boolean_compare(segment_ends[['k', 'i', 'j', 'iseg',
-                                                       'strtop', 'modeltop', 'diff', 'reachID']].copy(),
+            diff = tops - strtop
+            segment_ends = _get_rec_array([(c, segment_ends[c]) for c in ['k', 'i', 'j', 'iseg']] +
+                                          [('strtop', strtop), ('modeltop', tops), ('diff', diff),
+                                           ('reachID', segment_ends.reachID)])
+
+            txt += self._boolean_compare(segment_ends,
                                          col1=np.zeros(len(segment_ends)), col2='diff',
                                          level0txt='{} reaches encountered with streambed above model top.',
                                          level1txt='Model top violations:',
@@ -1705,13 +1887,30 @@ def _get_dataset(line, dataset):
     return dataset
 
 
-def _get_duplicates(a):
-    """Returns duplcate values in an array, similar to pandas .duplicated() method
-    http://stackoverflow.com/questions/11528078/determining-duplicate-values-in-an-array
+def _get_rec_array(columns):
+    """Returns a record array with a field for each (name, values) pair in columns.
+    """
+    dtype = np.dtype([(str(name), np.asarray(values).dtype) for name, values in columns])
+    array = np.zeros(len(columns[0][1]), dtype=dtype).view(np.recarray)
+    for name, values in columns:
+        array[name] = values
+    return array
+
+
+def _get_index(keys, values, sorter=None):
+    """Returns the index of each value in the array keys, or -1 for values
+    that are not in keys. sorter is the argsort of keys (it is computed if
+    it is not given).
     """
-    s = np.sort(a, axis=None)
-    equal_to_previous_item = np.append(s[1:] == s[:-1], False)  # maintain same dimmension for boolean array
-    return np.unique(s[equal_to_previous_item])
+    values = np.atleast_1d(values)
+    if len(keys) == 0:
+        return np.zeros(len(values), dtype=int) - 1
+    if sorter is None:
+        sorter = np.argsort(keys, kind='mergesort')
+    pos = np.searchsorted(keys, values, sorter=sorter)
+    pos[pos == len(keys)] = 0
+    inds = sorter[pos]
+    return np.where(keys[inds] == values, inds, -1)
 
 
 def _get_item2_names(nstrm, reachinput, isfropt, structured=False):
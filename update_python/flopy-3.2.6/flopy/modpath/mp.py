@@ -1,9 +1,222 @@
 import numpy as np
-from ..mbase import BaseModel
+from ..mbase import BaseModel, run_model
 from ..pakbase import Package
+from ..utils import Util3d
 from .mpsim import ModpathSim
 from .mpbas import ModpathBas
 import os
+import shutil
+
+# ModpathSim attributes that have one entry for each particle group
+_group_attributes = ['group_name', 'group_placement', 'release_times',
+                     'group_region', 'mask_nlay', 'mask_layer', 'mask_1lay',
+                     'face_ct', 'ifaces', 'particle_cell_cnt']
+
+
+def _run_worker(args):
+    """run one MODPATH simulation - module-level so it can be used by a
+    multiprocessing pool
+    """
+    irun, exe_name, simfile, model_ws, normal_msg = args
+    success, buff = run_model(exe_name, simfile, model_ws=model_ws,
+                              silent=True, report=True,
+                              normal_msg=normal_msg)
+    return irun, success, buff
+
+
+def _link_file(src, dst):
+    """symlink src to dst, or copy src if symlinks are not available
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.symlink(os.path.abspath(src), dst)
+    except (AttributeError, NotImplementedError, OSError):
+        shutil.copy(src, dst)
+
+
+def _write_run_namefile(namefile, model_ws, ws):
+    """write the name file of a run in ws from the name file of the model
+    and link the files in it into ws.  Files that are not in the model
+    workspace (absolute paths or paths starting with '..') are linked
+    into ws by their base name, so nothing outside ws is changed.
+    """
+    ws_abs = os.path.abspath(ws)
+    fin = open(os.path.join(model_ws, namefile), 'r')
+    lines = fin.readlines()
+    fin.close()
+    linked = {}
+    f = open(os.path.join(ws, namefile), 'w')
+    for line in lines:
+        t = line.split()
+        if len(t) < 3 or line.lstrip().startswith('#'):
+            f.write(line)
+            continue
+        fname = os.path.normpath(t[2])
+        if os.path.isabs(fname) or fname.split(os.sep)[0] == os.pardir:
+            fname = os.path.basename(fname)
+        dst = os.path.abspath(os.path.join(ws, fname))
+        if not dst.startswith(ws_abs + os.sep):
+            errmsg = 'Error: {} is not in the run workspace {}'.format(
+                t[2], ws)
+            raise Exception(errmsg)
+        src = os.path.abspath(os.path.join(model_ws, t[2]))
+        if linked.get(dst, src) != src:
+            errmsg = 'Error: {} and {} are both linked to {}'.format(
+                linked[dst], src, dst)
+            raise Exception(errmsg)
+        linked[dst] = src
+        if not os.path.isdir(os.path.dirname(dst)):
+            os.makedirs(os.path.dirname(dst))
+        _link_file(src, dst)
+        f.write(' '.join(t[:2] + [fname] + t[3:]) + '\n')
+    f.close()
+
+
+def _read_header(fname):
+    """return the header lines of a MODPATH 6 endpoint or pathline file
+    """
+    header = []
+    f = open(fname, 'r')
+    for line in f:
+        header.append(line)
+        if 'end header' in line.lower():
+            break
+    f.close()
+    return header
+
+
+def _merge_endpoint_header(headers, pid_offsets, group_names):
+    """build the header of a merged MODPATH 6 endpoint file from the headers
+    of the runs.  Line 2 has the total and released particle counts and the
+    maximum particle id, line 3 has the particle status counts, and line 4
+    has the number of particle groups, which is followed by the group
+    names.
+    """
+    try:
+        t = [h[1].split() for h in headers]
+        total = sum([int(v[1]) for v in t])
+        released = sum([int(v[2]) for v in t])
+        maxid = max([int(v[3]) + int(pid0)
+                     for v, pid0 in zip(t, pid_offsets)])
+        counts = np.sum([[int(v) for v in h[2].split()] for h in headers],
+                        axis=0)
+        for h in headers:
+            int(h[3])
+    except (IndexError, ValueError):
+        raise Exception('Error: unexpected MODPATH endpoint file header')
+    header = [headers[0][0]]
+    header.append(' '.join([t[0][0], str(total), str(released),
+                            str(maxid)] + t[0][4:]) + '\n')
+    header.append(' '.join([str(c) for c in counts]) + '\n')
+    header.append('{}\n'.format(len(group_names)))
+    header += ['{}\n'.format(name) for name in group_names]
+    header.append(headers[0][-1])
+    return header
+
+
+def _merge_particle_files(fnames, fout, pid_offsets, group_maps,
+                          group_names=None):
+    """merge MODPATH 6 endpoint or pathline files, adding the particle id
+    offset of each file to the first column and mapping the particle group
+    in the second column to the particle group of the merged file with
+    group_maps (one-based groups of each file).  If group_names is not None
+    the files are endpoint files and the header is rebuilt from the
+    headers of all of the files, otherwise the header of the first file is
+    used.
+    """
+    headers = [_read_header(fname) for fname in fnames]
+    if group_names is not None:
+        header = _merge_endpoint_header(headers, pid_offsets, group_names)
+    else:
+        header = headers[0]
+    f = open(fout, 'w')
+    f.writelines(header)
+    for ifile, fname in enumerate(fnames):
+        pid0, groups = pid_offsets[ifile], group_maps[ifile]
+        fin = open(fname, 'r')
+        for line in fin:
+            if 'end header' in line.lower():
+                break
+        for line in fin:
+            t = line.split(None, 2)
+            if len(t) < 3:
+                continue
+            f.write('{} {} {}'.format(int(t[0]) + pid0,
+                                      groups[int(t[1]) - 1], t[2]))
+        fin.close()
+    f.close()
+
+
+def _get_group_value(v, i, group_ct):
+    """return the value of group i of a ModpathSim group attribute; an
+    attribute with a single (default) entry has the same value for all
+    groups
+    """
+    if len(v) == group_ct:
+        return v[i]
+    return v[0]
+
+
+def _get_group_cells(sim, i, shape):
+    """return a boolean array of the cells in which the particles of group
+    i of sim start
+    """
+    group_ct = sim.group_ct
+    option = _get_group_value(sim.group_placement, i, group_ct)[1]
+    cells = np.zeros(shape, dtype=bool)
+    if option == 1:
+        k0, i0, j0, k1, i1, j1 = _get_group_value(sim.group_region, i,
+                                                  group_ct)
+        cells[k0:k1 + 1, i0:i1 + 1, j0:j1 + 1] = True
+    elif option == 2:
+        mask = _get_group_value(sim.mask_nlay, i, group_ct)
+        mask = getattr(mask, 'array', mask)
+        cells[:, :, :] = np.asarray(mask) != 0
+    else:
+        k = int(_get_group_value(sim.mask_layer, i, group_ct)) - 1
+        mask = _get_group_value(sim.mask_1lay, i, group_ct)
+        mask = getattr(mask, 'array', mask)
+        cells[k] = np.asarray(mask) != 0
+    return cells
+
+
+def _split_groups(sim, nruns, shape):
+    """split the particle groups of sim into nruns runs.  If there are at
+    least nruns groups, each run has a contiguous block of groups.
+    Otherwise the starting cells of each group are split into parts (in
+    layer, row, column order) and each run has one part of one group; the
+    number of parts of a group is proportional to its number of starting
+    cells.  Returns a list with a list of (group, cells) tuples for each
+    run, where cells is None for a whole group or a boolean array of the
+    starting cells of the part of the group.
+    """
+    group_ct = sim.group_ct
+    if nruns <= group_ct:
+        return [[(i, None) for i in igroups] for igroups in
+                np.array_split(np.arange(group_ct), nruns)]
+    cells = [_get_group_cells(sim, i, shape) for i in range(group_ct)]
+    ncells = np.array([c.sum() for c in cells], dtype=float)
+    nparts = np.ones(group_ct, dtype=int)
+    while nparts.sum() < nruns:
+        # add a part to the group with the most cells per part
+        cells_per_part = ncells / nparts
+        cells_per_part[nparts >= ncells] = 0.
+        i = np.argmax(cells_per_part)
+        if cells_per_part[i] <= 0.:
+            break
+        nparts[i] += 1
+    runs = []
+    for i in range(group_ct):
+        if nparts[i] < 2:
+            runs.append([(i, None)])
+            continue
+        idx = np.nonzero(cells[i].ravel())[0]
+        for part in np.array_split(idx, nparts[i]):
+            c = np.zeros(cells[i].size, dtype=bool)
+            c[part] = True
+            runs.append([(i, c.reshape(shape))])
+    return runs
 
 
 class ModpathList(Package):
@@ -123,6 +336,42 @@ class Modpath(BaseModel):
             f_nam.write('DATA  {0:3d}  '.format(u) + f + '\n')
         f_nam.close()
 
+    def get_input_files(self):
+        """
+        Get the names of the model input files: the simulation file, the
+        package files, the MODPATH name file, and the files in the name file
+        (the MODFLOW discretization, head and budget files).
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
+
+        """
+        fnames = BaseModel.get_input_files(self)
+        fnames.append(self.mpnamefile)
+        fnames += self._get_name_file_inputs(self.mpnamefile)
+        return fnames
+
+    def get_output_files(self):
+        """
+        Get the names of the model output files: the files declared in
+        the name file and the list, endpoint, pathline and time series
+        files of the simulation file.
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
+
+        """
+        fnames = BaseModel.get_output_files(self)
+        sim = self.sim
+        if sim is not None:
+            fnames += [sim.mp_list_file, sim.endpoint_file,
+                       sim.pathline_file, sim.time_ser_file]
+        return fnames
+
     sim = property(getsim)  # Property has no setter, so read-only
     mf = property(getmf)  # Property has no setter, so read-only
 
@@ -247,3 +496,174 @@ class Modpath(BaseModel):
                           group_name=group_name,
                           group_region=group_region,
                           face_ct=face_ct, ifaces=ifaces)
+
+    def run_parallel(self, nruns=None, nworkers=None, run_ws=None,
+                     merge=True, silent=True, normal_msg='normal termination'):
+        """
+        Split the particle release of the MODPATH simulation into
+        independent runs and run them concurrently.
+
+        Parameters
+        ----------
+        nruns : int
+            Number of MODPATH runs.  If there are at least nruns particle
+            groups, the groups are split into nruns contiguous blocks of
+            groups; otherwise the starting cells of the groups are split
+            between the runs.  (default is nworkers)
+        nworkers : int
+            Number of runs that are executed at the same time.  (default
+            is the number of processors)
+        run_ws : str
+            Directory for the run workspaces.  Each run is made in
+            run_ws/<name>_run<irun>.  (default is the model workspace)
+        merge : bool
+            Merge the endpoint and pathline files of the runs into the
+            endpoint and pathline files of the model workspace, with
+            particle ids renumbered in the order of the runs and the
+            particle groups of the simulation.  (default is True)
+        silent : bool
+            Do not write progress to the screen.  (default is True)
+        normal_msg : str
+            Normal termination message used to determine if a run
+            terminated normally.  (default is 'normal termination')
+
+        Returns
+        -------
+        (success, buffs)
+        success : boolean
+            True if all of the runs terminated normally.
+        buffs : list of lists
+            Lines of stdout of each run.
+
+        Notes
+        -----
+        Each run workspace contains a simulation file with a subset of the
+        particle release and a name file; the files in the name file (the
+        MPBAS, DIS, head and budget files) are symbolic links to the files
+        in the model workspace (or copies if symbolic links are not
+        available), so the head and budget files are shared read-only.
+        Files in the name file that are outside of the model workspace are
+        linked into the run workspace by their base name.  A particle group
+        that is split between runs is written as a group with a three-
+        dimensional mask of its starting cells (GridCellRegionOption 2) in
+        each of the runs.  Only ParticleGenerationOption 1 (particle groups
+        defined in the simulation file) is supported.  The header of the
+        merged endpoint file is rebuilt from the headers of the runs; the
+        merged pathline file has the header of the first run.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> mp = flopy.modpath.Modpath('mp', modflowmodel=m, exe_name='mp6')
+        >>> mpb = flopy.modpath.ModpathBas(mp, ibound=1)
+        >>> sim = mp.create_mpsim(simtype='endpoint', packages='RCH')
+        >>> mp.write_input()
+        >>> success, buffs = mp.run_parallel(nworkers=8)
+
+        """
+        sim = self.sim
+        if sim is None:
+            raise Exception('Error: no ModpathSim package in the model')
+        if sim.options_dict['ParticleGenerationOption'] != 1:
+            errmsg = 'Error: run_parallel requires ParticleGenerationOption 1'
+            raise Exception(errmsg)
+        if nworkers is None:
+            import multiprocessing
+            nworkers = multiprocessing.cpu_count()
+        if nruns is None:
+            nruns = nworkers
+        nruns = max(1, nruns)
+        if run_ws is None:
+            run_ws = self.model_ws
+        if not os.path.isfile(os.path.join(self.model_ws, self.mpnamefile)):
+            self.write_input()
+
+        # split the particle release and write the simulation file of
+        #  each run
+        nrow, ncol, nlay, nper = self.mf.nrow_ncol_nlay_nper
+        runs = _split_groups(sim, nruns, (nlay, nrow, ncol))
+        saved = dict((name, getattr(sim, name)) for name in
+                     _group_attributes + ['group_ct', 'fn_path'])
+        group_ct = saved['group_ct']
+        run_dirs = []
+        # the group attributes are set in the instance dictionary, because
+        #  Package.__setattr__ converts the items of lists of Util3d
+        #  instances
+        try:
+            for irun, run in enumerate(runs):
+                ws = os.path.join(run_ws, '{}_run{:03d}'.format(self.name,
+                                                                irun))
+                if not os.path.exists(ws):
+                    os.makedirs(ws)
+                _write_run_namefile(self.mpnamefile, self.model_ws, ws)
+                for name in _group_attributes:
+                    sim.__dict__[name] = [_get_group_value(saved[name], i,
+                                                           group_ct)
+                                          for i, cells in run]
+                for j, (i, cells) in enumerate(run):
+                    if cells is None:
+                        continue
+                    # a part of a group starts in the cells of a mask
+                    placement = list(sim.group_placement[j])
+                    placement[1] = 2
+                    sim.group_placement[j] = placement
+                    sim.mask_nlay[j] = Util3d(self, cells.shape, np.int,
+                                              cells.astype(int),
+                                              name='mask_nlay',
+                                              locat=sim.unit_number[0])
+                sim.group_ct = len(run)
+                sim.fn_path = os.path.join(ws, os.path.basename(
+                    saved['fn_path']))
+                sim.write_file()
+                run_dirs.append(ws)
+        finally:
+            for name, v in saved.items():
+                sim.__dict__[name] = v
+
+        # run the simulations
+        args = [(irun, self.exe_name, self.namefile, ws, normal_msg)
+                for irun, ws in enumerate(run_dirs)]
+        results = [None] * len(args)
+        pool = None
+        if nworkers > 1 and len(args) > 1:
+            import multiprocessing
+            pool = multiprocessing.Pool(min(nworkers, len(args)))
+            itr = pool.imap_unordered(_run_worker, args)
+        else:
+            itr = (_run_worker(arg) for arg in args)
+        try:
+            for irun, success, buff in itr:
+                results[irun] = (success, buff)
+                if not silent:
+                    print('MODPATH run {} of {} in {}: {}'.format(
+                        irun + 1, len(args), run_dirs[irun],
+                        'normal termination' if success else 'failed'))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        success = all(r[0] for r in results)
+        buffs = [r[1] for r in results]
+
+        # merge the endpoint and pathline files
+        if merge and success:
+            endpoint_files = [os.path.join(ws, sim.endpoint_file)
+                              for ws in run_dirs]
+            maxids = [int(_read_header(fname)[1].split()[3])
+                      for fname in endpoint_files]
+            pid_offsets = np.cumsum([0] + maxids[:-1])
+            group_maps = [[i + 1 for i, cells in run] for run in runs]
+            group_names = [_get_group_value(sim.group_name, i, group_ct)
+                           for i in range(group_ct)]
+            _merge_particle_files(endpoint_files,
+                                  os.path.join(self.model_ws,
+                                               sim.endpoint_file),
+                                  pid_offsets, group_maps, group_names)
+            if sim.options_dict['SimulationType'] == 2:
+                _merge_particle_files([os.path.join(ws, sim.pathline_file)
+                                       for ws in run_dirs],
+                                      os.path.join(self.model_ws,
+                                                   sim.pathline_file),
+                                      pid_offsets, group_maps)
+        return success, buffs
@@ -3,7 +3,7 @@ import sys
 import numpy as np
 from ..mbase import BaseModel
 from ..pakbase import Package
-from ..utils import mfreadnam
+from ..utils import mfreadnam, read_fixed_array, get_fixed_ipos
 from .mtbtn import Mt3dBtn
 from .mtadv import Mt3dAdv
 from .mtdsp import Mt3dDsp
@@ -341,6 +341,27 @@ class Mt3dms(BaseModel):
     def load_results(self, **kwargs):
         return
 
+    def get_output_files(self):
+        """
+        Get the names of the model output files: the files declared in
+        the name file and the concentration (MT3Dnnn.UCN and
+        MT3DnnnS.UCN), mass budget (MT3Dnnn.MAS) and observation
+        (MT3Dnnn.OBS) files of each species and the grid file (MT3D.CNF).
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
+
+        """
+        fnames = BaseModel.get_output_files(self)
+        fnames.append('MT3D.CNF')
+        for icomp in range(1, self.ncomp + 1):
+            for fmt in ('MT3D{:03d}.UCN', 'MT3D{:03d}S.UCN',
+                        'MT3D{:03d}.MAS', 'MT3D{:03d}.OBS'):
+                fnames.append(fmt.format(icomp))
+        return fnames
+
     @staticmethod
     def load(f, version='mt3dms', exe_name='mt3dms.exe', verbose=False,
              model_ws='.', load_only=None, forgive=False):
@@ -539,7 +560,7 @@ class Mt3dms(BaseModel):
         return mt
 
     @staticmethod
-    def load_mas(fname):
+    def load_mas(fname, cache=False):
         """
         Load an mt3d mas file and return a numpy recarray
 
@@ -547,6 +568,11 @@ class Mt3dms(BaseModel):
         ----------
         fname : str
             name of MT3D mas file
+        cache : bool or string
+            If True or a file name, a binary copy of the mas file is
+            written to fname + '.npy' (or the cache file name).  If the
+            cache file is newer than the mas file the records are read
+            from the cache instead.  (default is False)
 
         Returns
         -------
@@ -555,19 +581,28 @@ class Mt3dms(BaseModel):
         """
         if not os.path.isfile(fname):
             raise Exception('Could not find file: {}'.format(fname))
+        cachefile, r = _load_cache(fname, cache)
+        if r is not None:
+            return r
         dtype = [('time', float), ('total_in', float),
                  ('total_out', float),
                  ('sources', float), ('sinks', float),
                  ('fluid_storage', float),
                  ('total_mass', float), ('error_in-out', float),
                  ('error_alt', float)]
-        r = np.loadtxt(fname, skiprows=2, dtype=dtype)
+        with open(fname, 'r') as f:
+            lines = f.readlines()[2:]
+        v = _read_records(lines, 1, len(dtype), fname)
+        r = np.empty(v.shape[0], dtype=dtype)
+        for i, (name, dt) in enumerate(dtype):
+            r[name] = v[:, i]
         r = r.view(np.recarray)
+        _save_cache(cachefile, r)
         return r
 
 
     @staticmethod
-    def load_obs(fname):
+    def load_obs(fname, cache=False):
         """
         Load an mt3d obs file and return a numpy recarray
 
@@ -575,6 +610,11 @@ class Mt3dms(BaseModel):
         ----------
         fname : str
             name of MT3D obs file
+        cache : bool or string
+            If True or a file name, a binary copy of the obs file is
+            written to fname + '.npy' (or the cache file name).  If the
+            cache file is newer than the obs file the records are read
+            from the cache instead.  (default is False)
 
         Returns
         -------
@@ -588,6 +628,9 @@ class Mt3dms(BaseModel):
 
         if not os.path.isfile(fname):
             raise Exception('Could not find file: {}'.format(fname))
+        cachefile, r = _load_cache(fname, cache)
+        if r is not None:
+            return r
         with open(fname, 'r') as f:
             line = f.readline()
             if line.strip() != firstline:
@@ -599,7 +642,7 @@ class Mt3dms(BaseModel):
             nlineperrec = 0
             while True:
                 line = f.readline()
-                if line[0:7].strip() == '1':
+                if line[0:7].strip() == '1' or not line:
                     break
                 nlineperrec += 1
                 ll = line.strip().split()
@@ -612,27 +655,84 @@ class Mt3dms(BaseModel):
                         obsnam += str(len(obs) + 1) # make obs name unique
                     obs.append(obsnam)
 
-            icount = 0
-            r = []
-            while True:
-                ll = []
-                for n in range(nlineperrec):
-                    icount += 1
-                    if icount > 1:
-                        line = f.readline()
-                    ll.extend(line.strip().split())
-
-                if not line:
-                    break
-
-                rec = [int(ll[0])]
-                for val in ll[1:]:
-                    rec.append(float(val))
-                r.append(tuple(rec))
+            # read the records of all output times at once
+            lines = [line] + f.readlines()
+        v = _read_records(lines, nlineperrec, len(obs) + 2, fname)
 
         # add obs names to dtype
         for nameob in obs:
             dtype.append((nameob, float))
-        r = np.array(r, dtype=dtype)
+        r = np.empty(v.shape[0], dtype=dtype)
+        r['step'] = v[:, 0]
+        r['time'] = v[:, 1]
+        for i, nameob in enumerate(obs):
+            r[nameob] = v[:, i + 2]
         r = r.view(np.recarray)
+        _save_cache(cachefile, r)
         return r
+
+
+def _read_records(lines, nlineperrec, nval, fname):
+    """
+    Read the records of an MT3D text output file with nlineperrec lines and
+    nval values per record into an array with a row for each record.  The
+    fixed format layout of each line of a record is taken from the first
+    record, and the values of all of the records are parsed at once.  If
+    the lines cannot be parsed with the layout of the first record they are
+    read as free format values.
+
+    """
+    lines = [line for line in lines if line and not line.isspace()]
+    nlineperrec = max(nlineperrec, 1)
+    nrec = len(lines) // nlineperrec
+    lines = lines[:nrec * nlineperrec]
+    if nrec < 1:
+        return np.zeros((0, nval), dtype=np.float64)
+    try:
+        v = [read_fixed_array(lines[n::nlineperrec],
+                              get_fixed_ipos(lines[n]))
+             for n in range(nlineperrec)]
+        v = np.concatenate(v, axis=1)
+    except ValueError:
+        try:
+            v = np.array(' '.join(lines).split(), dtype=np.float64)
+        except ValueError:
+            v = np.zeros(0, dtype=np.float64)
+        if v.shape[0] != nrec * nval:
+            msg = 'could not parse the records of {}'.format(fname)
+            raise Exception(msg)
+        v = v.reshape(nrec, nval)
+    if v.shape[1] != nval:
+        msg = '{} values per record in {}, '.format(v.shape[1], fname) + \
+              'expected {}'.format(nval)
+        raise Exception(msg)
+    return v
+
+
+def _load_cache(fname, cache):
+    """
+    Return the name of the binary cache file of fname (None if cache is
+    False) and the records in the cache file if it is up to date.
+
+    """
+    if not cache:
+        return None, None
+    cachefile = cache if isinstance(cache, str) else fname + '.npy'
+    if os.path.isfile(cachefile) and \
+            os.path.getmtime(cachefile) >= os.path.getmtime(fname):
+        return cachefile, np.load(cachefile).view(np.recarray)
+    return cachefile, None
+
+
+def _save_cache(cachefile, r):
+    """
+    Write the records r to the binary cache file.
+
+    """
+    if cachefile is None:
+        return
+    with open(cachefile + '.tmp', 'wb') as f:
+        np.save(f, np.asarray(r))
+    if os.path.isfile(cachefile):
+        os.remove(cachefile)
+    os.rename(cachefile + '.tmp', cachefile)
@@ -10,7 +10,7 @@ User's Manual.
 import numpy as np
 # from numpy import empty,array
 from ..pakbase import Package
-from ..utils import Util2d, Util3d, read1d
+from ..utils import Util2d, Util3d, read1d, read_fixed_array
 import warnings
 
 def read1d_fixed(f, a, nvalperline=8):
@@ -29,22 +29,13 @@ def read1d_fixed(f, a, nvalperline=8):
     a : np.ndarray
 
     """
-    done = False
-    icount = 0
-    while True:
-        line = f.readline()
-        istart = 0
-        istop = 10
-        for i in range(nvalperline):
-            a[icount] = float(line[istart: istop])
-            istart = istop
-            istop += 10
-            if icount == a.shape[0] - 1:
-                done = True
-                break
-            icount += 1
-        if done:
-            break
+    n = a.shape[0]
+    if n < 1:
+        return
+    nline = (n - 1) // nvalperline + 1
+    lines = [f.readline() for i in range(nline)]
+    v = read_fixed_array(lines, [10] * nvalperline)
+    a[:] = v.ravel()[:n]
     return
 
 class Mt3dBtn(Package):
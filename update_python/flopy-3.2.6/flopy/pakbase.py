@@ -199,36 +199,15 @@ class Package(object):
 
         if self.__dict__.get('stress_period_data', None) is not None and \
                         self.name[0] != 'OC':
-            spd_inds_valid = True
             chk = check(self, f=f, verbose=verbose, level=level)
-            for per in self.stress_period_data.data.keys():
-                if isinstance(self.stress_period_data.data[per], np.recarray):
-                    spd = self.stress_period_data.data[per]
-                    inds = (spd.k, spd.i, spd.j) if self.parent.structured \
-                            else (spd.node)
-
-                    # General BC checks
-                    # check for valid cell indices
-                    spd_inds_valid = chk._stress_period_data_valid_indices(spd)
-
-                    # first check for and list nan values
-                    chk._stress_period_data_nans(spd)
-
-                    if spd_inds_valid:
-                        # next check for BCs in inactive cells
-                        chk._stress_period_data_inactivecells(spd)
-
-                        # More specific BC checks
-                        # check elevations in the ghb, drain, and riv packages
-                        if self.name[0] in check.bc_stage_names.keys():
-                            # check that bc elevations are above model cell bottoms
-                            # also checks for nan values
-                            elev_name = chk.bc_stage_names[self.name[0]]
-                            botms = self.parent.dis.botm.array[inds]
-                            chk.stress_period_data_values(spd, spd[elev_name] < botms,
-                                                          col=elev_name,
-                                                          error_name='BC elevation below cell bottom',
-                                                          error_type='Error')
+            # General BC checks (valid cell indices, nan values and BCs in
+            # inactive cells) for all of the stress periods at once
+            spd, iper = chk.get_stress_period_data(self.stress_period_data)
+
+            # More specific BC checks
+            # check elevations in the ghb, drain, and riv packages
+            elev_name = chk.bc_stage_names.get(self.name[0], None)
+            chk.stress_period_data_checks(spd, iper, elev_name=elev_name)
 
             chk.summarize()
 
@@ -237,6 +216,7 @@ class Package(object):
 
             chk = check(self, f=f, verbose=verbose, level=level)
             active = chk.get_active()
+            hk = self.hk.array
 
             # check for confined layers above convertable layers
             confined = False
@@ -253,14 +233,14 @@ class Package(object):
             # and quasi-3D confining beds
             kparams = {'hk': 'horizontal hydraulic conductivity',
                        'vka': 'vertical hydraulic conductivity'}
+            karrays = {'hk': hk, 'vka': self.vka.array}
             for kp, name in kparams.items():
-                chk.values(self.__dict__[kp].array,
-                           active & (self.__dict__[kp].array <= 0),
+                chk.values(karrays[kp], active & (karrays[kp] <= 0),
                            'zero or negative {} values'.format(name), 'Error')
 
             # check for negative hani
-            chk.values(self.__dict__['hani'].array,
-                       active & (self.__dict__['hani'].array < 0),
+            hani = self.hani.array
+            chk.values(hani, active & (hani < 0),
                        'negative horizontal anisotropy values', 'Error')
 
             def check_thresholds(array, active, thresholds, name):
@@ -275,16 +255,16 @@ class Package(object):
 
             # check for unusually high or low values of hydraulic conductivity
             if self.layvka.sum() > 0:  # convert vertical anistropy to Kv for checking
-                vka = self.vka.array.copy()
+                vka = karrays['vka'].copy()
+                layvka = self.layvka.array
                 for l in range(vka.shape[0]):
-                    vka[l] *= self.hk.array[l] if self.layvka.array[
-                                                      l] != 0 else 1
+                    vka[l] *= hk[l] if layvka[l] != 0 else 1
                 check_thresholds(vka, active,
                                  chk.property_threshold_values['vka'],
                                  kparams.pop('vka'))
 
             for kp, name in kparams.items():
-                check_thresholds(self.__dict__[kp].array, active,
+                check_thresholds(karrays[kp], active,
                                  chk.property_threshold_values[kp],
                                  name)
 
@@ -313,8 +293,8 @@ class Package(object):
                     chk._add_to_summary(type='Warning',
                                         desc='\r    STORAGECOEFFICIENT option is activated, \
                                               storage values are read storage coefficients')
-                    sarrays['ss'] /= self.parent.dis.thickness.array
-                    sarrays['sy'] /= self.parent.dis.thickness.array
+                    sarrays['ss'] /= chk.context.thickness
+                    sarrays['sy'] /= chk.context.thickness
 
                 chk.values(sarrays['ss'], active & (sarrays['ss'] < 0),
                            'zero or negative specific storage values', 'Error')
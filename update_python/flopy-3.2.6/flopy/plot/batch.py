@@ -0,0 +1,404 @@
+"""
+Module for rendering maps of many time steps of model results.  The figure,
+grid geometry, and colorbar are built once and only the data are updated
+for each frame, so that thousands of frames can be written as image files
+or as an animation.  Frames are rendered with the Agg backend and can be
+rendered in parallel worker processes.
+
+"""
+from __future__ import print_function
+import os
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .map import ModelMap
+
+# BatchPlotter instance of a worker process
+_worker_plotter = None
+
+
+def _init_worker(plotter):
+    global _worker_plotter
+    _worker_plotter = plotter
+
+
+def _render_worker(args):
+    """
+    Render a frame in a worker process.  If filename is None, the rendered
+    RGBA buffer is returned, otherwise the frame is saved to filename.
+
+    """
+    filename, a, info = args
+    _worker_plotter.render(a, info)
+    if filename is None:
+        return _worker_plotter.get_rgba()
+    _worker_plotter.savefig(filename)
+    return filename
+
+
+class BatchPlotter(object):
+    """
+    Class to render maps of a model layer for many time steps.
+
+    Parameters
+    ----------
+    sr : flopy.utils.reference.SpatialReference
+        The spatial reference of the model grid.
+    layer : int
+        Zero-based layer to plot. (Default is 0)
+    masked_values : list
+        Values that are not plotted, for example hnoflo and hdry.
+        NaN values are never plotted. (Default is None)
+    ibound : numpy.ndarray
+        ibound array of shape (nrow, ncol) or (nlay, nrow, ncol).  Inactive
+        cells are drawn in color_noflow. (Default is None)
+    vmin : float
+        Minimum of the color scale.  If None, the minimum of the first
+        frame is used. (Default is None)
+    vmax : float
+        Maximum of the color scale.  If None, the maximum of the first
+        frame is used. (Default is None)
+    cmap : str or matplotlib colormap
+        Colormap of the plotted array. (Default is None)
+    colorbar : bool or str
+        Add a colorbar to the figure.  If colorbar is a string it is used
+        as the colorbar label. (Default is True)
+    contour : bool
+        Contour the array of each frame. (Default is False)
+    levels : list of floats
+        Contour levels.  Only used if contour=True. (Default is None)
+    grid : bool
+        Plot the model grid. (Default is False)
+    lod : bool or str
+        Level of detail rendering passed to ModelMap. (Default is True)
+    title : str
+        Format string of the title of each frame.  The fields i, kstp,
+        kper, totim, and layer are available.  kstp, kper, and layer are
+        one-based.  (Default is 'Layer {layer}  totim {totim:g}')
+    figsize : tuple of floats
+        Figure size in inches. (Default is (8, 6))
+    dpi : int
+        Resolution of the rendered frames. (Default is 100)
+    color_noflow : str
+        Color of inactive cells. (Default is '0.5')
+
+    Notes
+    -----
+    The sources of the frames can be a LayerFile (HeadFile, UcnFile,
+    FormattedHeadFile), an array with a leading time dimension of shape
+    (ntimes, nrow, ncol) or (ntimes, nlay, nrow, ncol), or an object with
+    such an array attribute (e.g. Transient2d).  Arrays of shape
+    (ntimes, 1, nrow, ncol) are plotted for any layer.  For arrays, kper in
+    the title is the one-based frame index and totim the zero-based frame
+    index.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> m = flopy.modflow.Modflow.load('test.nam')
+    >>> hds = flopy.utils.HeadFile('test.hds')
+    >>> bp = flopy.plot.BatchPlotter(m.sr, layer=0, ibound=m.bas6.ibound.array,
+    ...                              masked_values=[m.bas6.hnoflo])
+    >>> filenames = bp.write_frames(hds, 'head', nworkers=4)
+    >>> bp.write_animation(hds, 'head.gif', fps=10, nworkers=4)
+
+    """
+
+    def __init__(self, sr, layer=0, masked_values=None, ibound=None,
+                 vmin=None, vmax=None, cmap=None, colorbar=True,
+                 contour=False, levels=None, grid=False, lod=True,
+                 title='Layer {layer}  totim {totim:g}', figsize=(8, 6),
+                 dpi=100, color_noflow='0.5'):
+        self.sr = sr
+        self.layer = layer
+        self.masked_values = masked_values
+        if ibound is not None:
+            ibound = np.asarray(ibound)
+            if ibound.ndim == 3:
+                ibound = ibound[layer]
+        self.ibound = ibound
+        self.vmin = vmin
+        self.vmax = vmax
+        self.cmap = cmap
+        self.colorbar = colorbar
+        self.contour = contour
+        self.levels = levels
+        self.grid = grid
+        self.lod = lod
+        self.title = title
+        self.figsize = figsize
+        self.dpi = dpi
+        self.color_noflow = color_noflow
+        self._fig = None
+
+    def __getstate__(self):
+        # the figure is not sent to worker processes, it is rebuilt there
+        state = dict((k, v) for k, v in self.__dict__.items()
+                     if not k.startswith('_'))
+        state['_fig'] = None
+        return state
+
+    def _mask(self, a):
+        a = np.ma.masked_invalid(a)
+        if self.masked_values is not None:
+            for mval in self.masked_values:
+                a = np.ma.masked_equal(a, mval)
+        return a
+
+    def _setup(self):
+        """
+        Build the figure, map, and colorbar used for every frame.
+
+        """
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1, aspect='equal')
+        mm = ModelMap(sr=self.sr, ax=ax, layer=self.layer, lod=self.lod)
+        a = np.ma.masked_all((self.sr.nrow, self.sr.ncol), dtype=np.float32)
+        self._quadmesh = mm.plot_array(a, cmap=self.cmap, vmin=self.vmin,
+                                       vmax=self.vmax)
+        if self.colorbar:
+            label = ''
+            if not isinstance(self.colorbar, bool):
+                label = str(self.colorbar)
+            fig.colorbar(self._quadmesh, ax=ax, shrink=0.5, label=label)
+        if self.ibound is not None:
+            mm.plot_inactive(ibound=self.ibound,
+                             color_noflow=self.color_noflow)
+        if self.grid:
+            mm.plot_grid()
+        self._title = ax.set_title('')
+        self._contour_set = None
+        self._mm = mm
+        self._fig = fig
+
+    def _frames(self, source, kstpkper=None):
+        """
+        Generator of (a, info) for each frame of source, where a is the two
+        dimensional array of the plotted layer and info is a dictionary of
+        the fields available to the title.
+
+        """
+        if hasattr(source, 'recordarray') and hasattr(source, 'get_data'):
+            if kstpkper is None:
+                kstpkper = source.get_kstpkper()
+            rec = source.recordarray
+            for i, kk in enumerate(kstpkper):
+                idx = np.where((rec['kstp'] == kk[0] + 1) &
+                               (rec['kper'] == kk[1] + 1))[0]
+                totim = float(rec['totim'][idx[0]]) if idx.shape[0] else 0.
+                a = source.get_data(kstpkper=kk, mflay=self.layer)
+                info = {'i': i, 'kstp': kk[0] + 1, 'kper': kk[1] + 1,
+                        'totim': totim, 'layer': self.layer + 1}
+                yield a, info
+        else:
+            a = np.asarray(getattr(source, 'array', source))
+            if a.ndim == 4:
+                # Transient2d arrays are of shape (nper, 1, nrow, ncol)
+                if a.shape[1] == 1:
+                    a = a[:, 0, :, :]
+                else:
+                    a = a[:, self.layer, :, :]
+            elif a.ndim != 3:
+                raise Exception('Array must be of dimension 3 or 4')
+            if kstpkper is None:
+                kstpkper = range(a.shape[0])
+            for i, kk in enumerate(kstpkper):
+                info = {'i': i, 'kstp': 1, 'kper': kk + 1, 'totim': float(kk),
+                        'layer': self.layer + 1}
+                yield a[kk], info
+
+    def _set_limits(self, frames):
+        """
+        Set vmin and vmax from the first frame if they were not specified.
+        Returns a generator of all of the frames.
+
+        """
+        frames = iter(frames)
+        try:
+            first = next(frames)
+        except StopIteration:
+            return iter([])
+        a = self._mask(first[0])
+        if self.vmin is None:
+            self.vmin = float(a.min())
+        if self.vmax is None:
+            self.vmax = float(a.max())
+
+        def itr():
+            yield first
+            for frame in frames:
+                yield frame
+        return itr()
+
+    def render(self, a, info=None):
+        """
+        Update the figure with a new array.
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            Array of shape (nrow, ncol) to plot.
+        info : dict
+            Fields for the title format string. (Default is None)
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+
+        """
+        if self._fig is None:
+            self._setup()
+        a = self._mask(a)
+        xgrid, ygrid, plotarray = self._mm._get_lod_array(a, self.lod,
+                                                          self._mm.ax)
+        # QuadMesh maps a flattened array, as in pcolormesh
+        self._quadmesh.set_array(plotarray.ravel())
+        if self.contour:
+            if self._contour_set is not None:
+                try:
+                    self._contour_set.remove()
+                except AttributeError:
+                    for c in self._contour_set.collections:
+                        c.remove()
+            self._contour_set = self._mm.contour_array(a, colors='black',
+                                                       levels=self.levels)
+        if info is not None and self.title is not None:
+            self._title.set_text(self.title.format(**info))
+        return self._fig
+
+    def savefig(self, filename):
+        """
+        Save the current frame.
+
+        """
+        self._fig.savefig(filename, dpi=self.dpi)
+
+    def get_rgba(self):
+        """
+        Draw the current frame and return it as an array of shape
+        (height, width, 4).
+
+        """
+        self._fig.canvas.draw()
+        return np.asarray(self._fig.canvas.buffer_rgba()).copy()
+
+    def _map(self, jobs, nworkers):
+        """
+        Render jobs of (filename, a, info) in order, in nworkers processes.
+
+        """
+        if nworkers > 1:
+            import multiprocessing as mp
+            pool = mp.Pool(nworkers, initializer=_init_worker,
+                           initargs=(self,))
+            try:
+                for result in pool.imap(_render_worker, jobs):
+                    yield result
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            _init_worker(self)
+            for job in jobs:
+                yield _render_worker(job)
+
+    def write_frames(self, source, filename_base, kstpkper=None, nworkers=1,
+                     file_extension='png', verbose=False):
+        """
+        Write an image file for each frame.
+
+        Parameters
+        ----------
+        source : LayerFile or numpy.ndarray
+            Source of the frames.
+        filename_base : str
+            Base file name of the image files.  Frames are written to
+            filename_base_00000.png, filename_base_00001.png, ...
+        kstpkper : list of tuples
+            Zero-based (kstp, kper) of the frames to write, or the indices
+            of the frames if source is an array.  If None, all frames are
+            written. (Default is None)
+        nworkers : int
+            Number of worker processes that render frames. (Default is 1)
+        file_extension : str
+            Valid matplotlib savefig file extension. (Default is 'png')
+        verbose : bool
+            Print the name of each file as it is written. (Default is False)
+
+        Returns
+        -------
+        filenames : list of str
+
+        """
+        fext = file_extension.replace('.', '')
+        frames = self._set_limits(self._frames(source, kstpkper))
+        jobs = (('{0}_{1:05d}.{2}'.format(filename_base, info['i'], fext),
+                 a, info) for a, info in frames)
+        filenames = []
+        for filename in self._map(jobs, nworkers):
+            if verbose:
+                print('    created...{}'.format(os.path.basename(filename)))
+            filenames.append(filename)
+        return filenames
+
+    def write_animation(self, source, filename, kstpkper=None, fps=5,
+                        nworkers=1, writer=None):
+        """
+        Write an animation of the frames.
+
+        Parameters
+        ----------
+        source : LayerFile or numpy.ndarray
+            Source of the frames.
+        filename : str
+            Animation file name.  A .gif file is written with the pillow
+            writer and other file types (e.g. .mp4) with the ffmpeg writer
+            unless writer is specified.
+        kstpkper : list of tuples
+            Zero-based (kstp, kper) of the frames to write, or the indices
+            of the frames if source is an array.  If None, all frames are
+            written. (Default is None)
+        fps : int
+            Frames per second. (Default is 5)
+        nworkers : int
+            Number of worker processes that render frames.  Frames are
+            assembled in order by this process. (Default is 1)
+        writer : str
+            Name of the matplotlib.animation writer. (Default is None)
+
+        Returns
+        -------
+        filename : str
+
+        """
+        import matplotlib.animation as animation
+        if writer is None:
+            if filename.lower().endswith('.gif'):
+                writer = 'pillow'
+            else:
+                writer = 'ffmpeg'
+        if not animation.writers.is_available(writer):
+            raise Exception('matplotlib animation writer ' +
+                            '"{}" is not available'.format(writer))
+
+        # frames are rendered to RGBA buffers and drawn into a figure of the
+        # same size that has a single image filling the whole canvas
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()
+        image = None
+
+        frames = self._set_limits(self._frames(source, kstpkper))
+        jobs = ((None, a, info) for a, info in frames)
+        mwriter = animation.writers[writer](fps=fps)
+        with mwriter.saving(fig, filename, self.dpi):
+            for rgba in self._map(jobs, nworkers):
+                if image is None:
+                    image = ax.imshow(rgba, interpolation='nearest')
+                else:
+                    image.set_data(rgba)
+                mwriter.grab_frame()
+        return filename
@@ -130,59 +130,37 @@ class ModelCrossSection(object):
             raise Exception(s)           
         
         # set horizontal distance
-        d = []
-        for v in self.xpts:
-            d.append(v[2])
-        self.d = np.array(d)
+        self.d = np.array(self.xpts)[:, 2]
+
+        # row and column of the cell at each intersection point, these are
+        # used to sample every array plotted on the cross-section
+        irow, jcol = plotutil.findrowcolumn((self.xpts[:, 0], self.xpts[:, 1]),
+                                            self.sr.xedge, self.sr.yedge)
+        inside = (irow >= 0) & (jcol >= 0)
+        self._irow = irow[inside]
+        self._jcol = jcol[inside]
 
         top = self.dis.top.array
         botm = self.dis.botm.array
-        elev = [top.copy()]
-        for k in range(self.dis.nlay):
-            elev.append(botm[k, :, :])
-        
-        self.elev = np.array(elev)
+        self.elev = np.concatenate((top.reshape((1,) + top.shape), botm))
         self.layer0 = 0
         self.layer1 = self.dis.nlay + 1
-        
-        zpts = []
-        for k in range(self.layer0, self.layer1):
-            zpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   self.elev[k, :, :]))
-        self.zpts = np.array(zpts)
-        
-        xcentergrid = []
-        zcentergrid = []
-        nz = 0
+
+        self.zpts = self.get_cell_values(self.elev)
+
+        # cell centers, the cross-section points are pairs of points
+        # where the line enters and leaves each cell
+        nx = self.d.shape[0] // 2
+        xc = 0.5 * (self.d[0:2*nx:2] + self.d[1:2*nx:2])
         if self.dis.nlay == 1:
-            for k in range(0, self.zpts.shape[0]):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i+1][2])
-                        zp = self.zpts[k, i]
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
+            zc = self.zpts[:, 0:2*nx:2]
         else:
-            for k in range(0, self.zpts.shape[0]-1):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i+1][2])
-                        zp = 0.5 * (self.zpts[k, i] + self.zpts[k+1, i+1])
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
-        self.xcentergrid = np.array(xcentergrid).reshape((nz, nx))
-        self.zcentergrid = np.array(zcentergrid).reshape((nz, nx))
+            zc = 0.5 * (self.zpts[:-1, 0:2*nx:2] + self.zpts[1:, 1:2*nx:2])
+        self.xcentergrid = np.tile(xc, (zc.shape[0], 1))
+        self.zcentergrid = zc
+
+        # cell polygons of self.zpts, built on first use
+        self._cell_verts = None
         
         # Create cross-section extent
         if extent is None:
@@ -211,11 +189,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
         if 'ax' in kwargs:
@@ -223,15 +201,7 @@ class ModelCrossSection(object):
         else:
             ax = self.ax
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   a[k, :, :]))
-        vpts = np.array(vpts)
-        if masked_values is not None:
-            for mval in masked_values:
-                vpts = np.ma.masked_equal(vpts, mval)
+        vpts = self.get_cell_values(a[:self.dis.nlay])
 
         if isinstance(head, np.ndarray):
             zpts = self.set_zpts(head)
@@ -244,7 +214,7 @@ class ModelCrossSection(object):
         
         pc = self.get_grid_patch_collection(zpts, vpts, **kwargs)
         if pc != None:
-            ax.add_collection(pc)
+            ax.add_collection(pc, autolim=False)
         return pc
 
     def plot_surface(self, a, masked_values=None, **kwargs):
@@ -272,7 +242,6 @@ class ModelCrossSection(object):
 
         plotarray = a
 
-        vpts = []
         if len(plotarray.shape) == 2:
             nlay = 1
             plotarray = np.reshape(plotarray, (1, plotarray.shape[0], plotarray.shape[1]))
@@ -280,11 +249,7 @@ class ModelCrossSection(object):
             nlay = plotarray.shape[0]
         else:
             raise Exception('plot_array array must be a 2D or 3D array')
-        for k in range(nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-        vpts = np.array(vpts)
+        vpts = np.array(self.get_cell_values(plotarray))
         
         if masked_values is not None:
             for mval in masked_values:
@@ -326,12 +291,8 @@ class ModelCrossSection(object):
 
         plotarray = a
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-        vpts = np.ma.array(vpts, mask=False)
+        vpts = np.ma.array(self.get_cell_values(plotarray[:self.dis.nlay]),
+                           dtype=np.float, mask=False)
 
         if isinstance(head, np.ndarray):
             zpts = self.set_zpts(head)
@@ -347,8 +308,8 @@ class ModelCrossSection(object):
         for k in range(self.dis.nlay):
             idxmk = idxm[k, :]
             v = vpts[k, :]
-            y1 = zpts[k, :]
-            y2 = zpts[k+1, :]
+            y1 = zpts[k, :].copy()
+            y2 = zpts[k+1, :].copy()
             # make sure y1 is not below y2
             idx = y1 < y2
             y1[idx] = y2[idx]
@@ -366,7 +327,7 @@ class ModelCrossSection(object):
             plot.append(ax.fill_between(self.d, y1=y1, y2=y2, color=colors[0],
                                         **kwargs))
             y1 = y2
-            y2 = self.zpts[k+1, :]
+            y2 = self.zpts[k+1, :].copy()
             y2[idxmk] = np.nan
             plot.append(ax.fill_between(self.d, y1=y1, y2=y2, color=colors[1],
                                         **kwargs))
@@ -396,12 +357,7 @@ class ModelCrossSection(object):
         """
         plotarray = a
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   plotarray[k, :, :]))
-        vpts = np.array(vpts)
+        vpts = np.array(self.get_cell_values(plotarray[:self.dis.nlay]))
         vpts = vpts[:, ::2]
         if self.dis.nlay == 1:
             vpts = np.vstack((vpts, vpts))
@@ -438,11 +394,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
         if ibound is None:
@@ -486,7 +442,7 @@ class ModelCrossSection(object):
             kwargs['color'] = '0.5'
         
         lc = self.get_grid_line_collection(**kwargs)
-        ax.add_collection(lc)
+        ax.add_collection(lc, autolim=False)
         return lc
 
     def plot_bc(self, ftype=None, package=None, kper=0, color=None,
@@ -510,11 +466,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
 
@@ -653,36 +609,16 @@ class ModelCrossSection(object):
             zcentergrid = self.zcentergrid
         
         if nlay == 1:
-            x = []
-            z = []
-            for k in range(nlay):
-                for i in range(self.xcentergrid.shape[1]):
-                    x.append(self.xcentergrid[k, i])
-                    z.append(0.5 * (zcentergrid[k, i] + zcentergrid[k+1, i]))
-            x = np.array(x).reshape((1, self.xcentergrid.shape[1]))
-            z = np.array(z).reshape((1, self.xcentergrid.shape[1]))
+            x = self.xcentergrid[0:1, :]
+            z = 0.5 * (zcentergrid[0:1, :] + zcentergrid[1:2, :])
         else:
             x = self.xcentergrid
             z = zcentergrid
             
-        upts = []
-        u2pts = []
-        vpts = []
-        ibpts = []
-        for k in range(self.dis.nlay):
-            upts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, u[k, :, :]))
-            u2pts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                    self.sr.yedge, u2[k, :, :]))
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, v[k, :, :]))
-            ibpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                    self.sr.yedge, ib[k, :, :]))
-        # convert upts, u2pts, and vpts to numpy arrays
-        upts = np.array(upts)
-        u2pts = np.array(u2pts)
-        vpts = np.array(vpts)
-        ibpts = np.array(ibpts)
+        upts = np.array(self.get_cell_values(u), dtype=np.float)
+        u2pts = np.array(self.get_cell_values(u2), dtype=np.float)
+        vpts = np.array(self.get_cell_values(v), dtype=np.float)
+        ibpts = np.array(self.get_cell_values(ib))
 
         # Select correct slice and apply step
         x = x[::kstep, ::hstep]
@@ -721,29 +657,76 @@ class ModelCrossSection(object):
         return quiver
 
 
+    def get_cell_values(self, a):
+        """
+        Get the values of an array at the points where the cross-section
+        intersects the model grid (self.xpts).
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            Two- or three-dimensional array of shape (nrow, ncol) or
+            (nlay, nrow, ncol).
+
+        Returns
+        -------
+        vpts : numpy.ndarray
+            Array of shape (npts) or (nlay, npts).
+
+        """
+        return a[..., self._irow, self._jcol]
+
+    def _get_cell_verts(self, zpts):
+        """
+        Get the vertices of the cell polygons of the cross-section as an
+        array of shape (nlay, ncells, 4, 2) and the index of the first
+        cross-section point of each cell.  The polygons of self.zpts are
+        cached so that they are reused by every plot.
+
+        """
+        if zpts is self.zpts and self._cell_verts is not None:
+            return self._cell_verts
+        npts = self.d.shape[0]
+        idx = np.arange(0, npts - 1, 2)
+        inext = np.where(idx + 2 < npts, idx + 2, idx + 1)
+        x0 = self.d[idx]
+        x1 = self.d[inext]
+        ztop = zpts[:-1, idx]
+        zbot = zpts[1:, idx]
+        verts = np.empty(ztop.shape + (4, 2), dtype=np.float)
+        verts[..., 0, 0] = x0
+        verts[..., 1, 0] = x0
+        verts[..., 2, 0] = x1
+        verts[..., 3, 0] = x1
+        verts[..., 0, 1] = zbot
+        verts[..., 1, 1] = ztop
+        verts[..., 2, 1] = ztop
+        verts[..., 3, 1] = zbot
+        if zpts is self.zpts:
+            self._cell_verts = (verts, idx)
+        return verts, idx
+
     def get_grid_patch_collection(self, zpts, plotarray, **kwargs):
         """
-        Get a PatchCollection of plotarray in unmasked cells
+        Get a PolyCollection of plotarray in unmasked cells
 
         Parameters
         ----------
         zpts : numpy.ndarray
             array of z elevations that correspond to the x, y, and horizontal
             distance along the cross-section (self.xpts). Constructed using
-            plotutil.cell_value_points().
+            get_cell_values().
         plotarray : numpy.ndarray
             Three-dimensional array to attach to the Patch Collection.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
-        from matplotlib.patches import Polygon
-        from matplotlib.collections import PatchCollection
-        rectcol = []
+        from matplotlib.collections import PolyCollection
 
         if 'vmin' in kwargs:
             vmin = kwargs.pop('vmin')
@@ -754,33 +737,18 @@ class ModelCrossSection(object):
         else:
             vmax = None
 
-        v = []
-        
-        colors = []
-        for k in range(zpts.shape[0]-1):
-            for idx in range(0, len(self.xpts)-1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], zpts[k+1, idx]))
-                    try:
-                        dx = self.xpts[idx+2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx+1][2] - self.xpts[idx][2]
-                    dz = zpts[k, idx] - zpts[k+1, idx]
-                    pts = (ll, 
-                          (ll[0], ll[1]+dz), (ll[0]+dx, ll[1]+dz),
-                          (ll[0]+dx, ll[1])) #, ll) 
-                    if np.isnan(plotarray[k, idx]):
-                        continue
-                    if plotarray[k, idx] is np.ma.masked:
-                        continue
-                    rectcol.append(Polygon(pts, closed=True))
-                    colors.append(plotarray[k, idx])
-                except:
-                    pass
-
-        if len(rectcol) > 0:
-            patches = PatchCollection(rectcol, **kwargs)
-            patches.set_array(np.array(colors))
+        verts, idx = self._get_cell_verts(zpts)
+        nlay = min(verts.shape[0], plotarray.shape[0])
+        verts = verts[:nlay]
+        values = plotarray[:nlay, idx]
+        data = np.ma.getdata(values)
+        valid = ~np.ma.getmaskarray(values)
+        if data.dtype.kind == 'f':
+            valid &= ~np.isnan(data)
+
+        if valid.any():
+            patches = PolyCollection(verts[valid], **kwargs)
+            patches.set_array(data[valid])
             patches.set_clim(vmin, vmax)
         else:
             patches = None
@@ -801,26 +769,16 @@ class ModelCrossSection(object):
         """
         from matplotlib.collections import LineCollection
 
-        linecol = []
-        for k in range(self.zpts.shape[0]-1):
-            for idx in range(0, len(self.xpts)-1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], self.zpts[k+1, idx]))
-                    try:
-                        dx = self.xpts[idx+2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx+1][2] - self.xpts[idx][2]
-                    dz = self.zpts[k, idx] - self.zpts[k+1, idx]
-                    # horizontal lines
-                    linecol.append(((ll), (ll[0]+dx, ll[1])))
-                    linecol.append(((ll[0], ll[1]+dz), (ll[0]+dx, ll[1]+dz)))
-                    #vertical lines
-                    linecol.append(((ll), (ll[0], ll[1]+dz)))
-                    linecol.append(((ll[0]+dx, ll[1]), (ll[0]+dx, ll[1]+dz)))
-                except:
-                    pass
-
-        linecollection = LineCollection(linecol, **kwargs)
+        verts, idx = self._get_cell_verts(self.zpts)
+        verts = verts.reshape((-1, 4, 2))
+        # bottom, top, left, and right side of each cell
+        linecol = np.empty((verts.shape[0], 4, 2, 2), dtype=np.float)
+        linecol[:, 0] = verts[:, [0, 3]]
+        linecol[:, 1] = verts[:, [1, 2]]
+        linecol[:, 2] = verts[:, [0, 1]]
+        linecol[:, 3] = verts[:, [3, 2]]
+
+        linecollection = LineCollection(linecol.reshape((-1, 2, 2)), **kwargs)
         return linecollection
         
     def set_zpts(self, vs):
@@ -838,16 +796,11 @@ class ModelCrossSection(object):
         zpts : numpy.ndarray
 
         """
-        zpts = []
-        for k in range(self.layer0, self.layer1):
-            e = self.elev[k, :, :]
-            if k < self.dis.nlay:
-                v = vs[k, :, :]
-                idx =  v < e
-                e[idx] = v[idx] 
-            zpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, e))
-        return np.array(zpts)
+        zpts = self.get_cell_values(self.elev)
+        v = self.get_cell_values(vs[:self.dis.nlay])
+        e = zpts[:self.dis.nlay]
+        zpts[:self.dis.nlay] = np.where(v < e, v, e)
+        return zpts
         
     def set_zcentergrid(self, vs):
         """
@@ -864,43 +817,21 @@ class ModelCrossSection(object):
         zcentergrid : numpy.ndarray
 
         """
-        vpts = []
-        for k in range(self.layer0, self.layer1):
-            if k < self.dis.nlay:
-                e = vs[k, :, :]
-            else:
-                e = self.elev[k, :, :]
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge, e))
-        vpts = np.array(vpts)
-
-        zcentergrid = []
-        nz = 0
+        vpts = self.get_cell_values(vs[:self.dis.nlay])
+        nx = self.d.shape[0] // 2
+        i0 = slice(0, 2 * nx, 2)
+        i1 = slice(1, 2 * nx, 2)
         if self.dis.nlay == 1:
-            for k in range(0, self.zpts.shape[0]):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    nx += 1
-                    vp = vpts[k, i]
-                    zp = self.zpts[k, i]
-                    if k == 0:
-                        if vp < zp:
-                            zp = vp
-                    zcentergrid.append(zp)
+            zcentergrid = self.zpts[:, i0].copy()
+            vp = vpts[0, i0]
+            ep = zcentergrid[0]
+            zcentergrid[0] = np.where(vp < ep, vp, ep)
         else:
-            for k in range(0, self.zpts.shape[0] - 1):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    nx += 1
-                    vp = vpts[k, i]
-                    ep = self.zpts[k, i]
-                    if vp < ep:
-                        ep = vp
-                    zp = 0.5 * (ep + self.zpts[k+1, i+1])
-                    zcentergrid.append(zp)
-        return np.array(zcentergrid).reshape((nz, nx)) 
+            vp = vpts[:, i0]
+            ep = self.zpts[:-1, i0]
+            ep = np.where(vp < ep, vp, ep)
+            zcentergrid = 0.5 * (ep + self.zpts[1:, i1])
+        return zcentergrid
 
     def get_extent(self):
         """
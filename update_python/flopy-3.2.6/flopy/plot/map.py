@@ -34,6 +34,14 @@ class ModelMap(object):
     extent : tuple of floats
         (xmin, xmax, ymin, ymax) will be used to specify axes limits.  If None
         then these will be calculated based on grid, coordinates, and rotation.
+    lod : bool or str
+        Level of detail rendering.  If lod is not False, arrays are
+        aggregated to the screen resolution of ax before they are plotted
+        and grid lines are only drawn where they are at least a few pixels
+        apart.  lod can be 'mean', 'min', 'max' or 'decimate' to select how
+        arrays are aggregated (True is 'mean').  Boundary condition and
+        ibound plots use 'max' so that cells are not lost.  lod can also be
+        passed to the individual plotting methods. (Default is False)
 
     Notes
     -----
@@ -45,22 +53,29 @@ class ModelMap(object):
     arguments are provided, then it puts the lower-left-hand corner of the
     grid at (0, 0).
 
+    The SpatialReference is only copied if xul, yul, or rotation are passed,
+    otherwise it is shared so that the rotated grid vertices it caches are
+    reused by every ModelMap of the same grid.
+
     """
 
     def __init__(self, sr=None, ax=None, model=None, dis=None, layer=0,
-                 extent=None, xul=None, yul=None, rotation=None):
+                 extent=None, xul=None, yul=None, rotation=None, lod=False):
         self.model = model
         self.layer = layer
         self.dis = dis
+        self.lod = lod
         self.sr = None
         if sr is not None:
-            self.sr = copy.deepcopy(sr)
+            self.sr = sr
         elif dis is not None:
             # print("warning: the dis arg to model map is deprecated")
-            self.sr = copy.deepcopy(dis.parent.sr)
+            self.sr = dis.parent.sr
         elif model is not None:
             # print("warning: the model arg to model map is deprecated")
-            self.sr = copy.deepcopy(model.sr)
+            self.sr = model.sr
+        if xul is not None or yul is not None or rotation is not None:
+            self.sr = copy.deepcopy(self.sr)
 
         # model map override spatial reference settings
         if xul is not None:
@@ -95,6 +110,22 @@ class ModelMap(object):
             self._extent = self.sr.get_extent()
         return self._extent
 
+    def _get_lod_array(self, plotarray, lod, ax):
+        """
+        Get the vertices and the array aggregated to the screen resolution
+        of ax.
+
+        """
+        if not lod:
+            return self.sr.xgrid, self.sr.ygrid, plotarray
+        if lod is True:
+            lod = 'mean'
+        rstep, cstep = plotutil.lod_steps(ax, self.sr)
+        xgrid, ygrid = self.sr.get_lod_grid(rstep, cstep)
+        plotarray = plotutil.block_aggregate(plotarray, rstep, cstep,
+                                             method=lod)
+        return xgrid, ygrid, plotarray
+
     def plot_array(self, a, masked_values=None, **kwargs):
         """
         Plot an array.  If the array is three-dimensional, then the method
@@ -107,7 +138,9 @@ class ModelMap(object):
         masked_values : iterable of floats, ints
             Values to mask.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.pyplot.pcolormesh
+            keyword arguments passed to matplotlib.pyplot.pcolormesh.  lod
+            can be passed to override the level of detail rendering of the
+            ModelMap.
 
         Returns
         -------
@@ -126,8 +159,9 @@ class ModelMap(object):
             ax = kwargs.pop('ax')
         else:
             ax = self.ax
-        quadmesh = ax.pcolormesh(self.sr.xgrid, self.sr.ygrid, plotarray,
-                                 **kwargs)
+        lod = kwargs.pop('lod', self.lod)
+        xgrid, ygrid, plotarray = self._get_lod_array(plotarray, lod, ax)
+        quadmesh = ax.pcolormesh(xgrid, ygrid, plotarray, **kwargs)
         ax.set_xlim(self.extent[0], self.extent[1])
         ax.set_ylim(self.extent[2], self.extent[3])
         return quadmesh
@@ -208,6 +242,8 @@ class ModelMap(object):
         cmap = matplotlib.colors.ListedColormap(['0', color_noflow])
         bounds = [0, 1, 2]
         norm = matplotlib.colors.BoundaryNorm(bounds, cmap.N)
+        if self.lod:
+            kwargs.setdefault('lod', 'max')
         quadmesh = self.plot_array(plotarray, cmap=cmap, norm=norm, **kwargs)
         return quadmesh
 
@@ -248,6 +284,8 @@ class ModelMap(object):
         cmap = matplotlib.colors.ListedColormap(['0', color_noflow, color_ch])
         bounds = [0, 1, 2, 3]
         norm = matplotlib.colors.BoundaryNorm(bounds, cmap.N)
+        if self.lod:
+            kwargs.setdefault('lod', 'max')
         quadmesh = self.plot_array(plotarray, cmap=cmap, norm=norm, **kwargs)
         return quadmesh
 
@@ -257,8 +295,8 @@ class ModelMap(object):
 
         Parameters
         ----------
-        kwargs : ax, colors.  The remaining kwargs are passed into the
-            the LineCollection constructor.
+        kwargs : ax, colors, lod, min_spacing.  The remaining kwargs are
+            passed into the the LineCollection constructor.
 
         Returns
         -------
@@ -273,7 +311,7 @@ class ModelMap(object):
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        lc = self.get_grid_line_collection(**kwargs)
+        lc = self.get_grid_line_collection(ax=ax, **kwargs)
         ax.add_collection(lc)
         ax.set_xlim(self.extent[0], self.extent[1])
         ax.set_ylim(self.extent[2], self.extent[3])
@@ -360,6 +398,8 @@ class ModelMap(object):
         cmap = matplotlib.colors.ListedColormap(['0', c])
         bounds = [0, 1, 2]
         norm = matplotlib.colors.BoundaryNorm(bounds, cmap.N)
+        if self.lod:
+            kwargs.setdefault('lod', 'max')
         quadmesh = self.plot_array(plotarray, cmap=cmap, norm=norm, **kwargs)
         return quadmesh
 
@@ -517,7 +557,8 @@ class ModelMap(object):
 
         return quiver
 
-    def plot_pathline(self, pl, travel_time=None, **kwargs):
+    def plot_pathline(self, pl, travel_time=None, time_interval=None,
+                      max_particles=None, seed=None, **kwargs):
         """
         Plot the MODPATH pathlines.
 
@@ -527,7 +568,8 @@ class ModelMap(object):
             rec array or list of rec arrays is data returned from
             modpathfile PathlineFile get_data() or get_alldata()
             methods. Data in rec array is 'x', 'y', 'z', 'time',
-            'k', and 'particleid'.
+            'k', and 'particleid' (or 'id'). A single rec array can
+            contain the points of many pathlines.
         travel_time: float or str
             travel_time is a travel time selection for the displayed
             pathlines. If a float is passed then pathlines with times
@@ -538,6 +580,16 @@ class ModelMap(object):
             >. For example, to select all pathlines less than 10000 days
             travel_time='< 10000' would be passed to plot_pathline.
             (default is None)
+        time_interval : float
+            Decimate the pathlines for display by only keeping the first
+            point of each pathline in every time_interval of travel time
+            and the last point of each pathline. (default is None)
+        max_particles : int
+            Maximum number of pathlines to plot.  If there are more
+            pathlines a random subset of max_particles pathlines is
+            plotted. (default is None)
+        seed : int
+            Seed of the random subset of pathlines. (default is None)
         kwargs : layer, ax, colors.  The remaining kwargs are passed
             into the LineCollection constructor. If layer='all',
             pathlines are output for all layers
@@ -548,9 +600,13 @@ class ModelMap(object):
 
         """
         from matplotlib.collections import LineCollection
-        # make sure pathlines is a list
+        # combine the pathlines into a single array
         if isinstance(pl, np.ndarray):
-            pl = [pl]
+            p = pl
+        elif len(pl) > 0:
+            p = np.concatenate(pl)
+        else:
+            return None
 
         if 'layer' in kwargs:
             kon = kwargs.pop('layer')
@@ -572,58 +628,72 @@ class ModelMap(object):
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        linecol = []
-        for p in pl:
-            if travel_time is None:
-                tp = p.copy()
-            else:
-                if isinstance(travel_time, str):
-                    if '<=' in travel_time:
-                        time = float(travel_time.replace('<=', ''))
-                        idx = (p['time'] <= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('<', ''))
-                        idx = (p['time'] < time)
-                    elif '>=' in travel_time:
-                        time = float(travel_time.replace('>=', ''))
-                        idx = (p['time'] >= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('>', ''))
-                        idx = (p['time'] > time)
-                    else:
-                        try:
-                            time = float(travel_time)
-                            idx = (p['time'] <= time)
-                        except:
-                            errmsg = 'flopy.map.plot_pathline travel_time ' + \
-                                     'variable cannot be parsed. ' + \
-                                     'Acceptable logical variables are , ' + \
-                                     '<=, <, >=, and >. ' + \
-                                     'You passed {}'.format(travel_time)
-                            raise Exception(errmsg)
-                else:
-                    time = float(travel_time)
-                    idx = (p['time'] <= time)
-                tp = p[idx]
-
-            vlc = []
-            # rotate data
-            x0r, y0r = self.sr.rotate(tp['x'], tp['y'], self.sr.rotation, 0.,
-                                      self.sr.yedge[0])
-            x0r += self.sr.xul
-            y0r += self.sr.yul - self.sr.yedge[0]
-            # build polyline array
-            arr = np.vstack((x0r, y0r)).T
-            # select based on layer
-            if kon >= 0:
-                kk = p['k'].copy().reshape(p.shape[0], 1)
-                kk = np.repeat(kk, 2, axis=1)
-                arr = np.ma.masked_where((kk != kon), arr)
-            else:
-                arr = np.ma.asarray(arr)
-            # append line to linecol if there is some unmasked segment
-            if not arr.mask.all():
-                linecol.append(arr)
+        if 'particleid' in p.dtype.names:
+            pid = p['particleid']
+        else:
+            pid = p['id']
+
+        # group the points of each pathline, keeping the order of the
+        # points within a pathline
+        if pid.shape[0] > 1 and (pid[1:] < pid[:-1]).any():
+            isort = np.argsort(pid, kind='mergesort')
+            p = p[isort]
+            pid = pid[isort]
+
+        # random subset of pathlines for display
+        if max_particles is not None:
+            upid = np.unique(pid)
+            if upid.shape[0] > max_particles:
+                rng = np.random.RandomState(seed)
+                keep = np.sort(rng.choice(upid, max_particles,
+                                          replace=False))
+                ipos = np.searchsorted(keep, pid).clip(0, keep.shape[0] - 1)
+                idx = keep[ipos] == pid
+                p = p[idx]
+                pid = pid[idx]
+
+        if travel_time is not None:
+            idx = _travel_time_index(p['time'], travel_time)
+            p = p[idx]
+            pid = pid[idx]
+
+        # decimate by travel time
+        if time_interval is not None and p.shape[0] > 1:
+            interval = np.floor(p['time'] / float(time_interval))
+            newpid = pid[1:] != pid[:-1]
+            idx = np.ones(p.shape[0], dtype=bool)
+            idx[1:] = newpid | (interval[1:] != interval[:-1])
+            idx[:-1] |= newpid
+            p = p[idx]
+            pid = pid[idx]
+
+        if p.shape[0] < 2:
+            return None
+
+        # rotate data
+        x0r, y0r = self.sr.rotate(p['x'].astype(np.float64),
+                                  p['y'].astype(np.float64),
+                                  self.sr.rotation, 0., self.sr.yedge[0])
+        x0r += self.sr.xul
+        y0r += self.sr.yul - self.sr.yedge[0]
+
+        arr = np.column_stack((x0r, y0r))
+
+        # select based on layer
+        if kon >= 0:
+            inlay = p['k'] == kon
+        else:
+            inlay = np.ones(p.shape[0], dtype=bool)
+
+        # split the points into lines of consecutive points of the same
+        # pathline that are in the selected layer
+        i0 = np.flatnonzero((pid[1:] != pid[:-1]) |
+                            (inlay[1:] != inlay[:-1])) + 1
+        i1 = np.append(i0, p.shape[0])
+        i0 = np.insert(i0, 0, 0)
+        idx = inlay[i0] & (i1 - i0 > 1)
+        linecol = [arr[n0:n1] for n0, n1 in zip(i0[idx], i1[idx])]
+
         # create line collection
         lc = None
         if len(linecol) > 0:
@@ -632,7 +702,8 @@ class ModelMap(object):
         return lc
 
     def plot_endpoint(self, ep, direction='ending',
-                      selection=None, selection_direction=None, **kwargs):
+                      selection=None, selection_direction=None,
+                      max_particles=None, seed=None, **kwargs):
         """
         Plot the MODPATH endpoints.
 
@@ -655,6 +726,12 @@ class ModelMap(object):
             ending particle locations. If selection is not None and
             selection_direction is None, the selection direction will be set
             to the opposite of direction. (default is None)
+        max_particles : int
+            Maximum number of endpoints to plot.  If there are more endpoints
+            a random subset of max_particles endpoints is plotted.
+            (default is None)
+        seed : int
+            Seed of the random subset of endpoints. (default is None)
 
         kwargs : ax, c, s or size, colorbar, colorbar_label, shrink. The
             remaining kwargs are passed into the matplotlib scatter
@@ -712,7 +789,14 @@ class ModelMap(object):
             idx = (ep[ksel] == k) & (ep[isel] == i) & (ep[jsel] == j)
             tep = ep[idx]
         else:
-            tep = ep.copy()
+            tep = ep
+
+        # random subset of endpoints for display
+        if max_particles is not None and tep.shape[0] > max_particles:
+            rng = np.random.RandomState(seed)
+            idx = np.sort(rng.choice(tep.shape[0], max_particles,
+                                     replace=False))
+            tep = tep[idx]
 
         if 'ax' in kwargs:
             ax = kwargs.pop('ax')
@@ -723,8 +807,7 @@ class ModelMap(object):
         if 'c' not in kwargs:
             c = tep['finaltime'] - tep['initialtime']
         else:
-            c = np.empty((tep.shape[0]), dtype="S30")
-            c.fill(kwargs.pop('c'))
+            c = kwargs.pop('c')
 
         s = 50
         if 's' in kwargs:
@@ -746,19 +829,18 @@ class ModelMap(object):
             shrink = float(kwargs.pop('shrink'))
 
         # rotate data
-        x0r, y0r = self.sr.rotate(tep[xp], tep[yp], self.sr.rotation, 0.,
-                                  self.sr.yedge[0])
+        x0r, y0r = self.sr.rotate(tep[xp].astype(np.float64),
+                                  tep[yp].astype(np.float64),
+                                  self.sr.rotation, 0., self.sr.yedge[0])
         x0r += self.sr.xul
         y0r += self.sr.yul - self.sr.yedge[0]
-        # build array to plot
-        arr = np.vstack((x0r, y0r)).T
 
         # plot the end point data
-        sp = plt.scatter(arr[:, 0], arr[:, 1], c=c, s=s, **kwargs)
+        sp = ax.scatter(x0r, y0r, c=c, s=s, **kwargs)
 
         # add a colorbar for travel times
         if createcb:
-            cb = plt.colorbar(sp, shrink=shrink)
+            cb = plt.colorbar(sp, ax=ax, shrink=shrink)
             cb.set_label(colorbar_label)
         return sp
 
@@ -766,8 +848,59 @@ class ModelMap(object):
         """
         Get a LineCollection of the grid
 
+        Parameters
+        ----------
+        kwargs : ax, lod, min_spacing.  If lod is not False, only grid lines
+            that are at least min_spacing pixels apart on ax are included
+            (min_spacing default is 4).  The remaining kwargs are passed into
+            the LineCollection constructor.
+
         """
         from matplotlib.collections import LineCollection
 
-        lc = LineCollection(self.sr.get_grid_lines(), **kwargs)
+        ax = kwargs.pop('ax', self.ax)
+        lod = kwargs.pop('lod', self.lod)
+        min_spacing = kwargs.pop('min_spacing', 4.)
+        rstep, cstep = 1, 1
+        if lod:
+            rstep, cstep = plotutil.lod_steps(ax, self.sr,
+                                              min_pixels=min_spacing)
+        lc = LineCollection(self.sr.get_grid_line_array(rstep, cstep),
+                            **kwargs)
         return lc
+
+
+def _travel_time_index(time, travel_time):
+    """
+    Get a boolean array of the times that satisfy a travel_time selection
+    (e.g. 1000., '<= 1000', '> 500').
+
+    """
+    if isinstance(travel_time, str):
+        if '<=' in travel_time:
+            t = float(travel_time.replace('<=', ''))
+            idx = (time <= t)
+        elif '<' in travel_time:
+            t = float(travel_time.replace('<', ''))
+            idx = (time < t)
+        elif '>=' in travel_time:
+            t = float(travel_time.replace('>=', ''))
+            idx = (time >= t)
+        elif '>' in travel_time:
+            t = float(travel_time.replace('>', ''))
+            idx = (time > t)
+        else:
+            try:
+                t = float(travel_time)
+                idx = (time <= t)
+            except:
+                errmsg = 'flopy.map.plot_pathline travel_time ' + \
+                         'variable cannot be parsed. ' + \
+                         'Acceptable logical variables are , ' + \
+                         '<=, <, >=, and >. ' + \
+                         'You passed {}'.format(travel_time)
+                raise Exception(errmsg)
+    else:
+        t = float(travel_time)
+        idx = (time <= t)
+    return idx
@@ -333,8 +333,8 @@ def _plot_bc_helper(package, kper,
 
 class SwiConcentration():
     """
-    The binary_header class is a class to create headers for MODFLOW
-    binary files
+    The SwiConcentration class calculates the concentration (dimensionless
+    density) in each cell from SWI2 zeta surfaces.
 
     """
     def __init__(self, model=None, botm=None, istrat=1, nu=None):
@@ -347,9 +347,9 @@ class SwiConcentration():
             self.__nu = nu
             self.__istrat = istrat
             if istrat == 1:
-                self.__nsrf = self.nu.shape - 1
+                self.__nsrf = self.__nu.shape[0] - 1
             else:
-                self.__nsrf = self.nu.shape - 2
+                self.__nsrf = self.__nu.shape[0] - 2
         else:
             try:
                 dis = model.get_package('DIS')
@@ -368,8 +368,45 @@ class SwiConcentration():
         self.__nlay = self.__botm.shape[0] - 1
         self.__nrow = self.__botm[0, :, :].shape[0]
         self.__ncol = self.__botm[0, :, :].shape[1]
-        self.__b = self.__botm[0:-1, :, :] - self.__botm[1:, :, :] 
-     
+        self.__b = self.__botm[0:-1, :, :] - self.__botm[1:, :, :]
+        # concentration of each zone between zeta surfaces. For the linear
+        # option (istrat=0) nu is specified along the top, each surface and
+        # the bottom and the zone value is the mean of the bounding values
+        nu = np.asarray(self.__nu, dtype=np.float)
+        if self.__istrat == 1:
+            self.__nuz = nu[:self.__nsrf + 1]
+        else:
+            self.__nuz = 0.5 * (nu[:self.__nsrf + 1] + nu[1:self.__nsrf + 2])
+
+    def _calc_conc(self, zeta, conc):
+        """
+        Calculate concentrations from zeta surfaces of shape
+        (..., nsrf, nlay, nrow, ncol) into conc of shape
+        (..., nlay, nrow, ncol).
+
+        The fraction of each cell above zeta surface isrf is p[isrf] and
+        the concentration is
+
+            nuz[nsrf] + sum(p[isrf] * (nuz[isrf] - nuz[isrf+1]))
+
+        where nuz is the concentration of each zone.  p is zero in cells
+        with a thickness of zero or less.
+
+        """
+        nuz = self.__nuz
+        conc[...] = nuz[self.__nsrf]
+        b = self.__b
+        active = b > 0.
+        inactive = ~active
+        p = np.zeros(conc.shape, dtype=conc.dtype)
+        for isrf in range(self.__nsrf):
+            np.subtract(self.__botm[:-1], zeta[..., isrf, :, :, :], out=p)
+            np.divide(p, b, out=p, where=active)
+            p[..., inactive] = 0.
+            p *= nuz[isrf] - nuz[isrf + 1]
+            conc += p
+        return conc
+
     def calc_conc(self, zeta, layer=None):
         """
         Calculate concentrations for a given time step using passed zeta.
@@ -397,24 +434,143 @@ class SwiConcentration():
         >>> conc = c.calc_conc(z, layer=0)
 
         """
+        z = np.array([zeta[isrf] for isrf in range(self.__nsrf)],
+                     dtype=np.float)
         conc = np.zeros((self.__nlay, self.__nrow, self.__ncol), np.float)
-        
-        pct = {}
-        for isrf in range(self.__nsrf):
-            z = zeta[isrf]
-            pct[isrf] = (self.__botm[:-1, :, :] - z[:, :, :]) / self.__b[:, :, :]
-        for isrf in range(self.__nsrf):
-            p = pct[isrf]
-            if self.__istrat == 1:
-                conc[:, :, :] += self.__nu[isrf] * p[:, :, :]
-                if isrf+1 == self.__nsrf:
-                    conc[:, :, :] += self.__nu[isrf+1] * (1. - p[:, :, :])
-            #TODO linear option
+        self._calc_conc(z, conc)
         if layer is None:
             return conc
         else:
             return conc[layer, :, :]
 
+    def get_zeta(self, zetafile, kstpkper, dtype=np.float32):
+        """
+        Read zeta surfaces for several time steps from a SWI2 zeta file.
+
+        Parameters
+        ----------
+        zetafile : flopy.utils.CellBudgetFile
+            SWI2 zeta file with 'ZETASRF  1', 'ZETASRF  2', ... records.
+        kstpkper : list of tuples
+            zero-based (kstp, kper) of the time steps to read.
+        dtype : numpy dtype
+            dtype of the returned array (default is np.float32)
+
+        Returns
+        -------
+        zeta : numpy array
+            zeta surfaces of shape (ntimes, nsrf, nlay, nrow, ncol).
+
+        """
+        zeta = np.zeros((len(kstpkper), self.__nsrf, self.__nlay,
+                         self.__nrow, self.__ncol), dtype=dtype)
+        for isrf in range(self.__nsrf):
+            text = 'ZETASRF{:3d}'.format(isrf + 1)
+            for i, kk in enumerate(kstpkper):
+                zeta[i, isrf] = zetafile.get_data(kstpkper=kk, text=text)[0]
+        return zeta
+
+    def calc_conc_itr(self, zetafile, kstpkper=None, nbatch=100,
+                      dtype=np.float32):
+        """
+        Generator that calculates concentrations for the zeta records of a
+        SWI2 zeta file nbatch time steps at a time.
+
+        Parameters
+        ----------
+        zetafile : flopy.utils.CellBudgetFile
+            SWI2 zeta file.
+        kstpkper : list of tuples
+            zero-based (kstp, kper) of the time steps to process.  If None,
+            all time steps in zetafile are processed. (default is None)
+        nbatch : int
+            number of time steps calculated at once (default is 100)
+        dtype : numpy dtype
+            dtype of the calculated concentrations (default is np.float32)
+
+        Returns
+        -------
+        generator of (kstpkper, conc) tuples, where kstpkper is the list of
+        (kstp, kper) of the batch and conc is a numpy array of shape
+        (len(kstpkper), nlay, nrow, ncol).
+
+        """
+        if kstpkper is None:
+            kstpkper = zetafile.get_kstpkper()
+        kstpkper = list(kstpkper)
+        for i0 in range(0, len(kstpkper), nbatch):
+            kk = kstpkper[i0:i0 + nbatch]
+            zeta = self.get_zeta(zetafile, kk, dtype=dtype)
+            conc = np.zeros((len(kk), self.__nlay, self.__nrow, self.__ncol),
+                            dtype=dtype)
+            yield kk, self._calc_conc(zeta, conc)
+
+    def calc_conc_series(self, zetafile, kstpkper=None, layer=None,
+                         nbatch=100, dtype=np.float32, filename=None):
+        """
+        Calculate concentrations for all (or selected) zeta records in a
+        SWI2 zeta file.
+
+        Parameters
+        ----------
+        zetafile : flopy.utils.CellBudgetFile
+            SWI2 zeta file.
+        kstpkper : list of tuples
+            zero-based (kstp, kper) of the time steps to process.  If None,
+            all time steps in zetafile are processed. (default is None)
+        layer : int
+            Concentration will only be returned for the specified layer.  If
+            layer is None, then concentrations for all layers are returned.
+            (default is None).
+        nbatch : int
+            number of time steps calculated at once (default is 100)
+        dtype : numpy dtype
+            dtype of the calculated concentrations (default is np.float32)
+        filename : str
+            If filename is not None, concentrations are streamed into a
+            binary .npy file that is returned as a numpy.memmap.
+            (default is None)
+
+        Returns
+        -------
+        conc : numpy array
+            Calculated concentrations of shape (ntimes, nlay, nrow, ncol),
+            or (ntimes, nrow, ncol) if layer is specified.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> m = flopy.modflow.Modflow.load('test')
+        >>> zfile = flopy.utils.CellBudgetFile('test.zta')
+        >>> c = flopy.plot.SwiConcentration(model=m)
+        >>> conc = c.calc_conc_series(zfile)
+
+        """
+        if kstpkper is None:
+            kstpkper = zetafile.get_kstpkper()
+        kstpkper = list(kstpkper)
+        shape = (len(kstpkper), self.__nlay, self.__nrow, self.__ncol)
+        if layer is not None:
+            shape = (shape[0],) + shape[2:]
+        if filename is None:
+            conc = np.zeros(shape, dtype=dtype)
+        else:
+            conc = np.lib.format.open_memmap(filename, mode='w+',
+                                             dtype=dtype, shape=shape)
+        i0 = 0
+        for kk, c in self.calc_conc_itr(zetafile, kstpkper=kstpkper,
+                                        nbatch=nbatch, dtype=dtype):
+            i1 = i0 + len(kk)
+            if layer is None:
+                conc[i0:i1] = c
+            else:
+                conc[i0:i1] = c[:, layer, :, :]
+            i0 = i1
+        if filename is not None:
+            conc.flush()
+        return conc
+
 
 
 def shapefile_extents(shp):
@@ -766,7 +922,9 @@ def saturated_thickness(head, top, botm, laytyp, mask_values=None):
     Parameters
     ----------
     head : numpy.ndarray
-        head array
+        head array of shape (nlay, nrow, ncol).  A head array with a
+        leading time dimension (ntimes, nlay, nrow, ncol) can also be passed
+        to calculate the saturated thickness for many times at once.
     top : numpy.ndarray
         top array of shape (nrow, ncol)
     botm : numpy.ndarray
@@ -779,33 +937,29 @@ def saturated_thickness(head, top, botm, laytyp, mask_values=None):
     Returns
     -------
     sat_thk : numpy.ndarray
-        Saturated thickness of shape (nlay, nrow, ncol).
+        Saturated thickness of the same shape as head.
 
     """
-    nlay, nrow, ncol = head.shape
+    head = np.asarray(head)
+    top = np.asarray(top)
+    botm = np.asarray(botm)
+    nlay = botm.shape[0]
+    # top of each layer
+    ltop = np.concatenate((top.reshape((1,) + top.shape), botm[:-1]), axis=0)
+    thk = ltop - botm
     sat_thk = np.empty(head.shape, dtype=head.dtype)
-    for k in range(nlay):
-        if k == 0:
-            t = top
-        else:
-            t = botm[k-1, :, :]
-        sat_thk[k, :, :] = t - botm[k, :, :]
-    for k in range(nlay):
-        if laytyp[k] != 0:
-            dh = np.zeros((nrow, ncol), dtype=head.dtype)
-            s = sat_thk[k, :, :]
-
+    sat_thk[...] = thk
+
+    conv = np.asarray(laytyp).reshape(nlay) != 0
+    if conv.any():
+        h = head[..., conv, :, :]
+        dh = np.where(h > ltop[conv], ltop[conv], h) - botm[conv]
+        if mask_values is not None:
+            masked = np.zeros(h.shape, dtype=bool)
             for mv in mask_values:
-                idx = (head[k, :, :] == mv)
-                dh[idx] = s[idx]
-
-            if k == 0:
-                t = top
-            else:
-                t = botm[k-1, :, :]
-            t = np.where(head[k, :, :] > t, t, head[k, :, :])
-            dh = np.where(dh == 0, t - botm[k, :, :], dh)
-            sat_thk[k, :, :] = dh[:, :]
+                masked |= (h == mv)
+            dh = np.where(masked, thk[conv], dh)
+        sat_thk[..., conv, :, :] = dh
     return sat_thk
 
 
@@ -836,55 +990,244 @@ def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
     (qx, qy, qz) : tuple of numpy.ndarrays
         Specific discharge arrays that have been interpolated to cell centers.
 
+    Notes
+    -----
+    The flow arrays are (nlay, nrow, ncol) or, to process many times at
+    once, (ntimes, nlay, nrow, ncol).  sat_thk must broadcast against them.
+
     """
     qx = None
     qy = None
     qz = None
+    delr = np.asarray(delr)
+    delc = np.asarray(delc)
 
     if Qx is not None:
-
-        nlay, nrow, ncol = Qx.shape
         qx = np.zeros(Qx.shape, dtype=Qx.dtype)
+        area = delc.reshape((delc.shape[0], 1)) * 0.5 * \
+               (sat_thk[..., :, :-1] + sat_thk[..., :, 1:])
+        area = np.broadcast_to(area, Qx[..., :-1].shape)
+        np.divide(Qx[..., :-1], area, out=qx[..., :-1], where=area > 0.)
+        qx[..., 1:] = 0.5 * (qx[..., :-1] + qx[..., 1:])
+        qx[..., 0] = 0.5 * qx[..., 0]
 
-        for k in range(nlay):
-            for j in range(ncol-1):
-                area = delc[:] * 0.5 * (sat_thk[k, :, j] + sat_thk[k, :, j + 1])
-                idx = area > 0.
-                qx[k, idx, j] = Qx[k, idx, j] / area[idx]
+    if Qy is not None:
+        qy = np.zeros(Qy.shape, dtype=Qy.dtype)
+        area = delr.reshape((1, delr.shape[0])) * 0.5 * \
+               (sat_thk[..., :-1, :] + sat_thk[..., 1:, :])
+        area = np.broadcast_to(area, Qy[..., :-1, :].shape)
+        np.divide(Qy[..., :-1, :], area, out=qy[..., :-1, :],
+                  where=area > 0.)
+        qy[..., 1:, :] = 0.5 * (qy[..., :-1, :] + qy[..., 1:, :])
+        qy[..., 0, :] = 0.5 * qy[..., 0, :]
+        qy = -qy
 
-        qx[:, :, 1:] = 0.5 * (qx[:, :, 0:ncol-1] + qx[:, :, 1:ncol])
-        qx[:, :, 0] = 0.5 * qx[:, :, 0]
+    if Qz is not None:
+        area = delc.reshape((delc.shape[0], 1)) * \
+               delr.reshape((1, delr.shape[0]))
+        qz = (Qz / area).astype(Qz.dtype)
+        qz[..., 1:, :, :] = 0.5 * (qz[..., :-1, :, :] + qz[..., 1:, :, :])
+        qz[..., 0, :, :] = 0.5 * qz[..., 0, :, :]
+        qz = -qz
 
-    if Qy is not None:
+    return (qx, qy, qz)
 
-        nlay, nrow, ncol = Qy.shape
-        qy = np.zeros(Qy.shape, dtype=Qy.dtype)
 
-        for k in range(nlay):
-            for i in range(nrow-1):
-                area = delr[:] * 0.5 * (sat_thk[k, i, :] + sat_thk[k, i + 1, :])
-                idx = area > 0.
-                qy[k, i, idx] = Qy[k, i, idx] / area[idx]
+def specific_discharge_itr(cbc, model, hds=None, kstpkper=None, nbatch=12):
+    """
+    Generator that calculates the cell centered specific discharge and the
+    saturated thickness for many time steps of a cell-by-cell budget file.
+    Time steps are read in batches of nbatch and processed as
+    (nbatch, nlay, nrow, ncol) arrays.
 
-        qy[:, 1:, :] = 0.5 * (qy[:, 0:nrow-1, :] + qy[:, 1:nrow, :])
-        qy[:, 0, :] = 0.5 * qy[:, 0, :]
-        qy = -qy
+    Parameters
+    ----------
+    cbc : flopy.utils.CellBudgetFile
+        budget file with 'FLOW RIGHT FACE', 'FLOW FRONT FACE' and (for
+        multi-layer models) 'FLOW LOWER FACE' records
+    model : flopy.modflow.Modflow
+        model with DIS, BAS6 and LPF, UPW or BCF6 packages
+    hds : flopy.utils.HeadFile
+        head file used to calculate the saturated thickness of convertible
+        layers.  If None, the full cell thickness is used. (default is None)
+    kstpkper : list of tuples
+        zero-based (kstp, kper) of the time steps to process.  If None, all
+        time steps in cbc are processed. (default is None)
+    nbatch : int
+        number of time steps processed at once (default is 12)
 
+    Returns
+    -------
+    generator of (kstpkper, qx, qy, qz, sat_thk) tuples, where kstpkper is
+    the list of (kstp, kper) of the batch and the arrays are
+    (len(kstpkper), nlay, nrow, ncol).  qz is None for models without
+    'FLOW LOWER FACE' records.  Inactive cells are set to NaN.
 
-    if Qz is not None:
-        qz = np.zeros(Qz.shape, dtype=Qz.dtype)
-        dr = delr.reshape((1, delr.shape[0]))
-        dc = delc.reshape((delc.shape[0], 1))
-        area = dr * dc
-        for k in range(nlay):
-            qz[k, :, :] = qz[k, :, :] / area[:, :]
-        qz[1:, :, :] = 0.5 * (qz[0:nlay-1, :, :] + qz[1:nlay, :, :])
-        qz[0, :, :] = 0.5 * qz[0, :, :]
-        qz = -qz
+    Examples
+    --------
+    >>> import flopy
+    >>> cbc = flopy.utils.CellBudgetFile('model.cbc')
+    >>> for kk, qx, qy, qz, sat in flopy.plot.plotutil.specific_discharge_itr(cbc, m):
+    ...     pass
 
+    """
+    dis = model.get_package('DIS')
+    delr = dis.delr.array
+    delc = dis.delc.array
+    top = dis.top.array
+    botm = dis.botm.array
+    nlay, nrow, ncol = botm.shape
+
+    laytyp = np.zeros(nlay, dtype=int)
+    mask_values = []
+    for name, attr in (('LPF', 'laytyp'), ('UPW', 'laytyp'),
+                       ('BCF6', 'laycon')):
+        pak = model.get_package(name)
+        if pak is not None:
+            laytyp = getattr(pak, attr).array
+            if name == 'BCF6':
+                # only laycon 1 and 3 layers are convertible; laycon 2
+                # layers have a constant transmissivity
+                laytyp = ((laytyp == 1) | (laytyp == 3)).astype(int)
+            mask_values.append(pak.hdry)
+            break
+    ibound = None
+    bas = model.get_package('BAS6')
+    if bas is not None:
+        mask_values.append(bas.hnoflo)
+        ibound = bas.ibound.array
+    if hds is None:
+        laytyp = np.zeros(nlay, dtype=int)
+        sat_thk = saturated_thickness(np.zeros(botm.shape, np.float32), top,
+                                      botm, laytyp)
+
+    names = [t.decode().strip().upper() for t in cbc.textlist]
+    texts = ['FLOW RIGHT FACE', 'FLOW FRONT FACE', 'FLOW LOWER FACE']
+    texts = [t if t in names else None for t in texts]
+
+    if kstpkper is None:
+        kstpkper = cbc.get_kstpkper()
+    kstpkper = list(kstpkper)
+
+    for i0 in range(0, len(kstpkper), nbatch):
+        kk = kstpkper[i0:i0 + nbatch]
+        flows = []
+        for text in texts:
+            if text is None:
+                flows.append(None)
+                continue
+            q = np.zeros((len(kk), nlay, nrow, ncol), dtype=np.float32)
+            for i, k in enumerate(kk):
+                q[i] = cbc.get_data(kstpkper=k, text=text, full3D=True)[0]
+            flows.append(q)
+        if hds is not None:
+            head = np.zeros((len(kk), nlay, nrow, ncol), dtype=np.float32)
+            for i, k in enumerate(kk):
+                head[i] = hds.get_data(kstpkper=k)
+            sat_thk = saturated_thickness(head, top, botm, laytyp,
+                                          mask_values)
+        qx, qy, qz = centered_specific_discharge(flows[0], flows[1],
+                                                 flows[2], delr, delc,
+                                                 sat_thk)
+        sat = np.empty((len(kk), nlay, nrow, ncol), dtype=np.float32)
+        sat[...] = sat_thk
+        if ibound is not None:
+            inactive = ibound == 0
+            for a in (qx, qy, qz, sat):
+                if a is not None:
+                    a[:, inactive] = np.nan
+        yield kk, qx, qy, qz, sat
+
+
+def export_specific_discharge(f, cbc, model, hds=None, kstpkper=None,
+                              nbatch=12, **kwargs):
+    """
+    Calculate the cell centered specific discharge and the saturated
+    thickness for many time steps and stream the results to disk one batch
+    of time steps at a time.
 
-    return (qx, qy, qz)
-    
+    Parameters
+    ----------
+    f : str or flopy.export.NetCdf
+        If f is a NetCdf instance or a .nc filename, qx, qy, qz and
+        sat_thk variables are added to the netCDF file.  Otherwise f is
+        the prefix of the binary .npy files written for each array
+        (e.g. f + '_qx.npy'), which can be read with
+        numpy.load(filename, mmap_mode='r').
+    cbc : flopy.utils.CellBudgetFile
+        budget file
+    model : flopy.modflow.Modflow
+        model with DIS, BAS6 and LPF, UPW or BCF6 packages
+    hds : flopy.utils.HeadFile
+        head file for the saturated thickness (default is None)
+    kstpkper : list of tuples
+        zero-based (kstp, kper) of the time steps to export.  If None, all
+        time steps in cbc are exported. (default is None)
+    nbatch : int
+        number of time steps processed at once (default is 12)
+    kwargs : dictionary
+        keyword arguments passed to NetCdf if f is a .nc filename
+
+    Returns
+    -------
+    f : NetCdf instance or dict of .npy filenames
+
+    """
+    if kstpkper is None:
+        kstpkper = cbc.get_kstpkper()
+    kstpkper = list(kstpkper)
+    ntimes = len(kstpkper)
+    shape = (ntimes, model.nlay, model.nrow, model.ncol)
+    names = ['qx', 'qy', 'qz', 'sat_thk']
+
+    from ..export import NetCdf, netcdf
+    if isinstance(f, str) and f.lower().endswith('.nc'):
+        # totim of each (zero-based) kstpkper from the budget headers
+        rec = cbc.recordarray
+        times = []
+        for kstp, kper in kstpkper:
+            idx = np.where((rec['kstp'] == kstp + 1) &
+                           (rec['kper'] == kper + 1))[0]
+            times.append(float(rec['totim'][idx[0]]))
+        f = NetCdf(f, model, time_values=times, **kwargs)
+
+    out = {}
+    if isinstance(f, NetCdf):
+        units = "{0}/{1}".format(f.grid_units, f.time_units)
+        for name in names:
+            attribs = {"long_name": name,
+                       "coordinates": "time layer latitude longitude",
+                       "units": units if name != 'sat_thk' else f.grid_units}
+            out[name] = f.create_variable(name, attribs, precision_str="f4",
+                                          dimensions=("time", "layer", "y",
+                                                      "x"))
+        fillvalue = netcdf.FILLVALUE
+    else:
+        filenames = {}
+        for name in names:
+            filenames[name] = '{0}_{1}.npy'.format(f, name)
+            out[name] = np.lib.format.open_memmap(filenames[name], mode='w+',
+                                                  dtype=np.float32,
+                                                  shape=shape)
+        fillvalue = np.nan
+
+    i0 = 0
+    for kk, qx, qy, qz, sat in specific_discharge_itr(cbc, model, hds=hds,
+                                                      kstpkper=kstpkper,
+                                                      nbatch=nbatch):
+        i1 = i0 + len(kk)
+        for name, a in zip(names, (qx, qy, qz, sat)):
+            if a is None:
+                a = np.zeros(sat.shape, dtype=np.float32)
+            a[np.isnan(a)] = fillvalue
+            out[name][i0:i1] = a
+        i0 = i1
+
+    if isinstance(f, NetCdf):
+        return f
+    for name in names:
+        out[name].flush()
+    return filenames
 
 
 def findrowcolumn(pt, xedge, yedge):
@@ -894,7 +1237,9 @@ def findrowcolumn(pt, xedge, yedge):
     Parameters
     ----------
     pt : list or tuple
-        A list or tuple containing a x- and y- coordinate
+        A list or tuple containing a x- and y- coordinate. The x- and y-
+        coordinates can also be numpy.ndarrays to find the cells
+        containing many points at once.
     xedge : numpy.ndarray
         x-coordinate of the edge of each MODFLOW column. xedge is dimensioned
         to NCOL + 1. If xedge is not a numpy.ndarray it is converted to a
@@ -906,8 +1251,9 @@ def findrowcolumn(pt, xedge, yedge):
 
     Returns
     -------
-    irow, jcol : int
+    irow, jcol : int or numpy.ndarray
         Row and column location containing x- and y- point passed to function.
+        Points outside of the grid have a negative row and/or column.
 
     Examples
     --------
@@ -922,22 +1268,187 @@ def findrowcolumn(pt, xedge, yedge):
     if not isinstance(yedge, np.ndarray):
         yedge = np.array(yedge)
 
-    # find column
-    jcol = -100
-    for jdx, xmf in enumerate(xedge):
-        if xmf > pt[0]:
-            jcol = jdx - 1
-            break
+    x = np.asarray(pt[0])
+    y = np.asarray(pt[1])
 
-    # find row
-    irow = -100
-    for jdx, ymf in enumerate(yedge):
-        if ymf < pt[1]:
-            irow = jdx - 1
-            break
+    # find column - first column edge greater than x
+    jcol = np.searchsorted(xedge, x, side='right') - 1
+    jcol = np.where(jcol >= xedge.shape[0] - 1, -100, jcol)
+
+    # find row - first row edge less than y (yedge is decreasing)
+    irow = yedge.shape[0] - np.searchsorted(yedge[::-1], y,
+                                            side='left') - 1
+    irow = np.where(irow >= yedge.shape[0] - 1, -100, irow)
+
+    if irow.ndim == 0 and jcol.ndim == 0:
+        return int(irow), int(jcol)
     return irow, jcol
 
 
+def _expand_crossings(edge, lo, hi):
+    """
+    Find the edges strictly between lo and hi for every segment. edge must
+    be increasing. Returns the segment index and edge value of each
+    crossing.
+    """
+    i0 = np.searchsorted(edge, lo, side='right')
+    i1 = np.searchsorted(edge, hi, side='left')
+    n = np.maximum(i1 - i0, 0)
+    iseg = np.repeat(np.arange(lo.shape[0]), n)
+    offset = np.arange(iseg.shape[0]) - np.repeat(np.cumsum(n) - n, n)
+    return iseg, edge[np.repeat(i0, n) + offset]
+
+
+def lines_intersect_grid(lines, xedge=None, yedge=None, sr=None,
+                         returnvertices=False):
+    """
+    Intersect many polylines with a rectilinear MODFLOW grid at once.
+    All row and column edge crossings of every polyline segment are
+    computed with array operations.
+
+    Parameters
+    ----------
+    lines : list
+        A list of polylines. Each polyline is a list (or numpy.ndarray) of
+        x, y points.
+    xedge : numpy.ndarray
+        x-coordinate of the edge of each MODFLOW column. xedge is dimensioned
+        to NCOL + 1. Not needed if sr is provided.
+    yedge : numpy.ndarray
+        y-coordinate of the edge of each MODFLOW row. yedge is dimensioned
+        to NROW + 1. Not needed if sr is provided.
+    sr : flopy.utils.SpatialReference
+        If provided, the polylines are in real-world (offset and rotated)
+        coordinates and are converted to model space using sr. xedge and
+        yedge are taken from sr. (default is None)
+    returnvertices: bool
+        Return the polyline vertices that are in the grid instead of the
+        intersection of the polylines with the grid. (default is False).
+
+    Returns
+    -------
+    ptsout : list of numpy.ndarray
+        For every polyline, a numpy.ndarray of (x, y, dlen) rows in model
+        space, where dlen is the distance along the polyline. Points come
+        in pairs that bound the part of the polyline in each cell, as
+        returned by line_intersect_grid().
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ptsout = flopy.plotutil.lines_intersect_grid(lines, sr=m.sr)
+
+    """
+
+    small_value = 1.0e-4
+
+    if sr is not None:
+        xedge, yedge = sr.xedge, sr.yedge
+    xedge = np.asarray(xedge, dtype=float)
+    yedge = np.asarray(yedge, dtype=float)
+
+    nlines = len(lines)
+    xy = [np.atleast_2d(np.asarray(line, dtype=float))[:, :2]
+          for line in lines]
+    npts = np.array([p.shape[0] for p in xy], dtype=int)
+    if npts.sum() == 0:
+        return [np.array([]) for line in lines]
+    xy = np.concatenate([p for p in xy if p.shape[0] > 0])
+    if sr is not None:
+        xy[:, 0], xy[:, 1] = sr.get_local_coords(xy[:, 0], xy[:, 1])
+    ptline = np.repeat(np.arange(nlines), npts)
+
+    # distance of each vertex along its polyline
+    dseg = np.zeros(xy.shape[0])
+    dseg[1:] = np.hypot(np.diff(xy[:, 0]), np.diff(xy[:, 1]))
+    first = np.cumsum(npts)[npts > 0] - npts[npts > 0]
+    dseg[first] = 0.
+    dvert = np.cumsum(dseg)
+    dvert -= np.repeat(dvert[first], npts[npts > 0])
+
+    if returnvertices:
+        irow, jcol = findrowcolumn((xy[:, 0], xy[:, 1]), xedge, yedge)
+        inside = (irow >= 0) & (jcol >= 0)
+        pts = np.column_stack((xy[:, 0], xy[:, 1], dvert))[inside]
+        split = np.searchsorted(ptline[inside], np.arange(1, nlines))
+        return np.split(pts, split)
+
+    # build segments - every vertex except the last one of each line
+    isstart = np.ones(xy.shape[0], dtype=bool)
+    isstart[np.cumsum(npts)[npts > 0] - 1] = False
+    i0 = np.flatnonzero(isstart)
+    x0, y0 = xy[i0, 0], xy[i0, 1]
+    a = xy[i0 + 1, 0] - x0
+    b = xy[i0 + 1, 1] - y0
+    c = np.hypot(a, b)
+    keep = c > 0.
+    i0, x0, y0, a, b, c = i0[keep], x0[keep], y0[keep], a[keep], b[keep], \
+                          c[keep]
+    d0 = dvert[i0]
+    segline = ptline[i0]
+
+    # parametric range of each segment that is inside the grid
+    xmin, xmax = xedge[0], xedge[-1]
+    ymin, ymax = yedge[-1], yedge[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tx0 = (xmin - x0) / a
+        tx1 = (xmax - x0) / a
+        ty0 = (ymin - y0) / b
+        ty1 = (ymax - y0) / b
+    inx = (x0 >= xmin) & (x0 < xmax)
+    iny = (y0 > ymin) & (y0 <= ymax)
+    tin = np.maximum.reduce([np.zeros(c.shape),
+                             np.where(a == 0., np.where(inx, -np.inf, np.inf),
+                                      np.minimum(tx0, tx1)),
+                             np.where(b == 0., np.where(iny, -np.inf, np.inf),
+                                      np.minimum(ty0, ty1))])
+    tout = np.minimum.reduce([np.ones(c.shape),
+                              np.where(a == 0., np.where(inx, np.inf, -np.inf),
+                                       np.maximum(tx0, tx1)),
+                              np.where(b == 0., np.where(iny, np.inf, -np.inf),
+                                       np.maximum(ty0, ty1))])
+
+    # parametric distance of every column and row edge crossing
+    ix, ex = _expand_crossings(xedge, np.minimum(x0, x0 + a),
+                               np.maximum(x0, x0 + a))
+    tx = (ex - x0[ix]) / a[ix]
+    iy, ey = _expand_crossings(yedge[::-1], np.minimum(y0, y0 + b),
+                               np.maximum(y0, y0 + b))
+    ty = (ey - y0[iy]) / b[iy]
+
+    iseg = np.concatenate((np.arange(c.shape[0]), np.arange(c.shape[0]),
+                           ix, iy))
+    t = np.concatenate((tin, tout, tx, ty))
+    valid = (t >= tin[iseg]) & (t <= tout[iseg]) & (tin[iseg] < tout[iseg])
+    iseg, t = iseg[valid], t[valid]
+    isort = np.lexsort((t, iseg))
+    iseg, t = iseg[isort], t[isort]
+
+    # consecutive crossings on the same segment bound the part of the
+    # segment in one cell - drop intervals that only touch a cell corner
+    same = iseg[1:] == iseg[:-1]
+    seg = iseg[:-1][same]
+    ta = t[:-1][same]
+    tb = t[1:][same]
+    cs = c[seg]
+    use = (tb - ta) * cs > 2. * small_value
+    seg, ta, tb, cs = seg[use], ta[use], tb[use], cs[use]
+
+    # move the crossing points just inside the cell
+    ta = np.where(ta > 0., ta + small_value / cs, ta)
+    tb = np.where(tb < 1., tb - small_value / cs, tb)
+
+    pts = np.empty((2 * seg.shape[0], 3), dtype=float)
+    pts[0::2, 0] = x0[seg] + ta * a[seg]
+    pts[0::2, 1] = y0[seg] + ta * b[seg]
+    pts[0::2, 2] = d0[seg] + ta * cs
+    pts[1::2, 0] = x0[seg] + tb * a[seg]
+    pts[1::2, 1] = y0[seg] + tb * b[seg]
+    pts[1::2, 2] = d0[seg] + tb * cs
+    split = np.searchsorted(np.repeat(segline[seg], 2), np.arange(1, nlines))
+    return np.split(pts, split)
+
+
 def line_intersect_grid(ptsin, xedge, yedge, returnvertices=False):
     """
     Intersect a list of polyline vertices with a rectilinear MODFLOW
@@ -971,102 +1482,18 @@ def line_intersect_grid(ptsin, xedge, yedge, returnvertices=False):
         intersection of the provided polyline with the rectilinear MODFLOW
         grid.
 
+    See Also
+    --------
+    lines_intersect_grid : intersect many polylines at once
+
     Examples
     --------
     >>> import flopy
     >>> ptsout = flopy.plotutil.line_intersect_grid(ptsin, xedge, yedge)
 
     """
-
-    small_value = 1.0e-4
-
-    # make sure xedge and yedge are numpy arrays
-    if not isinstance(xedge, np.ndarray):
-        xedge = np.array(xedge)
-    if not isinstance(yedge, np.ndarray):
-        yedge = np.array(yedge)
-
-    # build list of points along current line
-    pts = []
-    npts = len(ptsin)
-    dlen = 0.
-    for idx in range(1, npts):
-        x0 = ptsin[idx - 1][0]
-        x1 = ptsin[idx][0]
-        y0 = ptsin[idx - 1][1]
-        y1 = ptsin[idx][1]
-        a = x1 - x0
-        b = y1 - y0
-        c = math.sqrt(math.pow(a, 2.) + math.pow(b, 2.))
-        # find cells with (x0, y0) and (x1, y1)
-        irow0, jcol0 = findrowcolumn((x0, y0), xedge, yedge)
-        irow1, jcol1 = findrowcolumn((x1, y1), xedge, yedge)
-        # determine direction to go in the x- and y-directions
-        jx = 0
-        incx = abs(small_value * a / c)
-        iy = 0
-        incy = -abs(small_value * b / c)
-        if a == 0.:
-            incx = 0.
-        # go to the right
-        elif a > 0.:
-            jx = 1
-            incx *= -1.
-        if b == 0.:
-            incy = 0.
-        # go down
-        elif b < 0.:
-            iy = 1
-            incy *= -1.
-        # process data
-        if irow0 >= 0 and jcol0 >= 0:
-            iadd = True
-            if idx > 1 and returnvertices: 
-                iadd = False
-            if iadd: 
-                pts.append((x0, y0, dlen))
-        icnt = 0
-        while True:
-            icnt += 1
-            dx = xedge[jcol0 + jx] - x0
-            dlx = 0.
-            if a != 0.:
-                dlx = c * dx / a
-            dy = yedge[irow0 + iy] - y0
-            dly = 0.
-            if b != 0.:
-                dly = c * dy / b
-            if dlx != 0. and dly != 0.:
-                if abs(dlx) < abs(dly):
-                    dy = dx * b / a
-                else:
-                    dx = dy * a / b
-            xt = x0 + dx + incx
-            yt = y0 + dy + incy
-            dl = math.sqrt(math.pow((xt - x0), 2.) + math.pow((yt - y0), 2.))
-            dlen += dl
-            if not returnvertices: 
-                pts.append((xt, yt, dlen))
-            x0, y0 = xt, yt
-            xt = x0 - 2. * incx
-            yt = y0 - 2. * incy
-            dl = math.sqrt(math.pow((xt - x0), 2.) + math.pow((yt - y0), 2.))
-            dlen += dl
-            x0, y0 = xt, yt
-            irow0, jcol0 = findrowcolumn((x0, y0), xedge, yedge)
-            if irow0 >= 0 and jcol0 >= 0:
-                if not returnvertices: 
-                    pts.append((xt, yt, dlen))
-            elif irow1 < 0 or jcol1 < 0:
-                dl = math.sqrt(math.pow((x1 - x0), 2.) + math.pow((y1 - y0), 2.))
-                dlen += dl
-                break
-            if irow0 == irow1 and jcol0 == jcol1:
-                dl = math.sqrt(math.pow((x1 - x0), 2.) + math.pow((y1 - y0), 2.))
-                dlen += dl
-                pts.append((x1, y1, dlen))
-                break
-    return np.array(pts)
+    return lines_intersect_grid([ptsin], xedge, yedge,
+                                returnvertices=returnvertices)[0]
 
 
 def cell_value_points(pts, xedge, yedge, vdata):
@@ -1115,19 +1542,99 @@ def cell_value_points(pts, xedge, yedge, vdata):
     if not isinstance(vdata, np.ndarray):
         vdata = np.array(vdata)
 
-    vcell = []
-    for idx, [xt, yt, dlen] in enumerate(pts):
-        # find the modflow cell containing point
-        irow, jcol = findrowcolumn((xt, yt), xedge, yedge)
-        if irow >= 0 and jcol >= 0:
-            if np.isnan(vdata[irow, jcol]):
-                vcell.append(np.nan)
-            else:
-                v = np.asarray(vdata[irow, jcol])
-                vcell.append(v) 
+    pts = np.asarray(pts)
+    if pts.shape[0] == 0:
+        return np.array([])
+
+    # find the modflow cells containing the points
+    irow, jcol = findrowcolumn((pts[:, 0], pts[:, 1]), xedge, yedge)
+    inside = (irow >= 0) & (jcol >= 0)
+    return vdata[irow[inside], jcol[inside]]
 
-    return np.array(vcell)
 
+def lod_steps(ax, sr, min_pixels=1.):
+    """
+    Determine the number of rows and columns of a grid that fall within
+    min_pixels screen pixels when the grid is drawn on ax.  The axes is
+    assumed to have an equal aspect ratio and to be zoomed to the
+    extent of the grid.
+
+    Parameters
+    ----------
+    ax : matplotlib.pyplot axis
+        axis the grid will be drawn on
+    sr : flopy.utils.reference.SpatialReference
+        spatial reference of the grid
+    min_pixels : float
+        minimum size of a coarsened cell in pixels (default is 1.)
+
+    Returns
+    -------
+    rstep, cstep : int
+        number of rows and columns in each coarsened cell.  (1, 1) is
+        returned if the cells are already larger than min_pixels.
+
+    """
+    bbox = ax.get_window_extent()
+    if bbox.width <= 0 or bbox.height <= 0:
+        return 1, 1
+    xmin, xmax, ymin, ymax = sr.get_extent()
+    # model length units per pixel
+    upp = max((xmax - xmin) / bbox.width, (ymax - ymin) / bbox.height)
+    upp *= min_pixels
+    rstep = int(sr.nrow * upp / np.abs(sr.delc).sum())
+    cstep = int(sr.ncol * upp / np.abs(sr.delr).sum())
+    return max(1, rstep), max(1, cstep)
+
+
+def block_aggregate(a, rstep, cstep, method='mean'):
+    """
+    Coarsen a two-dimensional array by aggregating blocks of rstep rows by
+    cstep columns.  The last row and column of blocks may be smaller.
+    Masked values are excluded from the aggregation, and a block is only
+    masked if all of its values are masked.
+
+    Parameters
+    ----------
+    a : numpy.ndarray or numpy.ma.MaskedArray
+        array of shape (nrow, ncol)
+    rstep : int
+        number of rows in each block
+    cstep : int
+        number of columns in each block
+    method : str
+        'mean', 'min', 'max' or 'decimate'.  'decimate' takes the
+        value of the first cell in each block, which is fastest and keeps
+        categorical values (ibound, zones) intact. (default is 'mean')
+
+    Returns
+    -------
+    ab : numpy.ma.MaskedArray
+        array of shape (ceil(nrow / rstep), ceil(ncol / cstep))
+
+    """
+    a = np.ma.asarray(a)
+    if rstep == 1 and cstep == 1:
+        return a
+    if method == 'decimate':
+        return a[::rstep, ::cstep]
+    nrow, ncol = a.shape
+    nr = -(-nrow // rstep)
+    nc = -(-ncol // cstep)
+    # pad with masked values so that the array divides into blocks
+    ap = np.ma.masked_all((nr * rstep, nc * cstep), dtype=a.dtype)
+    ap[:nrow, :ncol] = a
+    ap = ap.reshape((nr, rstep, nc, cstep)).transpose((0, 2, 1, 3))
+    ap = ap.reshape((nr, nc, rstep * cstep))
+    if method == 'mean':
+        return ap.mean(axis=-1)
+    elif method == 'min':
+        return ap.min(axis=-1)
+    elif method == 'max':
+        return ap.max(axis=-1)
+    else:
+        raise Exception('block_aggregate method must be ' +
+                        '"mean", "min", "max" or "decimate"')
 
 
 cm_data = [[ 0.26700401,  0.00487433,  0.32941519],
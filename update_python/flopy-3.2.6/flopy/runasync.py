@@ -0,0 +1,164 @@
+"""
+runasync module.  Contains run_model_async, an asyncio counterpart to
+run_model that reports the progress of a model run as it is made.
+
+This module requires python 3.6 or later.
+
+"""
+
+import os
+import re
+import time
+import asyncio
+from collections import namedtuple
+from .mbase import which
+
+RunEvent = namedtuple('RunEvent', ['kind', 'line', 'kper', 'kstp',
+                                   'iteration', 'discrepancy', 'success',
+                                   'returncode', 'elapsed'])
+RunEvent.__doc__ = """
+Progress event of a model run.  kind is 'start', 'timestep', 'iteration',
+'discrepancy', 'line' or 'end'.  kper and kstp are the zero-based stress
+period and time step of the last time step that was started.  iteration is
+the last solver iteration count, discrepancy is the last percent
+discrepancy, success and returncode are set for the 'end' event, and
+elapsed is the time in seconds since the run was started.
+"""
+
+# patterns of progress information in the stdout of MODFLOW-based programs
+_re_timestep = re.compile(r'stress\s+period:?\s+(\d+)\s+time\s+step:?\s+(\d+)',
+                          re.IGNORECASE)
+_re_iteration = re.compile(r'(?:(\d+)\s+(?:total\s+)?iterations)|'
+                           r'(?:iteration\s*(?:number)?\s*[:=]?\s*(\d+))',
+                           re.IGNORECASE)
+_re_discrepancy = re.compile(r'percent\s+discrepancy\s*=\s*'
+                             r'([-+]?[0-9.]+(?:[eEdD][-+]?\d+)?)',
+                             re.IGNORECASE)
+
+
+def _parse_line(line, state):
+    """
+    Update state with the progress information in line and return the kind
+    of the event.
+
+    """
+    m = _re_timestep.search(line)
+    if m is not None:
+        state['kper'] = int(m.group(1)) - 1
+        state['kstp'] = int(m.group(2)) - 1
+        return 'timestep'
+    m = _re_discrepancy.search(line)
+    if m is not None:
+        value = m.group(1).replace('d', 'e').replace('D', 'e')
+        try:
+            state['discrepancy'] = float(value)
+        except ValueError:
+            return 'line'
+        return 'discrepancy'
+    m = _re_iteration.search(line)
+    if m is not None:
+        state['iteration'] = int(m.group(1) or m.group(2))
+        return 'iteration'
+    return 'line'
+
+
+async def run_model_async(exe_name, namefile, model_ws='./',
+                          normal_msg='normal termination', all_lines=False,
+                          log_file=None):
+    """
+    Run a model with asyncio.create_subprocess_exec and yield progress
+    events parsed from the model stdout.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name (with path, if necessary) to run.
+    namefile : str
+        Namefile of model to run. The namefile must be the
+        filename of the namefile without the path.
+    model_ws : str
+        Path to the location of the namefile. (default is the
+        current working directory - './')
+    normal_msg : str
+        Normal termination message used to determine if the
+        run terminated normally. (default is 'normal termination')
+    all_lines : boolean
+        Yield a 'line' event for lines of stdout without progress
+        information. (default is False)
+    log_file : str
+        Name of a file that stdout is written to. (default is None)
+
+    Returns
+    -------
+    events : async generator of RunEvent
+        A 'start' event, progress events, and an 'end' event with the
+        success and returncode of the run.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from flopy.runasync import run_model_async
+    >>> async def run(ws):
+    ...     async for e in run_model_async('mf2005', 'model.nam', ws):
+    ...         if e.kind == 'discrepancy' and abs(e.discrepancy) > 1.:
+    ...             print('{}: budget discrepancy {}'.format(ws, e.line))
+    ...     return e.success
+    >>> loop = asyncio.get_event_loop()
+    >>> success = loop.run_until_complete(
+    ...     asyncio.gather(*[run(ws) for ws in ['s1', 's2', 's3']]))
+
+    """
+    exe = which(exe_name)
+    if exe is None:
+        import platform
+        if platform.system() in 'Windows':
+            if not exe_name.lower().endswith('.exe'):
+                exe = which(exe_name + '.exe')
+    if exe is None:
+        s = 'The program {} does not exist or is not executable.'.format(
+            exe_name)
+        raise Exception(s)
+    if not os.path.isfile(os.path.join(model_ws, namefile)):
+        s = 'The namefile for this model does not exists: {}'.format(namefile)
+        raise Exception(s)
+
+    t0 = time.time()
+    state = {'kper': None, 'kstp': None, 'iteration': None,
+             'discrepancy': None}
+
+    def event(kind, line='', success=None, returncode=None):
+        return RunEvent(kind, line, state['kper'], state['kstp'],
+                        state['iteration'], state['discrepancy'], success,
+                        returncode, time.time() - t0)
+
+    proc = await asyncio.create_subprocess_exec(
+        exe, namefile, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT, cwd=model_ws)
+    f = None
+    if log_file is not None:
+        f = open(log_file, 'w')
+    success = False
+    try:
+        yield event('start')
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            if f is not None:
+                f.write(line + '\n')
+            if normal_msg in line.lower():
+                success = True
+            kind = _parse_line(line, state)
+            if kind != 'line' or all_lines:
+                yield event(kind, line.strip())
+        returncode = await proc.wait()
+        yield event('end', success=success, returncode=returncode)
+    finally:
+        if f is not None:
+            f.close()
+        # kill the model if the caller stops iterating before the end
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
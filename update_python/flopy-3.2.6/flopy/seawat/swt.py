@@ -274,6 +274,33 @@ class Seawat(BaseModel):
         f_nam.close()
         return
 
+    def get_output_files(self):
+        """
+        Get the names of the model output files: the files declared in
+        the name file, including the output files of the MODFLOW and MT3DMS
+        models, and the MT3DMS concentration, mass budget, observation and
+        grid files.
+
+        Returns
+        -------
+        fnames : list of str
+            File names relative to the model workspace.
+
+        """
+        fnames = BaseModel.get_output_files(self)
+        for m in (self._mf, self._mt):
+            if m is None:
+                continue
+            for fname, output in zip(m.external_fnames, m.external_output):
+                if output:
+                    fnames.append(fname)
+        fnames.append('MT3D.CNF')
+        for icomp in range(1, self.ncomp + 1):
+            for fmt in ('MT3D{:03d}.UCN', 'MT3D{:03d}S.UCN',
+                        'MT3D{:03d}.MAS', 'MT3D{:03d}.OBS'):
+                fnames.append(fmt.format(icomp))
+        return fnames
+
     @staticmethod
     def load(f, version='seawat', exe_name='swt_v4', verbose=False,
              model_ws='.', load_only=None):
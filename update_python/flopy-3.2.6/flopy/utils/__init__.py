@@ -29,10 +29,11 @@ from .modpathfile import PathlineFile, EndpointFile
 from .swroutputfile import SwrStage, SwrBudget, SwrFlow, SwrExchange, \
     SwrStructure
 from .observationfile import HydmodObs, SwrObs
-from .reference import SpatialReference  # , TemporalReference
+from .reference import SpatialReference, CellPolygonIndex  # , TemporalReference
 from .mflistfile import MfListBudget, MfusgListBudget, SwtListBudget, \
     SwrListBudget
-from .check import check, get_neighbors
+from .check import check, get_neighbors, CheckContext
 from .utils_def import FlopyBinaryData, totim_to_datetime
-from .flopy_io import read_fixed_var, write_fixed_var
+from .flopy_io import read_fixed_var, write_fixed_var, \
+    read_fixed_array, get_fixed_ipos
 from .zonbud_utils import write_zonfile, run_zonbud
@@ -2,6 +2,93 @@ import os
 import numpy as np
 from numpy.lib import recfunctions
 
+
+class CheckContext(object):
+    """
+    Model arrays that are shared by the checks of all of the packages of a
+    model.  The arrays are built the first time that they are used, so the
+    ibound, bottom and thickness arrays are only materialized once when a
+    model is checked.
+
+    Parameters
+    ----------
+    model : model object
+        The model that is checked.
+
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._cache = {}
+
+    def _get(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    @property
+    def ibound(self):
+        """ibound array of the model, or None if there is no BAS6 package"""
+        def get():
+            if 'BAS6' in self.model.get_package_list():
+                return self.model.bas6.ibound.array
+            return None
+        return self._get('ibound', get)
+
+    @property
+    def botm(self):
+        """cell bottom array of the DIS package"""
+        return self._get('botm', lambda: self.model.dis.botm.array)
+
+    @property
+    def thickness(self):
+        """cell thickness array of the DIS package"""
+        return self._get('thickness', lambda: self.model.dis.thickness.array)
+
+    def get_active(self, include_cbd=False):
+        """Returns a boolean array of active cells for the model.
+
+        Parameters
+        ----------
+        include_cbd : boolean
+            If True, active is of same dimmension as the thickness array
+            in the DIS module (includes quasi 3-D confining beds). Default False.
+
+        Returns
+        -------
+        active : 3-D boolean array
+            True where active.
+        """
+        if 'DIS' in self.model.get_package_list():
+            dis = self.model.dis
+            inds = (dis.nlay, dis.nrow, dis.ncol)
+        else:
+            dis = self.model.disu
+            inds = dis.nodes
+            include_cbd=False
+
+        def get():
+            ibound = self.ibound
+            if ibound is not None:
+                # make ibound of same shape as thicknesses/botm for quasi-3D models
+                if include_cbd and dis.laycbd.sum() > 0:
+                    ncbd = np.sum(dis.laycbd.array > 0)
+                    active = np.empty((dis.nlay+ncbd, dis.nrow, dis.ncol), dtype=int)
+                    l = 0
+                    for cbd in dis.laycbd:
+                        active[l, :, :] = ibound[l, :, :] != 0
+                        if cbd > 0:
+                            active[l+1, :, :] = active[l, :, :]
+                        l += 1
+                    active[-1, :, :] = ibound[-1, :, :] != 0
+                else:
+                    active = ibound != 0
+            else: # if bas package is missing
+                active = np.ones(inds, dtype=bool)
+            return active
+        return self._get(('active', include_cbd), get)
+
+
 class check:
     """
     Check package for common errors
@@ -66,7 +153,7 @@ class check:
     thin_cell_threshold = 1.0 # cells thickness less than this value will be flagged
 
     def __init__(self, package, f=None, verbose=True, level=1,
-                 property_threshold_values={}):
+                 property_threshold_values={}, context=None):
 
         # allow for instantiation with model or package
         #if isinstance(package, BaseModel): didn't work
@@ -83,6 +170,14 @@ class check:
         self.passed = []
         self.property_threshold_values.update(property_threshold_values)
 
+        # model arrays shared by the checks; BaseModel.check sets a context
+        #  on the model so the arrays are only built once for all packages
+        if context is None:
+            context = getattr(self.model, '_check_context', None)
+        if context is None:
+            context = CheckContext(self.model)
+        self.context = context
+
         self.summary_array = self._get_summary_array()
 
         self.f = None
@@ -99,13 +194,68 @@ class check:
 
     def _add_to_summary(self, type='Warning', k=0, i=0, j=0, node=0,
                         value=0, desc='', package=None):
+        inds = ([k], [i], [j]) if self.structured else ([node],)
+        sa = self._get_summary_rows(type, inds, [value], desc,
+                                    package=package)
+        self._append_summary(sa)
+
+    @property
+    def summary_array(self):
+        """Record array with a row for each error and warning.  Rows are
+        collected in chunks that are concatenated when the array is used."""
+        if len(self._summary_chunks) > 1:
+            sa = np.concatenate(self._summary_chunks).view(np.recarray)
+            self._summary_chunks = [sa]
+        return self._summary_chunks[0]
+
+    @summary_array.setter
+    def summary_array(self, sa):
+        self._summary_chunks = [sa]
+
+    def _append_summary(self, sa):
+        """Append the rows of summary array sa to the summary array."""
+        if sa is not None and len(sa) > 0:
+            self._summary_chunks.append(sa)
+
+    def _get_summary_rows(self, error_type, inds, v, desc, package=None):
+        """Build a summary array with a row for each value in v.
+
+        Parameters
+        ----------
+        error_type : str
+            'Error' or 'Warning'.
+        inds : tuple of arrays
+            (k, i, j), (i, j) or (node) indices of the values.
+        v : 1-D array
+            Values.
+        desc : str
+            Description of the error.
+
+        Returns
+        -------
+        sa : record array
+            Summary array.
+        """
         if package is None:
             package = self.package.name[0]
-        col_list = [type, package]
-        col_list += [k, i, j] if self.structured else [node]
-        col_list += [value, desc]
-        sa = self._get_summary_array(np.array(col_list))
-        self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        n = len(v)
+        sa = np.recarray(n, dtype=self._get_summary_dtype())
+        sa['type'] = error_type
+        sa['package'] = package
+        if self.structured:
+            # pad the indices of 2-D arrays with zeros for k
+            inds = [np.zeros(n, dtype=int)] * (3 - len(inds)) + list(inds)
+            sa['k'], sa['i'], sa['j'] = inds[-3:]
+        else:
+            sa['node'] = inds[0]
+        v = np.asarray(v)
+        if v.dtype.kind == 'f' and v.dtype.itemsize < 8:
+            # single precision values are stored with the value of their
+            # shortest text representation
+            v = v.astype(str)
+        sa['value'] = v.astype(np.float64)
+        sa['desc'] = desc
+        return sa
 
     def _boolean_compare(self, array, col1, col2,
                          level0txt='{} violations encountered.',
@@ -186,8 +336,7 @@ class check:
             txt += '\n'
         return txt
 
-    def _get_summary_array(self, array=None):
-
+    def _get_summary_dtype(self):
         if self.structured:
             # include node column for structured grids (useful for indexing)
             dtype = np.dtype([('type', np.object),
@@ -205,6 +354,11 @@ class check:
                               ('value', np.float),
                               ('desc', np.object)
                               ])
+        return dtype
+
+    def _get_summary_array(self, array=None):
+
+        dtype = self._get_summary_dtype()
         if array is None:
             array = np.empty((0, len(dtype)), dtype=dtype)
         return np.core.records.fromarrays(array.transpose(), dtype=dtype)
@@ -247,7 +401,7 @@ class check:
             sa = self._list_spd_check_violations(stress_period_data, ~isvalid,
                                                  error_name='invalid BC index',
                                                  error_type='Error')
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+            self._append_summary(sa)
             spd_inds_valid = False
             self.remove_passed('BC indices valid')
         if spd_inds_valid:
@@ -264,7 +418,7 @@ class check:
                                                  row_has_nan,
                                                  error_name='Not a number',
                                                  error_type='Error')
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+            self._append_summary(sa)
             self.remove_passed('not a number (Nan) entries')
         else:
             self.append_passed('not a number (Nan) entries')
@@ -274,15 +428,15 @@ class check:
         spd = stress_period_data
         inds = (spd.k, spd.i, spd.j) if self.structured else (spd.node)
         msg = 'BC in inactive cell'
-        if 'BAS6' in self.model.get_package_list():
-            ibnd = self.package.parent.bas6.ibound.array[inds]
+        if self.context.ibound is not None:
+            ibnd = self.context.ibound[inds]
 
             if np.any(ibnd == 0):
                 sa = self._list_spd_check_violations(stress_period_data,
                                                      ibnd == 0,
                                                      error_name=msg,
                                                      error_type='Warning')
-                self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+                self._append_summary(sa)
                 self.remove_passed(msg + 's')
             else:
                 self.append_passed(msg + 's')
@@ -293,16 +447,155 @@ class check:
         values, and description of error for each row in stress_period_data where criteria=True.
         """
         inds_col = ['k', 'i', 'j'] if self.structured else ['node']
-        inds = stress_period_data[criteria][inds_col].view(int)\
-            .reshape(stress_period_data[criteria].shape + (-1,))
+        spd = stress_period_data[criteria]
+        inds = [spd[c] for c in inds_col]
         if col is not None:
-            v = stress_period_data[criteria][col]
+            v = spd[col]
+        else:
+            v = np.zeros(len(spd))
+        return self._get_summary_rows(error_type, inds, v, error_name)
+
+    def get_stress_period_data(self, stress_period_data):
+        """Concatenate the stress period data of all stress periods.
+
+        Parameters
+        ----------
+        stress_period_data : MfList
+            Stress period data of a package.
+
+        Returns
+        -------
+        spd : record array
+            Stress period data of all of the stress periods that have data.
+        iper : 1-D array
+            Index of the stress period of each row of spd (in the order of
+            the stress periods in stress_period_data).
+        """
+        data = [d for d in stress_period_data.data.values()
+                if isinstance(d, np.recarray)]
+        if len(data) == 0:
+            return None, None
+        iper = np.repeat(np.arange(len(data)), [len(d) for d in data])
+        spd = np.concatenate([d.view(np.ndarray) for d in data])
+        return spd.view(np.recarray), iper
+
+    def _period_violations(self, spd, iper, criteria, col=None,
+                           error_name='', error_type='Warning',
+                           passed_name=None):
+        """List the rows of the stress period data of all stress periods
+        (spd) where criteria is True, and update the passed checks (as
+        passed_name, or error_name if passed_name is None).
+
+        Returns
+        -------
+        sa : record array
+            Summary array of the violations.
+        iper : 1-D array
+            Stress period index of each row of sa.
+        """
+        if passed_name is None:
+            passed_name = error_name
+        if np.any(criteria):
+            self.remove_passed(passed_name)
+            sa = self._list_spd_check_violations(spd, criteria, col,
+                                                 error_name=error_name,
+                                                 error_type=error_type)
+            return sa, iper[criteria]
+        self.append_passed(passed_name)
+        return None, None
+
+    def _append_period_violations(self, violations):
+        """Append a list of violations of period checks (from
+        _period_violations) to the summary array, ordered by stress period
+        and then by check, as if the checks were run for each stress period
+        in turn.
+        """
+        violations = [v for v in violations if v[0] is not None]
+        if len(violations) == 0:
+            return
+        sa = np.concatenate([v[0] for v in violations])
+        iper = np.concatenate([v[1] for v in violations])
+        icheck = np.repeat(np.arange(len(violations)),
+                           [len(v[1]) for v in violations])
+        # lexsort is stable, so rows keep their order within a check
+        isort = np.lexsort((icheck, iper))
+        self._append_summary(sa[isort].view(np.recarray))
+
+    def stress_period_data_checks(self, spd, iper, elev_name=None):
+        """Run the general boundary condition checks (valid indices, not a
+        number entries, BCs in inactive cells and, if elev_name is not None,
+        BC elevations below cell bottoms) on the stress period data of all
+        stress periods at once.
+
+        Parameters
+        ----------
+        spd : record array
+            Stress period data of all stress periods
+            (see get_stress_period_data).
+        iper : 1-D array
+            Stress period index of each row of spd.
+        elev_name : str
+            Column of spd with the BC elevation.
+        """
+        if spd is None:
+            return
+        nper = iper.max() + 1 if len(iper) > 0 else 0
+        if 'DIS' in self.model.get_package_list() and \
+                {'k', 'i', 'j'}.intersection(set(spd.dtype.names)) != {'k', 'i', 'j'}:
+            for per in range(nper):
+                self._add_to_summary(type='Error',
+                                     desc='\r    Stress period data missing k, i, j for structured grid.')
+            return
+        elif 'DISU' in self.model.get_package_list() and \
+                        'node' not in spd.dtype.names:
+            for per in range(nper):
+                self._add_to_summary(type='Error',
+                                     desc='\r    Stress period data missing node number for unstructured grid.')
+            return
+
+        violations = []
+        # check for BCs indices that are invalid for grid
+        inds = (spd.k, spd.i, spd.j) if self.structured else (spd.node)
+        isvalid = self.isvalid(inds)
+        violations.append(self._period_violations(
+            spd, iper, ~isvalid, error_name='invalid BC index',
+            error_type='Error', passed_name='BC indices valid'))
+
+        # check for and list nan values
+        isnan = np.zeros(len(spd), dtype=bool)
+        for c in spd.dtype.names:
+            isnan |= np.isnan(spd[c])
+        violations.append(self._period_violations(
+            spd, iper, isnan, error_name='Not a number', error_type='Error',
+            passed_name='not a number (Nan) entries'))
+
+        # the remaining checks are only made for stress periods with valid
+        #  indices
+        pervalid = np.bincount(iper, weights=~isvalid, minlength=nper) == 0
+        rows = pervalid[iper]
+        if rows.all():
+            sub, subper = spd, iper
         else:
-            v = np.zeros(len(stress_period_data[criteria]))
-        pn = [self.package.name] * len(v)
-        en = [error_name] * len(v)
-        tp = [error_type] * len(v)
-        return self._get_summary_array(np.column_stack([tp, pn, inds, v, en]))
+            sub, subper = spd[rows], iper[rows]
+        if len(sub) > 0:
+            inds = (sub.k, sub.i, sub.j) if self.structured else (sub.node)
+            ibound = self.context.ibound
+            if ibound is not None:
+                msg = 'BC in inactive cell'
+                ibnd = ibound[inds]
+                violations.append(self._period_violations(
+                    sub, subper, ibnd == 0, error_name=msg,
+                    error_type='Warning', passed_name=msg + 's'))
+
+            # check that bc elevations are above model cell bottoms
+            # also checks for nan values
+            if elev_name is not None:
+                botms = self.context.botm[inds]
+                violations.append(self._period_violations(
+                    sub, subper, sub[elev_name] < botms, col=elev_name,
+                    error_name='BC elevation below cell bottom',
+                    error_type='Error'))
+        self._append_period_violations(violations)
 
     def append_passed(self, message):
         """Add a check to the passed list if it isn't already in there."""
@@ -330,13 +623,13 @@ class check:
 
         if 'DIS' in self.model.get_package_list() and len(inds) == 3:
             dis = self.model.dis
-            k = inds[0] < dis.nlay
-            i = inds[1] < dis.nrow
-            j = inds[2] < dis.ncol
-            return k | i | j
+            k = (inds[0] >= 0) & (inds[0] < dis.nlay)
+            i = (inds[1] >= 0) & (inds[1] < dis.nrow)
+            j = (inds[2] >= 0) & (inds[2] < dis.ncol)
+            return k & i & j
 
         elif 'DISU' in self.model.get_package_list() and len(inds) == 1:
-            return inds < self.model.disu.nodes
+            return (inds[0] >= 0) & (inds[0] < self.model.disu.nodes)
 
         else:
             return np.zeros(inds[0].shape, dtype=bool)
@@ -355,36 +648,12 @@ class check:
         active : 3-D boolean array
             True where active.
         """
-        if 'DIS' in self.model.get_package_list():
-            dis = self.model.dis
-            inds = (dis.nlay, dis.nrow, dis.ncol)
-        else:
-            dis = self.model.disu
-            inds = dis.nodes
-            include_cbd=False
-
-        if 'BAS6' in self.model.get_package_list():
-            # make ibound of same shape as thicknesses/botm for quasi-3D models
-            if include_cbd and dis.laycbd.sum() > 0:
-                ncbd = np.sum(dis.laycbd.array > 0)
-                active = np.empty((dis.nlay+ncbd, dis.nrow, dis.ncol), dtype=int)
-                l = 0
-                for cbd in dis.laycbd:
-                    active[l, :, :] = self.model.bas6.ibound.array[l, :, :] != 0
-                    if cbd > 0:
-                        active[l+1, :, :] = active[l, :, :]
-                    l += 1
-                active[-1, :, :] = self.model.bas6.ibound.array[-1, :, :] != 0
-            else:
-                active = self.model.bas6.ibound.array != 0
-        else: # if bas package is missing
-            active = np.ones(inds, dtype=bool)
-        return active
+        return self.context.get_active(include_cbd=include_cbd)
 
     def print_summary(self, cols=None, delimiter=',', float_format='{:.6f}'):
         # strip description column
         sa = self.summary_array.copy()
-        sa['desc'] = [s.strip() for s in self.summary_array.desc]
+        sa['desc'] = [s.strip() for s in self.summary_array['desc']]
         return _print_rec_array(sa, cols=cols, delimiter=delimiter,
                                 float_format=float_format)
 
@@ -406,7 +675,7 @@ class check:
             # list the values that met the criteria
             sa = self._list_spd_check_violations(stress_period_data, criteria, col,
                                                  error_name=error_name, error_type=error_type)
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+            self._append_summary(sa)
             self.remove_passed(error_name)
         else:
             self.append_passed(error_name)
@@ -417,17 +686,9 @@ class check:
         if np.any(criteria):
             inds = np.where(criteria)
             v = a[inds] # works with structured or unstructured
-            pn = [self.package.name] * len(v)
-            en = [error_name] * len(v)
-            tp = [error_type] * len(v)
-            indsT = np.transpose(inds)
-            # _get_summary_array requires 3 columns for k, i, j,
-            # but indsT will only have two columns if a 2-D array is being compared
-            # pad indsT with a column of zeros for k
-            if indsT.shape[1] == 2:
-                indsT = np.column_stack([np.zeros(indsT.shape[0], dtype=int), indsT])
-            sa = self._get_summary_array(np.column_stack([tp, pn, indsT, v, en]))
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+            # _get_summary_rows pads the indices of 2-D arrays with zeros for k
+            sa = self._get_summary_rows(error_type, inds, v, error_name)
+            self._append_summary(sa)
             self.remove_passed(error_name)
         else:
             self.append_passed(error_name)
@@ -449,19 +710,20 @@ class check:
         # tweak screen output for model-level to report package for each error
         if 'MODEL' in self.prefix: # add package name for model summary output
             self.summary_array['desc'] = \
-                ['\r    {} package: {}'.format(self.summary_array.package[i], d.strip())
-                 if self.summary_array.package[i] != 'model' else d
-                 for i, d in enumerate(self.summary_array.desc)]
+                ['\r    {} package: {}'.format(p, d.strip())
+                 if p != 'model' else d
+                 for p, d in zip(self.summary_array['package'],
+                                 self.summary_array['desc'])]
 
         for etype in ['Error', 'Warning']:
-            a = self.summary_array[self.summary_array.type == etype]
+            desc = self.summary_array['desc'][self.summary_array['type'] == etype]
             t = ''
-            if len(a) > 0:
-                t += '  {} {}s:\n'.format(len(a), etype)
-                if len(a) == 1:
+            if len(desc) > 0:
+                t += '  {} {}s:\n'.format(len(desc), etype)
+                if len(desc) == 1:
                     t = t.replace('s', '') #grammer
-                for e in np.unique(a.desc):
-                    n = len(a[a.desc == e])
+                descs, counts = np.unique(desc, return_counts=True)
+                for e, n in zip(descs, counts):
                     if n > 1:
                         t += '    {} instances of {}\n'.format(n, e)
                     else:
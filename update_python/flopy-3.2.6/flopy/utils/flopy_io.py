@@ -1,6 +1,7 @@
 """
 Module for input/output utilities
 """
+import re
 import numpy as np
 
 def _fmt_string(array, float_format='{}'):
@@ -143,6 +144,97 @@ def read_fixed_var(line, ncol=1, length=10, ipos=None, free=False):
             istart = istop
     return out
 
+def get_fixed_ipos(line):
+    """
+    Get the column widths of a fixed format line with right-justified
+    values, such as a record written by a FORTRAN program.  Each column
+    ends at the last character of a value.
+
+    Parameters
+    ----------
+    line : str
+        text string with the layout of the fixed format record.
+
+    Returns
+    -------
+    ipos : list
+        column widths of the values in line
+
+    """
+    ipos = []
+    istart = 0
+    for m in re.finditer(r'\S+', line):
+        ipos.append(m.end() - istart)
+        istart = m.end()
+    return ipos
+
+def _parse_values(txt):
+    """
+    Parse the blank separated values in txt.  An empty array is returned
+    if any of the values cannot be parsed.
+
+    """
+    try:
+        return np.array(txt.split(), dtype=np.float64)
+    except ValueError:
+        return np.zeros(0, dtype=np.float64)
+
+def read_fixed_array(lines, ipos, dtype=np.float64):
+    """
+    Parse a list of fixed format lines with the same layout into an array.
+    The values of all of the lines are parsed at once, so this is much
+    faster than parsing the lines one at a time with read_fixed_var.
+
+    Parameters
+    ----------
+    lines : list of str
+        text strings to parse.
+    ipos : list, int, or numpy array
+        column widths.
+    dtype : numpy dtype
+        data type of the values. (default is np.float64)
+
+    Returns
+    -------
+    out : numpy array
+        array of shape (len(lines), len(ipos)) with the values in lines.
+        Blank columns are set to zero.
+
+    """
+    ipos = np.atleast_1d(np.asarray(ipos, dtype=int)).flatten()
+    ncol = ipos.shape[0]
+    width = int(ipos.sum())
+    nline = len(lines)
+    if nline < 1 or width < 1:
+        return np.zeros((nline, ncol), dtype=dtype)
+    # the values are usually separated by blanks and can be parsed as
+    # free format values
+    out = _parse_values(''.join(lines))
+    if out.shape[0] != nline * ncol:
+        # slice the columns and copy them into a buffer with a blank after
+        # each column
+        txt = ''.join([line.rstrip('\r\n')[:width].ljust(width)
+                       for line in lines])
+        chars = np.frombuffer(txt.encode('latin1'), dtype=np.uint8)
+        chars = chars.reshape(nline, width)
+        buf = np.empty((nline, width + ncol), dtype=np.uint8)
+        istart = 0
+        for icol in range(ncol):
+            istop = istart + ipos[icol]
+            c = chars[:, istart:istop]
+            buf[:, istart + icol:istop + icol] = c
+            buf[:, istop + icol] = ord(' ')
+            # blank columns are zero
+            blank = (c == ord(' ')).all(axis=1)
+            buf[blank, istop + icol - 1] = ord('0')
+            istart = istop
+        # FORTRAN double precision exponents
+        buf[(buf == ord('D')) | (buf == ord('d'))] = ord('E')
+        out = _parse_values(buf.tobytes().decode('latin1'))
+        if out.shape[0] != nline * ncol:
+            raise ValueError('could not parse fixed format values')
+    return out.reshape(nline, ncol).astype(dtype)
+
 def flux_to_wel(cbc_file,text,precision="single",model=None,verbose=False):
     """
     Convert flux in a binary cell budget file to a wel instance
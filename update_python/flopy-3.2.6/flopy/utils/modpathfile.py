@@ -5,12 +5,225 @@ important classes that can be accessed by the user.
 *  EndpointFile (ascii endpoint file)
 *  PathlineFile (ascii pathline file)
 
+Large pathline files can be read in chunks with pathline_chunks.
+
 """
 
+import os
+import struct
+import itertools
 import numpy as np
 from collections import OrderedDict
 
 
+def _pathline_dtype():
+    """
+       Build the compact numpy dtype of the points of a MODPATH 6 pathline
+       file.
+    """
+    return np.dtype([("particleid", np.int32), ("particlegroup", np.int32),
+                     ("timepointindex", np.int32),
+                     ("comulativetimestep", np.int32),
+                     ("time", np.float32), ("x", np.float32),
+                     ("y", np.float32), ("z", np.float32),
+                     ("k", np.int32), ("i", np.int32), ("j", np.int32),
+                     ("grid", np.int32), ("xloc", np.float32),
+                     ("yloc", np.float32), ("zloc", np.float32),
+                     ("linesegmentindex", np.int32)])
+
+
+def _skip_header(f, fname, key='MODPATH_PATHLINE_FILE 6'):
+    """
+       Check the first line of the open MODPATH file f and position f at
+       the first line after the header.
+    """
+    line = f.readline()
+    if isinstance(line, bytes):
+        line = line.decode()
+    if key not in line.upper():
+        errmsg = '{} is not a valid {} file'.format(fname,
+                                                    key.split('_')[1].lower())
+        raise Exception(errmsg)
+    while 'end header' not in line.lower():
+        line = f.readline()
+        if isinstance(line, bytes):
+            line = line.decode()
+        if not line:
+            break
+
+
+def _npy_header(dtype, n, size=None):
+    """
+       Build a version 1.0 .npy header for a one-dimensional array of n
+       items of dtype.  If size is not None the header is padded to size
+       bytes, which allows the header of a file that is being written in
+       chunks to be rewritten in place once the number of items is known.
+    """
+    d = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({:d},), }}"
+    d = d.format(np.lib.format.dtype_to_descr(np.dtype(dtype)), n)
+    if size is None:
+        # reserve room for a shape with up to 20 digits
+        size = 64 * ((10 + len(d) + 21) // 64 + 1)
+    d += ' ' * (size - 11 - len(d)) + '\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(d)) + \
+           d.encode('latin1')
+
+
+def _cache_file(filename, cache):
+    """
+       Return the name of the binary cache file of filename and whether the
+       cache file is up to date.
+    """
+    cachefile = cache if isinstance(cache, str) else filename + '.npy'
+    current = os.path.isfile(cachefile) and \
+              os.path.getmtime(cachefile) >= os.path.getmtime(filename)
+    return cachefile, current
+
+
+def _filter_points(a, particlegroups=None, time_window=None, bbox=None):
+    """
+       Return the points of a that are in particlegroups, in time_window
+       and in bbox.
+    """
+    idx = None
+    if particlegroups is not None:
+        groups = np.unique(np.atleast_1d(particlegroups))
+        pos = np.searchsorted(groups, a['particlegroup'])
+        pos[pos == groups.shape[0]] = 0
+        idx = groups[pos] == a['particlegroup']
+    if time_window is not None:
+        tmin, tmax = time_window
+        t = a['time']
+        i = np.ones(a.shape[0], dtype=bool)
+        if tmin is not None:
+            i &= t >= tmin
+        if tmax is not None:
+            i &= t <= tmax
+        idx = i if idx is None else idx & i
+    if bbox is not None:
+        xmin, xmax, ymin, ymax = bbox
+        x, y = a['x'], a['y']
+        i = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        idx = i if idx is None else idx & i
+    if idx is None:
+        return a
+    return a[idx]
+
+
+def pathline_chunks(filename, chunksize=1000000, particlegroups=None,
+                    time_window=None, bbox=None, cache=False):
+    """
+    Read a MODPATH 6 ascii pathline file in chunks.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the pathline file
+    chunksize : int
+        Number of points that are read at a time.  Default is 1000000.
+    particlegroups : int or list of ints
+        Zero-based particle groups to return.  Default is None (all
+        particle groups).
+    time_window : tuple
+        (tmin, tmax) of the points to return.  Either value can be None.
+        Default is None.
+    bbox : tuple
+        (xmin, xmax, ymin, ymax) of the points to return in model
+        coordinates.  Default is None.
+    cache : bool or string
+        If True or a file name, a binary copy of the pathline file is
+        written to filename + '.npy' (or the cache file name) while the
+        file is read.  If the cache file is newer than the pathline file
+        the points are read from the (memory-mapped) cache instead of the
+        ascii file.  Default is False.
+
+    Returns
+    ----------
+    out : generator
+        Generator of numpy structured arrays of the points in each chunk
+        that pass the filters.  Particle ids, particle groups, cell indices
+        and line segment indices are zero-based.
+
+    Notes
+    -----
+    Memory use is set by chunksize and not by the size of the pathline
+    file, so files that do not fit in memory can be processed.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> for p in flopy.utils.modpathfile.pathline_chunks('model.mppth',
+    ...                                                   particlegroups=0):
+    ...     print(p['time'].max())
+
+    """
+    dtype = _pathline_dtype()
+    cachefile = None
+    if cache:
+        cachefile, current = _cache_file(filename, cache)
+        if current:
+            data = np.load(cachefile, mmap_mode='r')
+            for i0 in range(0, data.shape[0], chunksize):
+                a = np.array(data[i0:i0 + chunksize])
+                yield _filter_points(a, particlegroups, time_window, bbox)
+            return
+    fields = [(name, dtype.fields[name][0]) for name in dtype.names]
+    ncol = len(fields)
+    f = open(filename, 'r')
+    fcache = None
+    n = 0
+    try:
+        _skip_header(f, filename)
+        if cachefile is not None:
+            fcache = open(cachefile + '.tmp', 'wb')
+            size = len(_npy_header(dtype, 0))
+            fcache.write(_npy_header(dtype, 0, size))
+        while True:
+            lines = list(itertools.islice(f, chunksize))
+            if len(lines) < 1:
+                break
+            # skip blank lines
+            lines = [line for line in lines if not line.isspace()]
+            if len(lines) < 1:
+                continue
+            try:
+                v = np.array(' '.join(lines).split(), dtype=np.float64)
+            except ValueError:
+                v = np.zeros(0, dtype=np.float64)
+            if v.shape[0] != ncol * len(lines):
+                errmsg = 'could not parse pathline points ' + \
+                         '{} to {} of {}'.format(n, n + len(lines), filename)
+                raise Exception(errmsg)
+            v = v.reshape(len(lines), ncol)
+            a = np.empty(len(lines), dtype=dtype)
+            for icol, (name, dt) in enumerate(fields):
+                a[name] = v[:, icol]
+            # convert layer, row, and column indices; particle id and group;
+            #  and line segment indices to zero-based
+            for name in ('k', 'i', 'j', 'particleid', 'particlegroup',
+                         'linesegmentindex'):
+                a[name] -= 1
+            if fcache is not None:
+                fcache.write(a.tobytes())
+            n += a.shape[0]
+            yield _filter_points(a, particlegroups, time_window, bbox)
+        if fcache is not None:
+            fcache.seek(0)
+            fcache.write(_npy_header(dtype, n, size))
+            fcache.close()
+            fcache = None
+            if os.path.isfile(cachefile):
+                os.remove(cachefile)
+            os.rename(cachefile + '.tmp', cachefile)
+    finally:
+        f.close()
+        if fcache is not None:
+            # the file was not read to the end, so the cache is incomplete
+            fcache.close()
+            os.remove(cachefile + '.tmp')
+
+
 class PathlineFile():
     """
     PathlineFile Class.
@@ -21,6 +234,14 @@ class PathlineFile():
         Name of the pathline file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache : bool or string
+        If True or a file name, a binary copy of the pathline file is
+        written on the first load and is memory-mapped on later loads.
+        See pathline_chunks.  The points are only left in the memory-mapped
+        cache if the pathline file is ordered by particle id; otherwise
+        they are sorted into memory.  Default is False.
+    chunksize : int
+        Number of points that are read at a time.  Default is 1000000.
 
     Attributes
     ----------
@@ -30,11 +251,13 @@ class PathlineFile():
 
     See Also
     --------
+    pathline_chunks
 
     Notes
     -----
     The PathlineFile class provides simple ways to retrieve MODPATH 6
-    pathline data from a MODPATH 6 ascii pathline file.
+    pathline data from a MODPATH 6 ascii pathline file.  Pathline files
+    that are too large to be loaded can be processed with pathline_chunks.
 
     Examples
     --------
@@ -46,60 +269,63 @@ class PathlineFile():
 
     """
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache=False,
+                 chunksize=1000000):
         """
         Class constructor.
 
         """
         self.fname = filename
         self.dtype, self.outdtype = self._get_dtypes()
-        self._build_index()
-        self._data = np.loadtxt(self.file, dtype=self.dtype, skiprows=self.skiprows)
+        # read the points in chunks, or memory-map an up to date cache; the
+        #  indices are zero-based
+        cachefile, current = None, False
+        if cache:
+            cachefile, current = _cache_file(filename, cache)
+        if current:
+            self._data = np.load(cachefile, mmap_mode='r')
+        else:
+            chunks = list(pathline_chunks(filename, chunksize=chunksize,
+                                          cache=cache))
+            if len(chunks) == 1:
+                self._data = chunks[0]
+            elif len(chunks) > 1:
+                self._data = np.concatenate(chunks)
+            else:
+                self._data = np.zeros(0, dtype=self.dtype)
+            del chunks
         # set number of particle ids
-        self.nid = self._data['particleid'].max()
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        self._data['k'] -= 1
-        self._data['i'] -= 1
-        self._data['j'] -= 1
-        self._data['particleid'] -= 1
-        self._data['particlegroup'] -= 1
-        self._data['linesegmentindex'] -= 1
-        # close the input file
-        self.file.close()
+        self.nid = 0
+        if self._data.shape[0] > 0:
+            self.nid = int(self._data['particleid'].max()) + 1
+        if verbose:
+            print('read {} points of {} particles from {}'.format(
+                self._data.shape[0], self.nid, filename))
+        # sort the points by particle id, keeping the order of the points of
+        #  each particle, and build the offsets of each particle in _data
+        self._build_offsets()
         return
 
-    def _build_index(self):
+    def _build_offsets(self):
         """
-           Set position of the start of the pathline data.
+           Sort _data by particle id (if it is not already sorted) and set
+           the offsets of the points of each particle, so that the points
+           of particle partid are _data[_offsets[partid]:_offsets[partid+1]].
         """
-        self.skiprows = 0
-        self.file = open(self.fname, 'r')
-        while True:
-            line = self.file.readline()
-            if isinstance(line, bytes):
-                line = line.decode()
-            if self.skiprows < 1:
-                if 'MODPATH_PATHLINE_FILE 6' not in line.upper():
-                    errmsg = '{} is not a valid pathline file'.format(self.fname)
-                    raise Exception(errmsg)
-            self.skiprows += 1
-            if 'end header' in line.lower():
-                break
-        self.file.seek(0)
+        pid = self._data['particleid']
+        if pid.shape[0] > 1 and (pid[1:] < pid[:-1]).any():
+            isort = np.argsort(pid, kind='mergesort')
+            self._data = self._data[isort]
+            pid = self._data['particleid']
+        self._offsets = np.zeros(self.nid + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pid, minlength=self.nid),
+                  out=self._offsets[1:])
 
     def _get_dtypes(self):
         """
            Build numpy dtype for the MODPATH 6 pathline file.
         """
-        dtype = np.dtype([("particleid", np.int), ("particlegroup", np.int),
-                          ("timepointindex", np.int), ("comulativetimestep", np.int),
-                          ("time", np.float32), ("x", np.float32),
-                          ("y", np.float32), ("z", np.float32),
-                          ("k", np.int), ("i", np.int), ("j", np.int),
-                          ("grid", np.int), ("xloc", np.float32),
-                          ("yloc", np.float32), ("zloc", np.float32),
-                          ("linesegmentindex", np.int)])
+        dtype = _pathline_dtype()
         outdtype = np.dtype([("x", np.float32), ("y", np.float32), ("z", np.float32),
                              ("time", np.float32), ("k", np.int), ("id", np.int)])
         return dtype, outdtype
@@ -114,7 +340,7 @@ class PathlineFile():
             Maximum pathline number.
 
         """
-        return self.maxid
+        return self.nid - 1
 
     def get_maxtime(self):
         """
@@ -126,7 +352,7 @@ class PathlineFile():
             Maximum pathline time.
 
         """
-        return self.data['time'].max()
+        return self._data['time'].max()
 
     def get_data(self, partid=0, totim=None, ge=True):
         """
@@ -166,15 +392,16 @@ class PathlineFile():
         >>> p1 = pthobj.get_data(partid=1)
 
         """
-        idx = self._data['particleid'] == partid
+        if 0 <= partid < self.nid:
+            ta = self._data[self._offsets[partid]:self._offsets[partid + 1]]
+        else:
+            ta = self._data[:0]
         if totim is not None:
             if ge:
-                idx = (self._data['time'] >= totim) & (self._data['particleid'] == partid)
+                ta = ta[ta['time'] >= totim]
             else:
-                idx = (self._data['time'] <= totim) & (self._data['particleid'] == partid)
-        else:
-            idx = self._data['particleid'] == partid
-        self._ta = self._data[idx]
+                ta = ta[ta['time'] <= totim]
+        self._ta = ta
         ra = np.rec.fromarrays((self._ta['x'], self._ta['y'], self._ta['z'],
                                 self._ta['time'], self._ta['k'], self._ta['particleid']), dtype=self.outdtype)
         return ra
@@ -215,9 +442,22 @@ class PathlineFile():
         >>> p = pthobj.get_alldata()
 
         """
-        plist = []
-        for partid in range(self.nid):
-            plist.append(self.get_data(partid=partid, totim=totim, ge=ge))
+        ta = self._data
+        offsets = self._offsets
+        if totim is not None:
+            if ge:
+                idx = ta['time'] >= totim
+            else:
+                idx = ta['time'] <= totim
+            ta = ta[idx]
+            offsets = np.zeros(self.nid + 1, dtype=np.int64)
+            np.cumsum(np.bincount(ta['particleid'], minlength=self.nid),
+                      out=offsets[1:])
+        ra = np.rec.fromarrays((ta['x'], ta['y'], ta['z'], ta['time'],
+                                ta['k'], ta['particleid']),
+                               dtype=self.outdtype)
+        # split the points into a view for each particle
+        plist = np.split(ra, offsets[1:-1])
         return plist
 
 
@@ -244,7 +484,10 @@ class EndpointFile():
     Notes
     -----
     The EndpointFile class provides simple ways to retrieve MODPATH 6
-    endpoint data from a MODPATH 6 ascii endpoint file.
+    endpoint data from a MODPATH 6 ascii endpoint file.  Capture zones,
+    travel time statistics and source-destination matrices are computed
+    for all particles at once with grouped reductions (np.bincount) over
+    the endpoint array.
 
     Examples
     --------
@@ -252,6 +495,8 @@ class EndpointFile():
     >>> import flopy
     >>> endobj = flopy.utils.EndpointFile('model.mpend')
     >>> e1 = endobj.get_data(partid=1)
+    >>> wel = m.wel.stress_period_data[0]
+    >>> cz = endobj.get_capture_fraction((m.nlay, m.nrow, m.ncol), cells=wel)
 
 
     """
@@ -264,9 +509,12 @@ class EndpointFile():
         self.fname = filename
         self.dtype = self._get_dtypes()
         self._build_index()
-        self._data = np.loadtxt(self.file, dtype=self.dtype, skiprows=self.skiprows)
+        self._data = np.loadtxt(self.file, dtype=self.dtype, skiprows=self.skiprows,
+                                ndmin=1)
         # set number of particle ids
-        self.nid = self._data['particleid'].max()
+        self.nid = 0
+        if self._data.shape[0] > 0:
+            self.nid = self._data['particleid'].max()
         # convert layer, row, and column indices; particle id and group; and
         #  line segment indices to zero-based
         self._data['k0'] -= 1
@@ -279,6 +527,12 @@ class EndpointFile():
         self._data['particlegroup'] -= 1
         # close the input file
         self.file.close()
+        # index the records of each particle, keeping the order of the file
+        pid = self._data['particleid']
+        self._order = np.argsort(pid, kind='mergesort')
+        self._offsets = np.zeros(self.nid + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pid, minlength=self.nid),
+                  out=self._offsets[1:])
         return
 
     def _build_index(self):
@@ -287,7 +541,7 @@ class EndpointFile():
         """
         self.skiprows = 0
         self.file = open(self.fname, 'r')
-        idx = 0
+        self.direction = 1
         while True:
             line = self.file.readline()
             if isinstance(line, bytes):
@@ -296,12 +550,11 @@ class EndpointFile():
                 if 'MODPATH_ENDPOINT_FILE 6' not in line.upper():
                     errmsg = '{} is not a valid endpoint file'.format(self.fname)
                     raise Exception(errmsg)
-            self.skiprows += 1
-            if idx == 1:
+            if self.skiprows == 1:
                 t = line.strip()
-                self.direction = 1
                 if int(t[0]) == 2:
                     self.direction = -1
+            self.skiprows += 1
             if 'end header' in line.lower():
                 break
         self.file.seek(0)
@@ -336,7 +589,7 @@ class EndpointFile():
             Maximum endpoint particle id.
 
         """
-        return self.maxid
+        return self.nid - 1
 
     def get_maxtime(self):
         """
@@ -348,7 +601,7 @@ class EndpointFile():
             Maximum endpoint time.
 
         """
-        return self.data['finaltime'].max()
+        return self._data['finaltime'].max()
 
 
     def get_maxtraveltime(self):
@@ -361,7 +614,19 @@ class EndpointFile():
             Maximum endpoint travel time.
 
         """
-        return (self.data['finaltime'] - self.data['initialtime']).max()
+        return self.get_traveltime().max()
+
+    def get_traveltime(self):
+        """
+        Get the travel time of each particle in the endpoint file
+
+        Returns
+        ----------
+        out : numpy array
+            Travel time of each endpoint record.
+
+        """
+        return np.abs(self._data['finaltime'] - self._data['initialtime'])
 
     def get_data(self, partid=0):
         """
@@ -394,7 +659,10 @@ class EndpointFile():
         >>> e1 = endobj.get_data(partid=1)
 
         """
-        idx = self._data['particleid'] == partid
+        if 0 <= partid < self.nid:
+            idx = self._order[self._offsets[partid]:self._offsets[partid + 1]]
+        else:
+            idx = self._order[:0]
         ra = self._data[idx]
         return ra
 
@@ -435,3 +703,274 @@ class EndpointFile():
         #                             self._data['initialtime'], self._data['k0'],
         #                             self._data['particleid']), dtype=self.outdtype)
         return ra
+
+    def _get_nodes(self, shape, initial=False):
+        """
+           Get the zero-based node number of the final (or initial) cell of
+           each endpoint record.
+        """
+        if initial:
+            kij = (self._data['k0'], self._data['i0'], self._data['j0'])
+        else:
+            kij = (self._data['k'], self._data['i'], self._data['j'])
+        return np.ravel_multi_index(kij, tuple(shape))
+
+    def _get_zones(self, zones, initial=False):
+        """
+           Get the zone of the final (or initial) cell of each endpoint
+           record from a zone array with a shape of (nrow, ncol) or
+           (nlay, nrow, ncol).
+        """
+        zones = np.asarray(zones)
+        if initial:
+            k, i, j = self._data['k0'], self._data['i0'], self._data['j0']
+        else:
+            k, i, j = self._data['k'], self._data['i'], self._data['j']
+        if zones.ndim == 2:
+            return zones[i, j]
+        return zones[k, i, j]
+
+    def get_destination_count(self, shape, zones=None):
+        """
+        Get the number of particles that terminate in each cell or zone.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the model grid (nlay, nrow, ncol).
+        zones : numpy array
+            Integer zone array with a shape of (nrow, ncol) or
+            (nlay, nrow, ncol).  If zones is not None the number of
+            particles that terminate in each zone is returned.
+            (default is None)
+
+        Returns
+        ----------
+        count : numpy array
+            Number of particles that terminate in each cell (with a shape
+            of shape) or, if zones is not None, in each zone (indexed by
+            zone number).
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> endobj = flopy.utils.EndpointFile('model.mpend')
+        >>> count = endobj.get_destination_count((m.nlay, m.nrow, m.ncol))
+
+        """
+        if zones is not None:
+            return np.bincount(self._get_zones(zones))
+        n = int(np.prod(shape))
+        return np.bincount(self._get_nodes(shape),
+                           minlength=n).reshape(shape)
+
+    def get_capture_fraction(self, shape, cells=None, zones=None,
+                             zone_values=None):
+        """
+        Get the fraction of the particles started in each cell that
+        terminate in a set of cells or zones (the capture zone).
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the model grid (nlay, nrow, ncol).
+        cells : list of tuples or numpy recarray
+            Zero-based (k, i, j) of the destination cells, for example
+            the stress period data of a well or drain package.
+            (default is None)
+        zones : numpy array
+            Integer zone array with a shape of (nrow, ncol) or
+            (nlay, nrow, ncol).  Used with zone_values if cells is None.
+            (default is None)
+        zone_values : int or list of ints
+            Destination zones.  (default is None)
+
+        Returns
+        ----------
+        fraction : numpy array
+            Fraction of the particles started in each cell that terminate
+            in the destination cells or zones.  Cells where no particles
+            are started are nan.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> endobj = flopy.utils.EndpointFile('model.mpend')
+        >>> wel = m.wel.stress_period_data[0]
+        >>> cz = endobj.get_capture_fraction((m.nlay, m.nrow, m.ncol),
+        ...                                  cells=wel)
+
+        """
+        n = int(np.prod(shape))
+        if cells is not None:
+            if isinstance(cells, np.ndarray) and cells.dtype.names is not None:
+                kij = (cells['k'], cells['i'], cells['j'])
+            else:
+                kij = tuple(np.array(cells, dtype=int).reshape(-1, 3).T)
+            isdest = np.zeros(n, dtype=bool)
+            isdest[np.ravel_multi_index(kij, tuple(shape))] = True
+            captured = isdest[self._get_nodes(shape)]
+        elif zones is not None and zone_values is not None:
+            values = np.unique(np.atleast_1d(zone_values))
+            z = self._get_zones(zones)
+            pos = np.searchsorted(values, z)
+            pos[pos == values.shape[0]] = 0
+            captured = values[pos] == z
+        else:
+            errmsg = 'cells or zones and zone_values must be specified'
+            raise Exception(errmsg)
+        start = self._get_nodes(shape, initial=True)
+        count = np.bincount(start, minlength=n).astype(np.float64)
+        ncaptured = np.bincount(start, weights=captured, minlength=n)
+        fraction = np.full(n, np.nan)
+        idx = count > 0
+        fraction[idx] = ncaptured[idx] / count[idx]
+        return fraction.reshape(shape)
+
+    def get_traveltime_histogram(self, bins=10, range=None, zones=None,
+                                 initial=True):
+        """
+        Get a histogram of the particle travel times.
+
+        Parameters
+        ----------
+        bins : int or sequence
+            Number of bins or bin edges passed to np.histogram.
+            (default is 10)
+        range : tuple
+            Range of the bins if bins is an int.  (default is None)
+        zones : numpy array
+            Integer zone array with a shape of (nrow, ncol) or
+            (nlay, nrow, ncol).  If zones is not None a histogram is
+            computed for each zone.  (default is None)
+        initial : bool
+            Group the particles by the zone of their initial (True) or
+            final (False) cell.  (default is True)
+
+        Returns
+        ----------
+        hist : numpy array
+            Number of particles in each bin.  If zones is not None hist
+            has a shape of (nzones, nbins) and is indexed by zone number.
+        edges : numpy array
+            Bin edges.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> endobj = flopy.utils.EndpointFile('model.mpend')
+        >>> hist, edges = endobj.get_traveltime_histogram(bins=20)
+
+        """
+        tt = self.get_traveltime()
+        hist, edges = np.histogram(tt, bins=bins, range=range)
+        if zones is None:
+            return hist, edges
+        nbins = edges.shape[0] - 1
+        # assign each particle to a bin; the last bin includes its right
+        #  edge and particles outside of the range are dropped
+        ibin = np.searchsorted(edges, tt, side='right') - 1
+        ibin[tt == edges[-1]] = nbins - 1
+        idx = (ibin >= 0) & (ibin < nbins)
+        z = self._get_zones(zones, initial=initial)[idx]
+        nzones = z.max() + 1 if z.shape[0] > 0 else 0
+        hist = np.bincount(z * nbins + ibin[idx], minlength=nzones * nbins)
+        return hist.reshape(nzones, nbins), edges
+
+    def get_traveltime_percentile(self, q, shape):
+        """
+        Get percentiles of the travel time of the particles started in each
+        cell.
+
+        Parameters
+        ----------
+        q : float or sequence of floats
+            Percentiles to compute (0 to 100).
+        shape : tuple
+            Shape of the model grid (nlay, nrow, ncol).
+
+        Returns
+        ----------
+        pct : numpy array
+            Travel time percentiles of the particles started in each cell
+            with a shape of shape (or (len(q),) + shape if q is a
+            sequence).  Percentiles are linearly interpolated, like
+            np.percentile.  Cells where no particles are started are nan.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> endobj = flopy.utils.EndpointFile('model.mpend')
+        >>> t50 = endobj.get_traveltime_percentile(50,
+        ...                                        (m.nlay, m.nrow, m.ncol))
+
+        """
+        n = int(np.prod(shape))
+        tt = self.get_traveltime().astype(np.float64)
+        start = self._get_nodes(shape, initial=True)
+        # sort the travel times by starting cell and travel time, so the
+        #  travel times of each cell are contiguous and ordered
+        isort = np.lexsort((tt, start))
+        tt = tt[isort]
+        count = np.bincount(start, minlength=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(count, out=offsets[1:])
+        idx = np.flatnonzero(count > 0)
+        qs = np.atleast_1d(q).astype(np.float64)
+        pct = np.full((qs.shape[0], n), np.nan)
+        for iq, qq in enumerate(qs):
+            pos = offsets[idx] + qq / 100. * (count[idx] - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, offsets[idx + 1] - 1)
+            frac = pos - lo
+            pct[iq, idx] = tt[lo] + frac * (tt[hi] - tt[lo])
+        if np.ndim(q) == 0:
+            return pct[0].reshape(shape)
+        return pct.reshape((qs.shape[0],) + tuple(shape))
+
+    def get_source_destination_matrix(self, source_zones,
+                                      destination_zones=None):
+        """
+        Get the number of particles that start in each source zone and
+        terminate in each destination zone.
+
+        Parameters
+        ----------
+        source_zones : numpy array
+            Integer zone array with a shape of (nrow, ncol) or
+            (nlay, nrow, ncol) used for the initial cells.
+        destination_zones : numpy array
+            Integer zone array used for the final cells.  If None,
+            source_zones is used.  (default is None)
+
+        Returns
+        ----------
+        matrix : numpy array
+            Number of particles with a shape of (nsource, ndestination).
+        source : numpy array
+            Source zone of each row of matrix.
+        destination : numpy array
+            Destination zone of each column of matrix.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> endobj = flopy.utils.EndpointFile('model.mpend')
+        >>> mat, src, dst = endobj.get_source_destination_matrix(zones)
+
+        """
+        if destination_zones is None:
+            destination_zones = source_zones
+        source, isrc = np.unique(self._get_zones(source_zones, initial=True),
+                                 return_inverse=True)
+        destination, idst = np.unique(self._get_zones(destination_zones),
+                                      return_inverse=True)
+        ns, nd = source.shape[0], destination.shape[0]
+        matrix = np.bincount(isrc.ravel() * nd + idst.ravel(),
+                             minlength=ns * nd).reshape(ns, nd)
+        return matrix, source, destination
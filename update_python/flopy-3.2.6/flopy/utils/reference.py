@@ -217,6 +217,7 @@ class SpatialReference(object):
         self._ygrid = None
         self._ycentergrid = None
         self._xcentergrid = None
+        self._lod_grids = {}
 
     @property
     def nrow(self):
@@ -383,6 +384,18 @@ class SpatialReference(object):
         return xrot, yrot
 
 
+    def get_local_coords(self, x, y):
+        """
+        Given x and y array-like values in real-world (offset and rotated)
+        coordinates, return the coordinates in model space - not offset or
+        rotated.  This is the inverse of the transformation applied to
+        xgrid, ygrid, xcentergrid and ycentergrid.
+
+        """
+        x = np.asarray(x, dtype=float) - self.xul
+        y = np.asarray(y, dtype=float) - (self.yul - self.yedge[0])
+        return self.rotate(x, y, -self.rotation, 0, self.yedge[0])
+
     def get_extent(self):
         """
         Get the extent of the rotated and offset grid
@@ -426,39 +439,89 @@ class SpatialReference(object):
         """
             get the grid lines as a list
         """
-        xmin = self.xedge[0]
-        xmax = self.xedge[-1]
-        ymin = self.yedge[-1]
-        ymax = self.yedge[0]
-        lines = []
-        # Vertical lines
-        for j in range(self.ncol + 1):
-            x0 = self.xedge[j]
-            x1 = x0
-            y0 = ymin
-            y1 = ymax
-            x0r, y0r = self.rotate(x0, y0, self.rotation, 0, self.yedge[0])
-            x0r += self.xul
-            y0r += self.yul - self.yedge[0]
-            x1r, y1r = self.rotate(x1, y1, self.rotation, 0, self.yedge[0])
-            x1r += self.xul
-            y1r += self.yul - self.yedge[0]
-            lines.append([(x0r, y0r), (x1r, y1r)])
-
-        #horizontal lines
-        for i in range(self.nrow + 1):
-            x0 = xmin
-            x1 = xmax
-            y0 = self.yedge[i]
-            y1 = y0
-            x0r, y0r = self.rotate(x0, y0, self.rotation, 0, self.yedge[0])
-            x0r += self.xul
-            y0r += self.yul - self.yedge[0]
-            x1r, y1r = self.rotate(x1, y1, self.rotation, 0, self.yedge[0])
-            x1r += self.xul
-            y1r += self.yul - self.yedge[0]
-            lines.append([(x0r, y0r), (x1r, y1r)])
-        return lines
+        return [[tuple(p) for p in line]
+                for line in self.get_grid_line_array()]
+
+    def get_grid_line_array(self, rstep=1, cstep=1):
+        """
+        Get the rotated and offset grid lines as a numpy array of shape
+        (nlines, 2, 2), which can be passed directly to a matplotlib
+        LineCollection.  Vertical lines come first, followed by the
+        horizontal lines.
+
+        Parameters
+        ----------
+        rstep : int
+            Only every rstep row line is returned.  The outer lines of the
+            grid are always included. (default is 1)
+        cstep : int
+            Only every cstep column line is returned.  The outer lines of the
+            grid are always included. (default is 1)
+
+        """
+        xedge = self.xedge[self.get_lod_edges(self.ncol, cstep)]
+        yedge = self.yedge[self.get_lod_edges(self.nrow, rstep)]
+        nv, nh = xedge.shape[0], yedge.shape[0]
+        x = np.empty((nv + nh, 2), dtype=float)
+        y = np.empty((nv + nh, 2), dtype=float)
+        # vertical lines
+        x[:nv, 0] = x[:nv, 1] = xedge
+        y[:nv, 0] = self.yedge[-1]
+        y[:nv, 1] = self.yedge[0]
+        # horizontal lines
+        x[nv:, 0] = self.xedge[0]
+        x[nv:, 1] = self.xedge[-1]
+        y[nv:, 0] = y[nv:, 1] = yedge
+        x, y = self.rotate(x, y, self.rotation, 0, self.yedge[0])
+        x += self.xul
+        y += self.yul - self.yedge[0]
+        return np.stack((x, y), axis=-1)
+
+    @staticmethod
+    def get_lod_edges(n, step):
+        """
+        Get the indices of the edges of a coarsened grid dimension of n
+        cells, where each coarse cell is a block of step cells.  The last
+        block may be smaller.
+
+        """
+        step = max(1, int(step))
+        return np.append(np.arange(0, n, step), n)
+
+    def get_lod_grid(self, rstep=1, cstep=1):
+        """
+        Get the rotated and offset vertices of a coarsened grid, where each
+        coarse cell is a block of rstep rows by cstep columns (the last row
+        and column of blocks may be smaller).  The vertex arrays are cached
+        so that they can be reused by later plots, and are cleared when the
+        grid is changed.
+
+        Parameters
+        ----------
+        rstep : int
+            number of rows in each block (default is 1)
+        cstep : int
+            number of columns in each block (default is 1)
+
+        Returns
+        -------
+        xgrid, ygrid : numpy.ndarray
+            vertex arrays of shape (nrow / rstep + 1, ncol / cstep + 1)
+
+        """
+        key = (max(1, int(rstep)), max(1, int(cstep)))
+        if key not in self._lod_grids:
+            if key == (1, 1):
+                self._lod_grids[key] = (self.xgrid, self.ygrid)
+            else:
+                xedge = self.xedge[self.get_lod_edges(self.ncol, key[1])]
+                yedge = self.yedge[self.get_lod_edges(self.nrow, key[0])]
+                x, y = np.meshgrid(xedge, yedge)
+                x, y = self.rotate(x, y, self.rotation, 0, self.yedge[0])
+                x += self.xul
+                y += self.yul - self.yedge[0]
+                self._lod_grids[key] = (x, y)
+        return self._lod_grids[key]
 
 
     def get_xcenter_array(self):
@@ -518,6 +581,44 @@ class SpatialReference(object):
         f.write('\n')
         return
 
+    def intersect(self, x, y, local=False):
+        """
+        Find the row and column of the cells containing many x, y points
+        at once.
+
+        Parameters
+        ----------
+        x : float or array-like
+            x coordinate(s) of the points
+        y : float or array-like
+            y coordinate(s) of the points
+        local : bool
+            If True, x and y are in model space (not offset or rotated).
+            If False, x and y are in real-world coordinates and are
+            converted with get_local_coords(). (default is False)
+
+        Returns
+        -------
+        row, col : int or numpy.ndarray
+            zero-based row and column of the cells containing the points.
+            Points outside of the grid have a row and column of -1.
+
+        """
+        if not local:
+            x, y = self.get_local_coords(x, y)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        col = np.searchsorted(self.xedge, x, side='right') - 1
+        # yedge is decreasing
+        row = self.nrow - np.searchsorted(self.yedge[::-1], y, side='left')
+        outside = (col < 0) | (col >= self.ncol) | \
+                  (row < 0) | (row >= self.nrow)
+        row = np.where(outside, -1, row)
+        col = np.where(outside, -1, col)
+        if row.ndim == 0:
+            return int(row), int(col)
+        return row, col
+
     def get_vertices(self, i, j):
         pts = []
         xgrid, ygrid = self.xgrid, self.ygrid
@@ -570,4 +671,191 @@ class SpatialReference(object):
 
         return b
 
+class CellPolygonIndex(object):
+    """
+    a uniform bucket index of cell polygons for fast point-in-cell lookups
+    on unstructured (DISU or gridgen) grids
+
+    Parameters
+    ----------
+
+    polygons : list
+        list of cell polygons.  Each polygon is a list of (x, y) vertices,
+        for example from Gridgen.get_vertices() or
+        SpatialReference.get_vertices().  The position of a polygon in the
+        list is its cell id.
+
+    bucket_size : float
+        width and height of the buckets.  If None, the buckets are sized so
+        that each one holds about one cell. (default is None)
 
+    Attributes
+    ----------
+    ncells : int
+        number of cell polygons
+
+    Notes
+    -----
+
+    Each cell polygon is stored in every bucket that its bounding box
+    overlaps.  A query finds the bucket of each point and only tests the
+    point against the polygons in that bucket with a vectorized
+    crossing-number test.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> g = flopy.utils.gridgen.Gridgen(dis)
+    >>> g.build()
+    >>> idx = flopy.utils.CellPolygonIndex.from_gridgen(g)
+    >>> nodes = idx.intersect(x, y)
+
+    """
+
+    def __init__(self, polygons, bucket_size=None):
+        self.ncells = len(polygons)
+        nverts = np.array([len(p) for p in polygons], dtype=int)
+        assert self.ncells > 0, "CellPolygonIndex requires polygons"
+        assert nverts.min() >= 3, "polygons need at least 3 vertices"
+
+        # pad the vertex arrays with the first vertex, which also
+        # closes the polygons that are not closed
+        nv = nverts.max() + 1
+        self._px = np.empty((self.ncells, nv), dtype=float)
+        self._py = np.empty((self.ncells, nv), dtype=float)
+        for i, p in enumerate(polygons):
+            p = np.asarray(p, dtype=float)
+            self._px[i, :p.shape[0]] = p[:, 0]
+            self._py[i, :p.shape[0]] = p[:, 1]
+            self._px[i, p.shape[0]:] = p[0, 0]
+            self._py[i, p.shape[0]:] = p[0, 1]
+
+        xmin, xmax = self._px.min(axis=1), self._px.max(axis=1)
+        ymin, ymax = self._py.min(axis=1), self._py.max(axis=1)
+        self.extent = (xmin.min(), xmax.max(), ymin.min(), ymax.max())
+        if bucket_size is None:
+            area = (self.extent[1] - self.extent[0]) * \
+                   (self.extent[3] - self.extent[2])
+            bucket_size = np.sqrt(area / self.ncells)
+        self.bucket_size = max(float(bucket_size), 1.0e-12)
+        self.nbx = int((self.extent[1] - self.extent[0]) /
+                       self.bucket_size) + 1
+        self.nby = int((self.extent[3] - self.extent[2]) /
+                       self.bucket_size) + 1
+
+        # store each cell in every bucket its bounding box overlaps
+        bx0, by0 = self._bucket_ij(xmin, ymin)
+        bx1, by1 = self._bucket_ij(xmax, ymax)
+        nbx = bx1 - bx0 + 1
+        nby = by1 - by0 + 1
+        n = nbx * nby
+        cell = np.repeat(np.arange(self.ncells), n)
+        k = np.arange(cell.shape[0]) - np.repeat(np.cumsum(n) - n, n)
+        bx = bx0[cell] + k % nbx[cell]
+        by = by0[cell] + k // nbx[cell]
+        bucket = by * self.nbx + bx
+        isort = np.argsort(bucket, kind='mergesort')
+        self._cells = cell[isort]
+        self._offsets = np.zeros(self.nbx * self.nby + 1, dtype=int)
+        np.cumsum(np.bincount(bucket, minlength=self.nbx * self.nby),
+                  out=self._offsets[1:])
+
+    @classmethod
+    def from_gridgen(cls, gridgen, bucket_size=None):
+        """
+        Build the index from the cell vertices of a built Gridgen instance.
+        The cell ids are the zero-based gridgen node numbers.
+
+        """
+        nodes = sorted(gridgen._vertdict.keys())
+        assert nodes == list(range(len(nodes))), \
+            "gridgen node numbers are not consecutive"
+        return cls([gridgen.get_vertices(n) for n in nodes],
+                   bucket_size=bucket_size)
+
+    @classmethod
+    def from_spatialreference(cls, sr, bucket_size=None):
+        """
+        Build the index from the (rotated) cells of a SpatialReference.
+        The cell ids are the zero-based node numbers (row * ncol + col).
+        SpatialReference.intersect() is faster for structured grids; this
+        is mostly useful to compare structured and unstructured results.
+
+        """
+        polygons = [sr.get_vertices(i, j) for i in range(sr.nrow)
+                    for j in range(sr.ncol)]
+        return cls(polygons, bucket_size=bucket_size)
+
+    def _bucket_ij(self, x, y):
+        bx = ((x - self.extent[0]) / self.bucket_size).astype(int)
+        by = ((y - self.extent[2]) / self.bucket_size).astype(int)
+        return np.clip(bx, 0, self.nbx - 1), np.clip(by, 0, self.nby - 1)
+
+    def intersect(self, x, y, chunksize=1000000):
+        """
+        Find the cell containing each x, y point.
+
+        Parameters
+        ----------
+        x : array-like
+            x coordinates of the points
+        y : array-like
+            y coordinates of the points
+        chunksize : int
+            maximum number of point-polygon tests done at once, which
+            limits the memory used for large queries.
+            (default is 1000000)
+
+        Returns
+        -------
+        cellid : numpy.ndarray
+            zero-based cell id of each point.  Points that are not in any
+            cell have a cell id of -1.  Points on a shared edge get the
+            lowest cell id.
+
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        cellid = -np.ones(x.shape[0], dtype=int)
+        inbox = (x >= self.extent[0]) & (x <= self.extent[1]) & \
+                (y >= self.extent[2]) & (y <= self.extent[3])
+        ipt = np.flatnonzero(inbox)
+        bx, by = self._bucket_ij(x[ipt], y[ipt])
+        bucket = by * self.nbx + bx
+        ncand = self._offsets[bucket + 1] - self._offsets[bucket]
+
+        # process the points in chunks of about chunksize candidates
+        csum = np.cumsum(ncand)
+        nchunk = int(csum[-1] // chunksize) + 1 if csum.shape[0] > 0 else 0
+        ends = np.searchsorted(csum, chunksize * np.arange(1, nchunk + 1),
+                               side='right')
+        if nchunk > 0:
+            ends[-1] = ipt.shape[0]
+        i0 = 0
+        for i1 in ends:
+            if i1 <= i0:
+                continue
+            n = ncand[i0:i1]
+            pt = np.repeat(ipt[i0:i1], n)
+            k = np.arange(pt.shape[0]) - np.repeat(np.cumsum(n) - n, n)
+            cell = self._cells[np.repeat(self._offsets[bucket[i0:i1]], n) + k]
+            inside = self._contains(cell, x[pt], y[pt])
+            # candidates are sorted by point and then cell id
+            pt, cell = pt[inside][::-1], cell[inside][::-1]
+            cellid[pt] = cell
+            i0 = i1
+        return cellid
+
+    def _contains(self, cell, x, y):
+        """vectorized crossing-number point-in-polygon test"""
+        inside = np.zeros(cell.shape[0], dtype=bool)
+        px, py = self._px[cell], self._py[cell]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k in range(px.shape[1] - 1):
+                xi, yi = px[:, k], py[:, k]
+                xj, yj = px[:, k + 1], py[:, k + 1]
+                cross = ((yi > y) != (yj > y)) & \
+                        (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+                inside ^= cross
+        return inside